@@ -3,8 +3,11 @@ import urllib3
 import sys
 import asyncio
 import platform
+import argparse
 
 from process import start
+from src.utils.event_loop import install_uvloop, start_lag_monitor
+from src.utils.work_queue import DEFAULT_QUEUE_NAME
 import src
 
 
@@ -18,9 +21,53 @@ import src
 #     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="continue an interrupted run from data/runs.db, skipping finished tasks",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="split accounts between N processes, each with its own THREADS",
+    )
+    parser.add_argument(
+        "--queue",
+        metavar="PATH",
+        help="take accounts from a shared SQLite queue (e.g. on a network volume) "
+        "together with other machines instead of splitting ACCOUNTS_RANGE by hand",
+    )
+    parser.add_argument(
+        "--queue-name",
+        default=DEFAULT_QUEUE_NAME,
+        metavar="NAME",
+        help="name of the farm in the queue file, a new name starts all accounts again",
+    )
+    return parser.parse_args()
+
+
 async def main():
+    args = parse_args()
     configuration()
-    await start()
+    monitor = start_lag_monitor(src.utils.get_config().SETTINGS.LOOP_LAG_THRESHOLD)
+    try:
+        await start(
+            resume=args.resume,
+            workers=args.workers,
+            queue_path=args.queue,
+            queue_name=args.queue_name,
+        )
+    finally:
+        if monitor is not None:
+            await monitor.stop()
+        # web3 импортируется только в ветках меню, которые работают с сетью
+        web3_provider = sys.modules.get("src.utils.web3_provider")
+        if web3_provider is not None:
+            await web3_provider.close_web3_providers()
 
 
 log_format = (
@@ -49,4 +96,6 @@ def configuration():
 
 
 if __name__ == "__main__":
+    if src.utils.get_config().SETTINGS.USE_UVLOOP:
+        install_uvloop()
     asyncio.run(main())
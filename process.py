@@ -2,36 +2,32 @@ import asyncio
 import random
 import subprocess
 import os
+import sys
+from typing import Callable, Dict, Optional
 
 from loguru import logger
 
-from src.model.crusty_swap.instance import CrustySwap
-from src.model.disperse_from_one.instance import DisperseFromOneWallet
-from src.model.balance_checker.instance import BalanceChecker
-from src.model.disperse_one_one.instance import DisperseOneOne
 import src.utils
 from src.utils.output import show_dev_info, show_logo
 import src.model
-from src.utils.statistics import print_wallets_stats
 from src.utils.check_github_version import check_version
 from src.utils.logs import ProgressTracker, create_progress_tracker
-
-
-async def start():
-    async def launch_wrapper(index, proxy, private_key, discord_token, twitter_token, email):
-        async with semaphore:
-            await account_flow(
-                index,
-                proxy,
-                private_key,
-                discord_token,
-                twitter_token,
-                email,
-                config,
-                lock,
-                progress_tracker,
-            )
-
+from src.utils.journal import get_journal, start_journal
+from src.model.tasks import import_task_modules
+from src.utils.concurrency import AdaptiveConcurrency
+from src.utils.sharding import ShardProgress, report_wallets, run_sharded, split_shards
+from src.utils.scheduler import WorkerPool, pause as pool_pause
+from src.utils.event_loop import install_uvloop, start_lag_monitor
+from src.utils.work_queue import DEFAULT_QUEUE_NAME, WorkQueue
+from src.utils.retry import retry, start_retry_budget
+
+
+async def start(
+    resume: Optional[str] = None,
+    workers: int = 1,
+    queue_path: Optional[str] = None,
+    queue_name: str = DEFAULT_QUEUE_NAME,
+):
     show_logo()
     show_dev_info()
 
@@ -54,7 +50,8 @@ async def start():
     print("[5] 👋 Exit")
     
     try:
-        choice = input("Enter option (1-5): ").strip()
+        # --resume и --queue запускают фарм без меню
+        choice = "1" if resume or queue_path else input("Enter option (1-5): ").strip()
     except Exception as e:
         logger.error(f"Input error: {e}")
         return
@@ -87,6 +84,8 @@ async def start():
         if proxies is False:
             return
         private_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
+        from src.model.balance_checker.instance import BalanceChecker
+
         balance_checker = BalanceChecker(private_keys, proxies[0])
         await balance_checker.run()
         return
@@ -114,12 +113,16 @@ async def start():
     if "disperse_farm_accounts" in config.FLOW.TASKS:
         main_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
         farm_keys = src.utils.read_txt_file("private keys", "data/keys_for_faucet.txt")
+        from src.model.disperse_one_one.instance import DisperseOneOne
+
         disperse_one_one = DisperseOneOne(main_keys, farm_keys, proxies, config)
         await disperse_one_one.disperse()
         return
     elif "disperse_from_one_wallet" in config.FLOW.TASKS:
         main_keys = src.utils.read_txt_file("private keys", "data/private_keys.txt")
         farm_keys = src.utils.read_txt_file("private keys", "data/keys_for_faucet.txt")
+        from src.model.disperse_from_one.instance import DisperseFromOneWallet
+
         disperse_one_wallet = DisperseFromOneWallet(
             farm_keys[0], main_keys, proxies, config
         )
@@ -143,6 +146,8 @@ async def start():
     
     if "crusty_refuel_from_one_to_all" in config.FLOW.TASKS:
         private_keys_to_distribute = private_keys[1:]
+        from src.model.crusty_swap.instance import CrustySwap
+
         crusty_swap = CrustySwap(
             1,
             proxies[0],
@@ -179,18 +184,45 @@ async def start():
         # Python slice не включает последний элемент, поэтому +1
         accounts_to_process = private_keys[start_index - 1 : end_index]
 
-    discord_tokens = [""] * len(accounts_to_process)
-    emails = [""] * len(accounts_to_process) 
+    # Импортируем только модули задач из tasks.py, до старта аккаунтов
+    import_task_modules(config.FLOW.TASKS)
 
-    threads = config.SETTINGS.THREADS
+    try:
+        journal = start_journal(config.FLOW.TASKS, resume)
+    except ValueError as e:
+        logger.error(e)
+        return
 
-    # Подготавливаем прокси для выбранных аккаунтов
-    cycled_proxies = [
-        proxies[i % len(proxies)] for i in range(len(accounts_to_process))
-    ]
+    if queue_path:
+        # Аккаунты раздаёт общая очередь, ACCOUNTS_RANGE у всех узлов одинаковый
+        accounts_by_index = {
+            start_index + idx: (
+                start_index + idx,
+                proxies[idx % len(proxies)],
+                accounts_to_process[idx],
+                "",  # discord token
+                twitter_tokens[idx],
+                "",  # email
+            )
+            for idx in range(len(accounts_to_process))
+        }
+        await run_queue_node(
+            WorkQueue(queue_path, queue_name), accounts_by_index, config, workers
+        )
+        src.utils.print_wallets_stats(config)
+        return
 
     # Создаем список индексов и перемешиваем его
     shuffled_indices = list(range(len(accounts_to_process)))
+    if resume:
+        finished = journal.finished_accounts()
+        shuffled_indices = [
+            idx for idx in shuffled_indices if start_index + idx not in finished
+        ]
+        logger.info(
+            f"Resuming run {journal.run_id}: {len(finished)} accounts already done, "
+            f"{len(shuffled_indices)} left"
+        )
     random.shuffle(shuffled_indices)
 
     # Создаем строку с порядком аккаунтов
@@ -200,36 +232,140 @@ async def start():
     )
     logger.info(f"Accounts order: {account_order}")
 
-    lock = asyncio.Lock()
-    semaphore = asyncio.Semaphore(value=threads)
-    tasks = []
-
     # Создаем трекер прогресса перед созданием задач
-    total_accounts = len(accounts_to_process)
+    total_accounts = len(shuffled_indices)
     progress_tracker = await create_progress_tracker(
         total=total_accounts, description="Accounts completed"
     )
 
-    # Используем перемешанные индексы для создания задач
-    for shuffled_idx in shuffled_indices:
-        tasks.append(
-            asyncio.create_task(
-                launch_wrapper(
-                    start_index + shuffled_idx,
-                    cycled_proxies[shuffled_idx],
-                    accounts_to_process[shuffled_idx],
-                    discord_tokens[shuffled_idx],
-                    twitter_tokens[shuffled_idx],
-                    emails[shuffled_idx],
-                )
+    # Аккаунты собираются лениво: в памяти только те, что сейчас в работе
+    def accounts():
+        for shuffled_idx in shuffled_indices:
+            yield (
+                start_index + shuffled_idx,
+                proxies[shuffled_idx % len(proxies)],
+                accounts_to_process[shuffled_idx],
+                "",  # discord token
+                twitter_tokens[shuffled_idx],
+                "",  # email
             )
-        )
 
-    await asyncio.gather(*tasks)
+    if workers > 1:
+        # Каждый процесс со своим event loop и своими THREADS, прогресс и статистика собираются здесь
+        shards = split_shards(list(accounts()), workers)
+        await run_sharded(shard_main, shards, progress_tracker, config, journal.run_id)
+    else:
+        await run_accounts(accounts(), config, progress_tracker)
 
     logger.success("Saved accounts and private keys to a file.")
 
-    print_wallets_stats(config)
+    src.utils.print_wallets_stats(config)
+
+
+async def run_accounts(
+    accounts,
+    config: src.utils.config.Config,
+    progress_tracker,
+    on_finished: Optional[Callable[[int, bool], None]] = None,
+):
+    """Run account_flow for every account tuple on the worker pool"""
+    lock = asyncio.Lock()
+
+    async def launch_wrapper(account):
+        success = await account_flow(*account, config, lock, progress_tracker)
+        if on_finished:
+            on_finished(account[0], success)
+
+    adaptive = config.ADAPTIVE_THREADS
+    pool = WorkerPool(
+        config.SETTINGS.THREADS,
+        max_workers=adaptive.MAX_THREADS if adaptive.ENABLED else None,
+    )
+    controller = AdaptiveConcurrency(pool, adaptive) if adaptive.ENABLED else None
+    if controller:
+        controller.start()
+    try:
+        await pool.run(accounts, launch_wrapper)
+    finally:
+        if controller:
+            await controller.stop()
+            logger.info(f"Adaptive threads over time: {controller.report()}")
+
+
+async def run_queue_node(
+    queue: WorkQueue, accounts_by_index: Dict[int, tuple], config: src.utils.config.Config, workers: int
+):
+    """Work as one node of a --queue farm until every account of the queue is finished"""
+    if workers > 1:
+        logger.warning("--workers is ignored with --queue: start more nodes instead")
+
+    added = queue.seed(accounts_by_index)
+    counts = queue.counts()
+    logger.info(f"Queue {queue.name} ({queue.path}), node {queue.node_id}: added {added} accounts, {counts}")
+    progress_tracker = await create_progress_tracker(
+        total=max(1, counts["pending"] + counts["leased"]), description="Accounts completed"
+    )
+    journal = get_journal()
+
+    def finished(account_index: int, success: bool):
+        result = {"node": queue.node_id, "tasks": journal.account_results(account_index) if journal else []}
+        queue.complete(account_index, success, result)
+
+    def claimed():
+        while batch := queue.claim():
+            logger.info(f"Claimed accounts {batch}")
+            for account_index in batch:
+                if account_index in accounts_by_index:
+                    yield accounts_by_index[account_index]
+                else:
+                    logger.error(f"[{account_index}] Account is not in ACCOUNTS_RANGE of this node")
+                    queue.complete(account_index, False, {"node": queue.node_id, "error": "unknown account"})
+
+    queue.start_heartbeat()
+    try:
+        while True:
+            await run_accounts(claimed(), config, progress_tracker, on_finished=finished)
+            if queue.counts()["pending"]:
+                # Упавшие аккаунты вернулись в очередь, пока доделывались остальные
+                continue
+            # Свободных аккаунтов нет - ждём, пока другие узлы закончат или их аренда истечёт
+            wait = queue.next_expiry()
+            if wait is None:
+                break
+            logger.info(f"Other nodes hold leases, checking again in {wait + 1:.0f} seconds")
+            await asyncio.sleep(wait + 1)
+    finally:
+        await queue.stop_heartbeat()
+        logger.info(f"Queue {queue.name}: {queue.counts()}")
+        queue.close()
+
+
+def shard_main(shard_id: int, accounts: list, events, run_id: str):
+    """Entry point of a --workers process: runs its share of accounts on its own loop"""
+    from main import log_format
+
+    logger.remove()
+    logger.add(sys.stdout, colorize=True, format=f"<magenta>[w{shard_id}]</magenta> {log_format}")
+    if src.utils.get_config().SETTINGS.USE_UVLOOP:
+        install_uvloop()
+    asyncio.run(_run_shard(shard_id, accounts, events, run_id))
+
+
+async def _run_shard(shard_id: int, accounts: list, events, run_id: str):
+    config = src.utils.get_config()
+    monitor = start_lag_monitor(config.SETTINGS.LOOP_LAG_THRESHOLD)
+    try:
+        import_task_modules(config.FLOW.TASKS)
+        start_journal(config.FLOW.TASKS, resume=run_id)
+        await run_accounts(accounts, config, ShardProgress(events))
+        report_wallets(events, config)
+    finally:
+        if monitor is not None:
+            await monitor.stop()
+        web3_provider = sys.modules.get("src.utils.web3_provider")
+        if web3_provider is not None:
+            await web3_provider.close_web3_providers()
+        events.put(("done", shard_id))
 
 
 async def account_flow(
@@ -243,13 +379,14 @@ async def account_flow(
     lock: asyncio.Lock,
     progress_tracker: ProgressTracker,
 ):
+    budget = start_retry_budget(config.SETTINGS.RETRY_BUDGET)
     try:
         pause = random.randint(
             config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[0],
             config.SETTINGS.RANDOM_INITIALIZATION_PAUSE[1],
         )
         logger.info(f"[{account_index}] Sleeping for {pause} seconds before start...")
-        await asyncio.sleep(pause)
+        await pool_pause(pause)
 
         report = False
 
@@ -257,11 +394,11 @@ async def account_flow(
             account_index, proxy, private_key, discord_token, twitter_token, email, config
         )
 
-        result = await wrapper(instance.initialize, config)
+        result = await wrapper(instance.initialize)
         if not result:
             report = True
 
-        result = await wrapper(instance.flow, config)
+        result = await wrapper(instance.flow)
         if not result:
             report = True
 
@@ -270,39 +407,32 @@ async def account_flow(
             config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACCOUNTS[1],
         )
         logger.info(f"Sleeping for {pause} seconds before next account...")
-        await asyncio.sleep(pause)
+        await pool_pause(pause)
+
+        if budget.spent:
+            logger.info(
+                f"[{account_index}] Retries: {budget.spent}/{budget.retries}, {budget.waited:.0f} seconds in retry pauses"
+            )
 
         # В конце функции, независимо от результата, обновляем прогресс
         await progress_tracker.increment(1)
+        return not report
 
     except Exception as err:
         logger.error(f"{account_index} | Account flow failed: {err}")
         # Даже если произошла ошибка, все равно считаем аккаунт обработанным
         await progress_tracker.increment(1)
+        return False
 
 
-async def wrapper(function, config: src.utils.config.Config, *args, **kwargs):
-    attempts = config.SETTINGS.ATTEMPTS
-    for attempt in range(attempts):
-        result = await function(*args, **kwargs)
+async def wrapper(function, *args, **kwargs):
+    def failed(result) -> bool:
         if isinstance(result, tuple) and result and isinstance(result[0], bool):
-            if result[0]:
-                return result
-        elif isinstance(result, bool):
-            if result:
-                return True
-
-        if attempt < attempts - 1:  # Don't sleep after the last attempt
-            pause = random.randint(
-                config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
-                config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
-            )
-            logger.info(
-                f"Sleeping for {pause} seconds before next attempt {attempt+1}/{config.SETTINGS.ATTEMPTS}..."
-            )
-            await asyncio.sleep(pause)
+            return not result[0]
+        return not (isinstance(result, bool) and result)
 
-    return result
+    # Повторы и паузы решает класс последней ошибки: revert и нехватку средств не повторяем
+    return await retry(function, *args, failed=failed, **kwargs)
 
 
 def task_exists_in_config(task_name: str, tasks_list: list) -> bool:
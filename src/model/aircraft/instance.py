@@ -4,13 +4,17 @@ import json
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from typing import Dict, Optional
 from eth_account.messages import encode_defunct
 import functools
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 # Global database lock for thread safety
@@ -88,12 +92,8 @@ class Aircraft:
         self.auth_token = None
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
+
     def get_auth_headers(self) -> Dict[str, str]:
         """Get headers with authorization if token is available."""
         headers = {}
@@ -102,20 +102,6 @@ class Aircraft:
         return headers
 
     @with_retries
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     @with_retries
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -450,8 +436,8 @@ class Aircraft:
         )
         
         # Get nonce and gas parameters
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
-        gas_params = await self.get_gas_params()
+        nonce = await get_nonce(self.web3, self.account.address)
+        gas_params = await get_gas_params(self.web3)
         
         # Build transaction
         tx = await transaction.build_transaction({
@@ -549,7 +535,7 @@ class Aircraft:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
         logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
         
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
         
         if receipt['status'] == 1:
             logger.success(f"[{self.account_index}] Transaction successful! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}")
@@ -3,12 +3,17 @@ from decimal import Decimal
 import random
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
-from typing import Dict, Optional, List
+from typing import Optional, List
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from .constants import STAKE_ABI, STAKE_ADDRESS
 
 
@@ -28,25 +33,7 @@ class Apriori:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -77,7 +64,7 @@ class Apriori:
                 # Создаем синхронную версию контракта для кодирования данных
                 contract = Web3().eth.contract(address=STAKE_ADDRESS, abi=STAKE_ABI)
                 amount_wei = Web3.to_wei(random_amount, "ether")
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -97,10 +84,7 @@ class Apriori:
                 # Добавляем остальные параметры транзакции
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -117,7 +101,7 @@ class Apriori:
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully staked {random_amount} MON on Apriori. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -125,6 +109,8 @@ class Apriori:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Apriori.stake_mon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -173,7 +159,7 @@ class Apriori:
 
             
                 # Получаем параметры газа
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 # Создаем базовую транзакцию для вызова requestRedeem
                 transaction = {
@@ -194,10 +180,7 @@ class Apriori:
                 # Добавляем остальные параметры транзакции
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -212,7 +195,7 @@ class Apriori:
                 
                 # Ждем подтверждения транзакции
                 logger.info(f"[{self.account_index}] Waiting for unstake request confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -224,6 +207,8 @@ class Apriori:
                     return False
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Apriori.request_unstake"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
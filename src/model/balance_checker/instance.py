@@ -1,7 +1,7 @@
 from eth_account import Account
-from web3 import AsyncWeb3
 from src.model.balance_checker.constants import CONTRACT_ABI, CONTRACT_ADDRESS, TOKENS
 from src.utils.constants import RPC_URL
+from src.utils.web3_provider import get_web3
 from tabulate import tabulate
 from loguru import logger
 
@@ -11,12 +11,7 @@ class BalanceChecker:
         self.private_keys = private_keys
         self.addresses = self.convert_private_keys()
         self.proxy = proxy
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
     def convert_private_keys(self):
         addresses = []
         for private_key in self.private_keys:
@@ -1,9 +1,7 @@
-from web3 import AsyncWeb3
 from eth_account import Account
-from typing import Dict, Optional, List, Tuple
+from typing import Optional, List, Tuple
 from decimal import Decimal
 import random
-import numpy as np
 import asyncio
 from loguru import logger
 from src.utils.config import Config
@@ -20,6 +18,10 @@ from src.model.crusty_swap.constants import (
     REFUEL_FROM_ONE_TO_ALL_CONTRACT_ABI
 )
 from src.utils.constants import RPC_URL, ETH_RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 class CrustySwap:
     def __init__(
@@ -34,18 +36,8 @@ class CrustySwap:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
-        self.eth_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                ETH_RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.monad_web3 = get_web3(RPC_URL, proxy)
+        self.eth_web3 = get_web3(ETH_RPC_URL, proxy)
         self.monad_contract = self.monad_web3.eth.contract(address=DESTINATION_CONTRACT_ADDRESS, abi=CRUSTY_SWAP_ABI)
 
     async def check_available_monad(self, eth_amount_wei, contract, max_retries=5, retry_delay=5) -> bool:
@@ -130,7 +122,7 @@ class CrustySwap:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
+            web3 = get_web3(CRUSTY_SWAP_RPCS[network])
             return await web3.eth.get_balance(self.account.address)
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
@@ -163,40 +155,10 @@ class CrustySwap:
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
-    async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
-        """Get gas parameters based on the top 90% values from the last 5 blocks."""
-        latest_block_number = await web3.eth.block_number
-        num_blocks = 3
-
-        base_fees = []
-        priority_fees = []
-
-        for block_num in range(latest_block_number - num_blocks + 1, latest_block_number + 1):
-            block = await web3.eth.get_block(block_num, full_transactions=True)
-            if block.get("baseFeePerGas") is not None:
-                base_fees.append(block["baseFeePerGas"])
-
-            # Collect maxPriorityFeePerGas from each transaction
-            for tx in block.get("transactions", []):
-                if "maxPriorityFeePerGas" in tx and tx["maxPriorityFeePerGas"] is not None:
-                    priority_fees.append(tx["maxPriorityFeePerGas"])
-
-        if not base_fees or not priority_fees:
-            raise Exception("Unable to collect enough base or priority fee data from recent blocks.")
-
-        base_fee = int(np.percentile(base_fees, 90))
-        max_priority_fee = int(np.percentile(priority_fees, 90))
-        max_fee = int(base_fee + max_priority_fee)
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-    
     async def get_minimum_deposit(self, network: str) -> int:
         """Get minimum deposit amount for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
+            web3 = get_web3(CRUSTY_SWAP_RPCS[network])
             contract = web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
             return await contract.functions.minimumDeposit().call()
         except Exception as e:
@@ -260,8 +222,8 @@ class CrustySwap:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
-            gas_params = await self.get_gas_params(web3)
+            web3 = get_web3(CRUSTY_SWAP_RPCS[network])
+            gas_params = await get_gas_params(web3, strategy="percentile")
             contract = web3.eth.contract(address=CONTRACT_ADDRESSES[network], abi=CRUSTY_SWAP_ABI)
             # Estimate gas using the same gas parameters from get_balances
 
@@ -303,7 +265,7 @@ class CrustySwap:
                 
                 amount_wei = int(round(web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
             # Get nonce
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(web3, self.account.address)
             has_enough_monad = await self.check_available_monad(amount_wei, contract)
             if not has_enough_monad:
                 logger.error(f"[{self.account_index}] Not enough MON in the contract for your amount of ETH deposit, try again later")
@@ -326,7 +288,7 @@ class CrustySwap:
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{EXPLORER_URLS[network]}{tx_hash.hex()}"
             
@@ -474,7 +436,7 @@ class CrustySwap:
                 amount_to_sell_ether = self.config.CRUSTY_SWAP.SELL_MAXIMUM_AMOUNT * random.uniform(0.95, 0.99)
             amount_to_sell_wei = int(round(self.monad_web3.to_wei(amount_to_sell_ether, 'ether'), random.randint(8, 12)))
             
-            nonce = await self.monad_web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(self.monad_web3, self.account.address)
             difference = amount_to_sell_ether - initial_balance
             if difference < 0.03:
                 amount_to_sell_ether = amount_to_sell_ether - random.uniform(0.03, 0.04)
@@ -484,7 +446,7 @@ class CrustySwap:
                 amount_to_sell_wei = int(round(self.monad_web3.to_wei(minimal_sell_ether, 'ether') * random.uniform(1.01, 1.1), random.randint(8, 12)))
             
             logger.info(f"[{self.account_index}] Trying to sell: {self.monad_web3.from_wei(amount_to_sell_wei, 'ether')} MON")
-            gas_params = await self.get_gas_params(self.monad_web3)
+            gas_params = await get_gas_params(self.monad_web3, strategy="percentile")
             gas_estimate = await self.monad_web3.eth.estimate_gas({
                 'from': self.account.address,
                 'to': self.monad_contract.address,
@@ -509,7 +471,7 @@ class CrustySwap:
             tx_hash = await self.monad_web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for sell transaction confirmation...")
-            receipt = await self.monad_web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.monad_web3, tx_hash)
             
             explorer_url = f"{EXPLORER_URL}{tx_hash.hex()}"
             
@@ -618,8 +580,8 @@ class CrustySwap:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(CRUSTY_SWAP_RPCS[network]))
-            gas_params = await self.get_gas_params(web3)
+            web3 = get_web3(CRUSTY_SWAP_RPCS[network])
+            gas_params = await get_gas_params(web3, strategy="percentile")
             contract = web3.eth.contract(address=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ADDRESS[network], abi=REFUEL_FROM_ONE_TO_ALL_CONTRACT_ABI)
             # Estimate gas using the same gas parameters from get_balances
 
@@ -662,7 +624,7 @@ class CrustySwap:
                 
                 amount_wei = int(round(web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
             # Get nonce
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(web3, self.account.address)
             has_enough_monad = await self.check_available_monad(amount_wei, contract)
             if not has_enough_monad:
                 logger.error(f"[{self.account_index}] Not enough MON in the contract for your amount of ETH deposit, try again later")
@@ -686,7 +648,7 @@ class CrustySwap:
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{EXPLORER_URLS[network]}{tx_hash.hex()}"
             await self._handle_transaction_status(receipt, explorer_url, initial_balance, network, address)
@@ -1,11 +1,14 @@
 import asyncio
 from loguru import logger
-from web3 import AsyncHTTPProvider, AsyncWeb3
 from typing import List
 import random
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 from .utils import get_monad_balance, WalletInfo
 
 
@@ -17,12 +20,7 @@ class DisperseFromOneWallet:
         self.main_keys = main_keys
         self.proxies = proxies
         self.config = config
-        self.web3 = AsyncWeb3(
-            AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxies[0]}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxies[0])
 
     async def disperse(self):
         try:
@@ -34,9 +32,6 @@ class DisperseFromOneWallet:
             success_count = 0
             total_transfers = 0
 
-            # Get initial nonce
-            nonce = await self.web3.eth.get_transaction_count(farm_account.address)
-
             logger.info(f"Processing {len(self.main_keys)} main wallets")
             for index, main_key in enumerate(self.main_keys):
                 logger.info(f"Processing wallet {index+1}/{len(self.main_keys)}")
@@ -98,14 +93,14 @@ class DisperseFromOneWallet:
                 logger.info(
                     f"Initiating transfer of {amount_needed} MON to {main_account.address[:8]}..."
                 )
+                nonce = await get_nonce(self.web3, farm_account.address)
                 success = await self.transfer_to_wallet(
                     farm_account, main_account.address, amount_needed, nonce
                 )
 
                 if success:
                     success_count += 1
-                    nonce += 1
-                    logger.info(f"Transfer successful. New nonce: {nonce}")
+                    logger.info(f"Transfer successful. Nonce used: {nonce}")
                 else:
                     logger.error("Transfer failed")
 
@@ -141,7 +136,7 @@ class DisperseFromOneWallet:
                 "to": to_address,
                 "value": amount_wei,
                 "nonce": nonce,
-                "gasPrice": await self.web3.eth.gas_price,
+                "gasPrice": await get_gas_price(self.web3),
             }
 
             # Estimate gas and update transaction
@@ -157,7 +152,7 @@ class DisperseFromOneWallet:
             )
 
             # Wait for transaction receipt
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
 
             if receipt["status"] == 1:
                 random_pause = random.uniform(
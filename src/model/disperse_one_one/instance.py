@@ -1,11 +1,12 @@
 from loguru import logger
-from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3 import AsyncWeb3
 import random
 import asyncio
 from typing import List
 
 from src.utils.constants import RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
 from .utils import get_all_balances, WalletInfo, WalletGroup, process_single_transfer
 
 
@@ -15,12 +16,7 @@ class DisperseOneOne:
         self.farm_keys = farm_keys
         self.proxies = proxies
         self.config = config
-        self.web3 = AsyncWeb3(
-            AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxies[0]}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxies[0])
 
     async def disperse(self):
         try:
@@ -6,6 +6,9 @@ from typing import List
 import random
 
 from src.utils.config import Config
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 @dataclass
@@ -94,7 +97,7 @@ async def process_single_transfer(
     async with semaphore:
         try:
             # Get the nonce for this wallet
-            nonce = await web3.eth.get_transaction_count(farm_wallet.address)
+            nonce = await get_nonce(web3, farm_wallet.address)
 
             # Create transaction
             transaction = {
@@ -102,7 +105,7 @@ async def process_single_transfer(
                 "to": main_address,
                 "value": farm_wallet.balance_wei,  # Send entire balance
                 "nonce": nonce,
-                "gasPrice": await web3.eth.gas_price,
+                "gasPrice": await get_gas_price(web3),
             }
 
             # Estimate gas and update transaction
@@ -120,7 +123,7 @@ async def process_single_transfer(
             tx_hash = await web3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
             # Wait for transaction receipt
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
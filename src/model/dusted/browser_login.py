@@ -9,6 +9,7 @@ import random
 from patchright.async_api import async_playwright
 
 from src.utils.config import Config
+from src.utils.retry import give_up
 
 
 def get_profiles_dir() -> str:
@@ -347,6 +348,8 @@ async def dusted_browser_login(config: Config, private_key: str, proxy: str) ->
             if profile_dir:  # Clean up profile on error
                 cleanup_profile(profile_dir)
 
+            if give_up(e, "dusted_browser_login"):
+                break
             random_pause = random.uniform(
                 config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                 config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -7,7 +7,7 @@ import secrets
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from typing import Dict, Optional, List
 from eth_account.messages import encode_defunct
 import functools
@@ -16,6 +16,10 @@ import time
 from src.model.dusted.browser_login import dusted_browser_login
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 def with_retries(func):
@@ -75,12 +79,8 @@ class Dusted:
         self.user_id = None
         self.twitter_connected = False
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
+
     def get_auth_headers(self) -> Dict[str, str]:
         """Get headers with authorization if token is available."""
         headers = {"Content-Type": "application/json"}
@@ -103,20 +103,6 @@ class Dusted:
         return cls._b64safe(h)
 
     @with_retries
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     @with_retries
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -746,8 +732,8 @@ class Dusted:
             contract = self.web3.eth.contract(address=contract_address, abi=abi)
 
             # Prepare transaction
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
-            gas_params = await self.get_gas_params()
+            nonce = await get_nonce(self.web3, self.account.address)
+            gas_params = await get_gas_params(self.web3)
 
             # Convert signature to bytes if it's a string
             if isinstance(signature, str) and signature.startswith("0x"):
@@ -792,7 +778,7 @@ class Dusted:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
         logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
 
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
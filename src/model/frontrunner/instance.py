@@ -3,10 +3,11 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from src.model.frontrunner.constants import ABI, CONTRACT_ADDRESS
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.tx_builder import TxBuilder
 
 
 class Frontrunner:
@@ -25,47 +26,22 @@ class Frontrunner:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        )     
+        self.web3 = get_web3(RPC_URL, proxy)
         self.contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(CONTRACT_ADDRESS),
             abi=ABI
         )
+        self.tx_builder = TxBuilder(self.web3, self.account)
 
     async def send_transaction(self):
         amount_of_transactions = random.randint(self.config.FRONT_RUNNER.MAX_AMOUNT_TRANSACTIONS_FOR_ONE_RUN[0], self.config.FRONT_RUNNER.MAX_AMOUNT_TRANSACTIONS_FOR_ONE_RUN[1])
         for i in range(amount_of_transactions):
             try:
                 logger.info(f"[{self.account_index}] Transaction {i+1} of {amount_of_transactions}")                
-                # Get current nonce
-                nonce = await self.web3.eth.get_transaction_count(self.account.address)
-                
-                # Build the transaction properly
-                frontrun_tx = await self.contract.functions.frontrun().build_transaction(
-                    {
-                        "from": self.account.address,
-                        "nonce": nonce,
-                        "maxFeePerGas": self.web3.to_wei(60, "gwei"),
-                        "maxPriorityFeePerGas": self.web3.to_wei(2, "gwei"),
-                    }
-                )
-                
-                # Estimate gas and update the transaction
-                gas = await self.web3.eth.estimate_gas(frontrun_tx)
-                frontrun_tx['gas'] = gas
-                
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    frontrun_tx, self.account.key
-                )
-                tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
+                # Цены газа из оракула; зависшую транзакцию TxBuilder сам заменит с повышенными
                 logger.info(f"[{self.account_index}] Waiting for transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(
-                    tx_hash, poll_latency=2
-                )
+                receipt = await self.tx_builder.submit(self.contract.functions.frontrun())
+                tx_hash = receipt["transactionHash"]
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -1,4 +1,3 @@
-from web3 import AsyncWeb3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 from decimal import Decimal
@@ -13,6 +12,10 @@ from src.model.gaszip.constants import (
     GASZIP_EXPLORERS
 )
 from src.utils.constants import RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 class Gaszip:
@@ -28,12 +31,7 @@ class Gaszip:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.monad_web3 = get_web3(RPC_URL, proxy)
 
     async def get_monad_balance(self) -> float:
         """Get native MON balance."""
@@ -47,11 +45,7 @@ class Gaszip:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(
-                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                )
-            )
+            web3 = get_web3(GASZIP_RPCS[network])
             balance_wei = await web3.eth.get_balance(self.account.address)
             return float(web3.from_wei(balance_wei, "ether"))
         except Exception as e:
@@ -123,17 +117,13 @@ class Gaszip:
                 
                 if self.config.GASZIP.BRIDGE_ALL:
                     # Get a Web3 instance for this network
-                    web3 = AsyncWeb3(
-                        AsyncWeb3.AsyncHTTPProvider(
-                            GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                        )
-                    )
+                    web3 = get_web3(GASZIP_RPCS[network])
 
                     # Build the actual transaction to estimate its gas cost
                     try:
                         # Get the current gas parameters (EIP-1559 or legacy)
                         # Store these for reuse in the actual transaction
-                        gas_params = await self.get_gas_params(web3)
+                        gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=1.5)
                         
                         # Create transaction object that would be used for bridging
                         tx = {
@@ -179,12 +169,8 @@ class Gaszip:
                     # For fixed amount refueling, we still need to get gas params
                     if balance > amount_to_refuel:
                         try:
-                            web3 = AsyncWeb3(
-                                AsyncWeb3.AsyncHTTPProvider(
-                                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                                )
-                            )
-                            gas_params = await self.get_gas_params(web3)
+                            web3 = get_web3(GASZIP_RPCS[network])
+                            gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=1.5)
                             eligible_networks.append((network, amount_to_refuel, gas_params))
                         except Exception as e:
                             logger.error(f"[{self.account_index}] Failed to get gas params for {network}: {str(e)}")
@@ -205,18 +191,6 @@ class Gaszip:
             logger.error(f"[{self.account_index}] Error checking balances: {str(e)}")
             return None
 
-    async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
-        """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-    
     async def refuel(self) -> bool:
         """Refuel MON from one of the supported networks."""
         try:
@@ -234,17 +208,13 @@ class Gaszip:
             logger.info(f"[{self.account_index}] Refueling from {network} with {amount} ETH")
             
             # Get web3 for the selected network
-            web3 = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(
-                    GASZIP_RPCS[network], request_kwargs={"ssl": False}
-                )
-            )
+            web3 = get_web3(GASZIP_RPCS[network])
             
             # Convert amount to wei
             amount_wei = web3.to_wei(amount, "ether")
             
             # Get nonce
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(web3, self.account.address)
             
             # Estimate gas using the same gas parameters from get_balances
             gas_estimate = await web3.eth.estimate_gas({
@@ -270,7 +240,7 @@ class Gaszip:
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{GASZIP_EXPLORERS[network]}{tx_hash.hex()}"
             
@@ -1,4 +1,4 @@
-from web3 import AsyncWeb3
+import asyncio
 from eth_account import Account
 from loguru import logger
 from typing import Optional, Tuple
@@ -7,6 +7,7 @@ from threading import Lock
 
 from src.utils.constants import RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import batch, get_web3
 
 
 @dataclass
@@ -21,11 +22,7 @@ class WalletInfo:
 class WalletStats:
     def __init__(self, config: Config, proxy: str):
         # Используем публичную RPC ноду Base
-        self.w3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL, request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False}
-            )
-        )
+        self.w3 = get_web3(RPC_URL, proxy)
         self.config = config
         self._lock = Lock()
 
@@ -47,13 +44,14 @@ class WalletStats:
             account = Account.from_key(private_key)
             address = account.address
 
-            # Получаем баланс
-            balance_wei = await self.w3.eth.get_balance(address)
+            # Баланс и количество транзакций (nonce) одним batch запросом
+            async with batch():
+                balance_wei, tx_count = await asyncio.gather(
+                    self.w3.eth.get_balance(address),
+                    self.w3.eth.get_transaction_count(address),
+                )
             balance_eth = self.w3.from_wei(balance_wei, "ether")
 
-            # Получаем количество транзакций (nonce)
-            tx_count = await self.w3.eth.get_transaction_count(address)
-
             wallet_info = WalletInfo(
                 account_index=account_index,
                 private_key=private_key,
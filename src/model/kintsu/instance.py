@@ -3,14 +3,19 @@ from decimal import Decimal
 import random
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
-from typing import Dict, Optional
+from typing import Optional
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from .constants import STAKE_ADDRESS, STAKE_ABI
 from src.utils.constants import ERC20_ABI
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 
 
 class Kintsu:
@@ -29,25 +34,7 @@ class Kintsu:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -84,7 +71,7 @@ class Kintsu:
                 # Create synchronous contract version for encoding data
                 contract = Web3().eth.contract(address=STAKE_ADDRESS, abi=STAKE_ABI)
                 amount_wei = Web3.to_wei(random_amount, "ether")
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Create base transaction for gas estimation
                 transaction = {
@@ -103,10 +90,7 @@ class Kintsu:
                 # Add remaining transaction parameters
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -123,7 +107,7 @@ class Kintsu:
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully staked {random_amount} MON on Kintsu. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -131,6 +115,8 @@ class Kintsu:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Kintsu.stake_mon"):
+                    break
                 error_message = str(e)
                 if "Minimum stake" in error_message:
                     logger.error(
@@ -205,7 +191,7 @@ class Kintsu:
  
                 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 # Create base transaction for requestUnlock
                 transaction = {
@@ -225,10 +211,7 @@ class Kintsu:
                 # Add remaining transaction parameters
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -243,7 +226,7 @@ class Kintsu:
                 
                 # Wait for transaction confirmation
                 logger.info(f"[{self.account_index}] Waiting for unstake request confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -263,6 +246,8 @@ class Kintsu:
                     }
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Kintsu.request_unstake"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -5,12 +5,16 @@ import time
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from decimal import Decimal
 from typing import Dict, List, Optional, Union, Tuple
 from web3.contract import AsyncContract
 from src.utils.config import Config
 from src.utils.constants import RPC_URL,EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.multicall import get_token_amounts
+from src.utils.account_state import get_native_balance, read_token_state
+from src.utils.tx_builder import TxBuilder
+from src.utils.retry import TransactionReverted, retry
 from .constants import (KURU_API_URL,
                         ROUTER_CONTRACT,
                         PRICE_CALCULATOR_ADDRESS,
@@ -31,15 +35,15 @@ class Kuru:
         self.private_key = private_key
         self.config = config
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(RPC_URL, request_kwargs={"proxy": f"http://{proxy}" if proxy else None})
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
         self.router_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(ROUTER_CONTRACT), abi=ABI["router"]
         )
         self.calculator_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(PRICE_CALCULATOR_ADDRESS), abi=ABI["calculator"]
         )
+        # Kuru принимает только legacy транзакции
+        self.tx_builder = TxBuilder(self.web3, self.account, gas_strategy="legacy", gas_buffer=1.3)
 
     async def execute(self):
         """
@@ -61,10 +65,8 @@ class Kuru:
             return
 
         # Get balances of all available tokens
-        token_balances = {}
-        for symbol, token_info in AVAILABLE_TOKENS.items():
-            balance = await self.get_token_balance(self.account.address, token_info)
-            token_balances[symbol] = balance
+        token_balances = await self._get_all_token_balances()
+        for symbol, balance in token_balances.items():
             logger.info(f"[{self.account_index}] Balance of {symbol}: {balance}")
 
         # # Check if we have any tokens other than MON
@@ -88,9 +90,7 @@ class Kuru:
             logger.info(f"[{self.account_index}] Executing swap {swap_num}/{num_swaps}")
 
             # Update token balances for accurate selection
-            for symbol, token_info in AVAILABLE_TOKENS.items():
-                balance = await self.get_token_balance(self.account.address, token_info)
-                token_balances[symbol] = balance
+            token_balances = await self._get_all_token_balances()
 
             # Choose random token pair for swap
             token_from, token_to, amount = await self._select_random_token_pair(
@@ -178,6 +178,9 @@ class Kuru:
         # Default threshold for any token not in the list
         default_threshold = 0.0000001
 
+        # Read all balances at once: swapping one token does not change the others
+        token_balances = await self._get_all_token_balances()
+
         # Iterate through all available tokens
         for symbol, token in AVAILABLE_TOKENS.items():
             # Skip MON, as it's the target token
@@ -185,7 +188,7 @@ class Kuru:
                 continue
 
             # Get token balance
-            balance = await self.get_token_balance(self.account.address, token)
+            balance = token_balances[symbol]
 
             # Get threshold for this token
             threshold = token_thresholds.get(symbol, default_threshold)
@@ -253,131 +256,87 @@ class Kuru:
         return True
 
     async def swap(self, token_from: str, token_to: str, amount: float, slippage: float = 1.0) -> Dict:
-
-        for retry in range(self.config.SETTINGS.ATTEMPTS):
-            try:
-                # 1. Получаем информацию о токенах
-                token_a = AVAILABLE_TOKENS[token_from]
-                token_b = AVAILABLE_TOKENS[token_to]
-
-                # 2. Получаем достоверную информацию о рынке (структура + цена)
-                market_info = await self.get_market_info(token_from, token_to)
-
-                # 3. Вычисляем параметры
-                address_a_cs = self.web3.to_checksum_address(token_a["address"])
-                address_b_cs = self.web3.to_checksum_address(token_b["address"])
-                is_buy_flag = (address_a_cs == market_info["quote_asset"])
-                is_native_send_flag = token_a.get("native", False)
-                pool_address = market_info.get("pool_address")
-                amount_in_decimal = Decimal(str(amount))
-
-                # --- ФИНАЛЬНЫЙ, ПРАВИЛЬНЫЙ РАСЧЕТ OUTPUT ---
-                if is_buy_flag:  # Отдаем Quote, покупаем Base
-                    # Нам нужен курс Quote -> Base
-                    price_to_use = market_info["price_quote_to_base"]
-                else:  # Отдаем Base, получаем Quote
-                    # Нам нужен курс Base -> Quote
-                    price_to_use = market_info["price_base_to_quote"]
-
-                # Выход ВСЕГДА равен количеству на курс
-                output_decimal = amount_in_decimal * price_to_use
-
-                min_amount_out_wei = int(output_decimal * (Decimal('100') - Decimal(str(slippage))) / Decimal('100') * (
-                            Decimal('10') ** token_b["decimals"]))
-                amount_in_wei = int(amount_in_decimal * (Decimal('10') ** token_a["decimals"]))
-
-                # 4. Approve (если нужно)
-                if not token_a.get("native"):
-                    await self.approve_token(token_a, amount_in_wei, ROUTER_CONTRACT)
-
-                # 5. Собираем транзакцию ТОЛЬКО Legacy-типа
-                tx_params = {
-                    "from": self.account.address,
-                    "nonce": await self.web3.eth.get_transaction_count(self.account.address, "latest"),
-                    "gasPrice": await self.web3.eth.gas_price,
-                    "value": amount_in_wei if token_a.get("native") else 0
-                }
-                #
-                # print(f"pool_address: {[pool_address]}")
-                # print(f"is_buy_flag: {[is_buy_flag]}")
-                # print(f"is_native_send_flag: {[is_native_send_flag]}")
-                # print(f"Токен A: {address_a_cs}")
-                # print(f"Токен B {address_b_cs}")
-                # print(f"Amount in Wei: {amount_in_wei}")
-                # print(f"Min_amount_out_wei: {min_amount_out_wei}")
-
-                # 6. Готовим и отправляем
-                swap_function = self.router_contract.functions.anyToAnySwap(
-                    [pool_address], [is_buy_flag], [is_native_send_flag],
-                    address_a_cs, address_b_cs,
-                    amount_in_wei, min_amount_out_wei
-                )
-                tx_to_estimate = await swap_function.build_transaction(tx_params)
-
-                # 2. Оцениваем газ для ПОЛНОЙ транзакции
-                estimated_gas = await self.estimate_gas(tx_to_estimate)
-
-                # 3. Добавляем рассчитанный газ в параметры
-                tx_params['gas'] = estimated_gas
-
-                # 4. Строим финальную транзакцию со всеми параметрами, включая 'gas'
-                final_tx = await swap_function.build_transaction(tx_params)
-                signed_tx = self.account.sign_transaction(final_tx)
-                # return {"success": True}
-                tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-
-                if receipt["status"] == 1:
-                    return {
-                        "success": True,
-                        "tx_hash": tx_hash.hex(),
-                        "amount_in": float(amount_in_decimal),  # Сумма, которую отправили
-                        "from_token": token_from,  # Токен, который отправили
-                        "to_token": token_to,  # Токен, который получили
-                        "expected_out": float(output_decimal)  # Ожидаемая сумма на выходе
-                    }
-                else:
-                    logger.error(f"[{self.account_index}] Транзакция провалилась (status 0).")
-                    continue
-            except Exception as e:
-                logger.error(
-                    f"[{self.account_index}] Ошибка в попытке {retry + 1}/{self.config.SETTINGS.ATTEMPTS}: {e}")
-                if retry < self.config.SETTINGS.ATTEMPTS - 1:
-                    pause = random.randint(5, 10)
-                    await asyncio.sleep(pause)
-        return {"success": False, "error": "Max retry attempts reached"}
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
-    async def estimate_gas(self, transaction: dict) -> int:
-        """Estimate gas for transaction and add a buffer."""
         try:
-            estimated = await self.web3.eth.estimate_gas(transaction)
-            return int(estimated * 1.1)
-        except Exception as e:
-            logger.warning(
-                f"[{self.account_index}] Error estimating gas: {e}. Using default gas limit"
+            # revert и нехватку средств не повторяем, сетевые ошибки - с backoff
+            return await retry(
+                self._swap_once, token_from, token_to, amount, slippage,
+                name=f"[{self.account_index}] Kuru swap {token_from} -> {token_to}",
             )
-            raise e
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+
+    async def _swap_once(self, token_from: str, token_to: str, amount: float, slippage: float) -> Dict:
+        # 1. Получаем информацию о токенах
+        token_a = AVAILABLE_TOKENS[token_from]
+        token_b = AVAILABLE_TOKENS[token_to]
+
+        # 2. Получаем достоверную информацию о рынке (структура + цена)
+        market_info = await self.get_market_info(token_from, token_to)
+
+        # 3. Вычисляем параметры
+        address_a_cs = self.web3.to_checksum_address(token_a["address"])
+        address_b_cs = self.web3.to_checksum_address(token_b["address"])
+        is_buy_flag = (address_a_cs == market_info["quote_asset"])
+        is_native_send_flag = token_a.get("native", False)
+        pool_address = market_info.get("pool_address")
+        amount_in_decimal = Decimal(str(amount))
+
+        # --- ФИНАЛЬНЫЙ, ПРАВИЛЬНЫЙ РАСЧЕТ OUTPUT ---
+        if is_buy_flag:  # Отдаем Quote, покупаем Base
+            # Нам нужен курс Quote -> Base
+            price_to_use = market_info["price_quote_to_base"]
+        else:  # Отдаем Base, получаем Quote
+            # Нам нужен курс Base -> Quote
+            price_to_use = market_info["price_base_to_quote"]
+
+        # Выход ВСЕГДА равен количеству на курс
+        output_decimal = amount_in_decimal * price_to_use
+
+        min_amount_out_wei = int(output_decimal * (Decimal('100') - Decimal(str(slippage))) / Decimal('100') * (
+                    Decimal('10') ** token_b["decimals"]))
+        amount_in_wei = int(amount_in_decimal * (Decimal('10') ** token_a["decimals"]))
+
+        # 4. Approve (если нужно)
+        if not token_a.get("native"):
+            await self.approve_token(token_a, amount_in_wei, ROUTER_CONTRACT)
+
+        # 5. Готовим и отправляем транзакцию ТОЛЬКО Legacy-типа
+        swap_function = self.router_contract.functions.anyToAnySwap(
+            [pool_address], [is_buy_flag], [is_native_send_flag],
+            address_a_cs, address_b_cs,
+            amount_in_wei, min_amount_out_wei
+        )
+        # Пара и сумма заданы в swap(), min_amount_out каждая попытка считает по свежей цене.
+        # Свап прошлой попытки без чека: если он в блоке - вернётся его чек, если висит -
+        # заменим тем же nonce, так что в блок попадёт только один
+        receipt = await self.tx_builder.submit(
+            swap_function,
+            value=amount_in_wei if token_a.get("native") else 0,
+            timeout=120,
+            intent=f"swap {amount} {token_from} -> {token_to}",
+        )
+        tx_hash = receipt["transactionHash"]
+
+        if receipt["status"] == 1:
+            return {
+                "success": True,
+                "tx_hash": tx_hash.hex(),
+                "amount_in": float(amount_in_decimal),  # Сумма, которую отправили
+                "from_token": token_from,  # Токен, который отправили
+                "to_token": token_to,  # Токен, который получили
+                "expected_out": float(output_decimal)  # Ожидаемая сумма на выходе
+            }
+        else:
+            raise TransactionReverted(f"swap tx {tx_hash.hex()} failed (status 0)")
 
     async def check_allowance(
             self, token_address: str, spender_address: str, amount_wei: int
     ) -> bool:
         """Check if allowance is sufficient for token."""
-        token_contract = await self.get_token_contract(token_address)
-        current_allowance = await token_contract.functions.allowance(
-            self.account.address, spender_address
-        ).call()
+        state = await read_token_state(
+            self.web3, self.account.address, {token_address: token_address}, spender_address
+        )
+        current_allowance = state.allowances[(token_address, self.web3.to_checksum_address(spender_address))]
         return current_allowance >= amount_wei
 
     async def get_token_contract(
@@ -428,36 +387,31 @@ class Kuru:
         spender_cs = self.web3.to_checksum_address(spender_address)
         token_contract = self.web3.eth.contract(address=self.web3.to_checksum_address(token['address']),
                                                 abi=ABI["token"])
-        allowance = await token_contract.functions.allowance(self.account.address, spender_cs).call()
+        # Из состояния аккаунта: после approve его обновляет Approval из чека
+        state = await read_token_state(
+            self.web3, self.account.address, {token['name']: token['address']}, spender_cs
+        )
+        allowance = state.allowances[(token['name'], spender_cs)]
         if allowance < amount_wei:
             logger.info(f"[{self.account_index}] Выполняем approve для {token['name']}...")
             approve_func = token_contract.functions.approve(spender_cs, 2 ** 256 - 1)
-            tx_params = {
-                'from': self.account.address,
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address, "latest"),
-                'gasPrice': await self.web3.eth.gas_price
-            }
-            tx_to_estimate = await approve_func.build_transaction(tx_params)
-            tx_params['gas'] = await self.estimate_gas(tx_to_estimate)
-            final_tx = await approve_func.build_transaction(tx_params)
-            signed_tx = self.account.sign_transaction(final_tx)
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            await self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
+            await self.tx_builder.submit(approve_func, timeout=120)
             logger.success(f"[{self.account_index}] Approve для {token['name']} успешен.")
 
+    async def _get_all_token_balances(self) -> Dict[str, float]:
+        """Balances of all AVAILABLE_TOKENS in one Multicall3 eth_call."""
+        return await get_token_amounts(self.web3, self.account.address, AVAILABLE_TOKENS)
+
     async def get_token_balance(self, wallet_address: str, token: dict) -> float:
         wallet_address_cs = self.web3.to_checksum_address(wallet_address)
         if token.get("native"):
-            balance_wei = await self.web3.eth.get_balance(wallet_address_cs)
+            balance_wei = await get_native_balance(self.web3, wallet_address_cs, fresh=True)
             return float(self.web3.from_wei(balance_wei, "ether"))
         else:
-            token_contract = self.web3.eth.contract(address=self.web3.to_checksum_address(token["address"]),
-                                                    abi=ABI["token"])
-            balance_wei = await token_contract.functions.balanceOf(wallet_address_cs).call()
-            return float(balance_wei) / (10 ** token["decimals"])
-
-    async def estimate_gas(self, transaction: dict) -> int:
-        return int(await self.web3.eth.estimate_gas(transaction) * 1.3)
+            state = await read_token_state(
+                self.web3, wallet_address_cs, {"token": token["address"]}, fresh=True
+            )
+            return float(state.balances["token"]) / (10 ** token["decimals"])
 
     async def _buy_random_token(self, mon_balance: float):
         """
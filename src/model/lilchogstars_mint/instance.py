@@ -2,11 +2,15 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 
@@ -62,12 +66,7 @@ class Lilchogstars:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
         self.nft_contract_address = (
             "0xb33D7138c53e516871977094B249C8f2ab89a4F4"  # Updated contract address
         )
@@ -124,11 +123,9 @@ class Lilchogstars:
                     {
                         "from": self.account.address,
                         "value": self.web3.to_wei(0, "ether"),  # Бесплатный минт
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "nonce": await get_nonce(self.web3, self.account.address),
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     }
                 )
 
@@ -143,7 +140,7 @@ class Lilchogstars:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -157,6 +154,8 @@ class Lilchogstars:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Lilchogstars.mint"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -5,6 +5,10 @@ from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from curl_cffi import requests
 
+from src.utils.rate_limit import rate_limit
+
+MINT_TOKEN_URL = "https://api-mainnet.magiceden.io/v4/self_serve/nft/mint_token"
+
 # List of common user agents
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/123.0.0.0 Safari/537.36",
@@ -85,10 +89,9 @@ async def get_mint_data(
                 delay = retry_delay * (1 + random.random())
                 await asyncio.sleep(delay)
 
-            response = await curl_session.post(
-                "https://api-mainnet.magiceden.io/v4/self_serve/nft/mint_token",
-                json=payload,
-            )
+            # curl_cffi сессия не проходит через RateLimitedClient
+            await rate_limit(MINT_TOKEN_URL)
+            response = await curl_session.post(MINT_TOKEN_URL, json=payload)
 
             # Check if we got an access denied response
             if "Access denied" in response.text:
@@ -2,11 +2,14 @@ import random
 import asyncio
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3
 
 from src.utils.config import Config
 from src.model.magiceden.get_mint_data import get_mint_data
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 class MagicEden:
@@ -25,10 +28,7 @@ class MagicEden:
         self.account = Account.from_key(private_key)
 
         # Initialize web3 with proxy if provided
-        proxy_settings = {"proxy": f"http://{proxy}", "ssl": False} if proxy else {}
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(RPC_URL, request_kwargs=proxy_settings)
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
     def get_random_gas_limit(self, min_gas: int = 180000, max_gas: int = 280000) -> int:
         """Generate random gas limit within range"""
@@ -68,7 +68,7 @@ class MagicEden:
                 return False
 
             # Get current gas prices
-            base_fee = await self.web3.eth.gas_price
+            base_fee = await get_gas_price(self.web3)
             priority_fee = int(base_fee * 0.1)  # 10% priority fee
             max_fee = base_fee + priority_fee
 
@@ -91,9 +91,7 @@ class MagicEden:
                             else int(tx_params["value"])
                         ),
                         "data": tx_params["data"],
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "maxFeePerGas": max_fee,
                         "maxPriorityFeePerGas": priority_fee,
                         "gas": gas_limit,
@@ -121,7 +119,7 @@ class MagicEden:
                     )
 
                     # Wait for receipt
-                    receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                    receipt = await wait_for_receipt(self.web3, tx_hash)
 
                     if receipt["status"] == 1:
                         logger.success(
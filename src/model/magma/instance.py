@@ -2,14 +2,18 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from loguru import logger
-from typing import Dict
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
 from .constants import STAKE_ADDRESS, STAKE_ABI, STAKED_TOKEN
 from src.utils.constants import ERC20_ABI
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 
 
 class Magma:
@@ -28,25 +32,7 @@ class Magma:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -101,7 +87,7 @@ class Magma:
                 
 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 # Create transaction for withdrawMon function
                 transaction = {
@@ -119,10 +105,7 @@ class Magma:
                 # Add remaining transaction parameters
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -137,7 +120,7 @@ class Magma:
                 
                 # Wait for transaction confirmation
                 logger.info(f"[{self.account_index}] Waiting for unstake request confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -157,6 +140,8 @@ class Magma:
                     }
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Magma.request_unstake"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -187,7 +172,7 @@ class Magma:
                 )
 
                 amount_wei = Web3.to_wei(random_amount, "ether")
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -206,10 +191,7 @@ class Magma:
                 # Добавляем остальные параметры транзакции
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -226,7 +208,7 @@ class Magma:
                 logger.info(
                     f"[{self.account_index}] Waiting for transaction confirmation..."
                 )
-                await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully staked {random_amount} MON on Magma. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -234,6 +216,8 @@ class Magma:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Magma.stake_mon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
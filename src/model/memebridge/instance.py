@@ -1,6 +1,5 @@
-from web3 import AsyncWeb3
 from eth_account import Account
-from typing import Dict, Optional, List, Tuple
+from typing import Optional, List, Tuple
 from decimal import Decimal
 import random
 import asyncio
@@ -13,6 +12,10 @@ from src.model.memebridge.constansts import (
     MEMEBRIDGE_EXPLORERS
 )
 from src.utils.constants import RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 class Memebridge:
@@ -28,12 +31,7 @@ class Memebridge:
         self.private_key = private_key
         self.config = config
         self.account = Account.from_key(private_key)
-        self.monad_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.monad_web3 = get_web3(RPC_URL, proxy)
         
     async def get_monad_balance(self) -> float:
         """Get native MON balance."""
@@ -47,7 +45,7 @@ class Memebridge:
     async def get_native_balance(self, network: str) -> float:
         """Get native token balance for a specific network."""
         try:
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
+            web3 = get_web3(MEMEBRIDGE_RPCS[network])
             return await web3.eth.get_balance(self.account.address)
         except Exception as e:
             logger.error(f"[{self.account_index}] Failed to get balance for {network}: {str(e)}")
@@ -80,19 +78,6 @@ class Memebridge:
         logger.error(f"[{self.account_index}] Balance didn't increase after {timeout} seconds")
         return False
     
-    async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
-        """Get gas parameters for transaction."""
-        latest_block = await web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await web3.eth.max_priority_fee
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-    
-
     async def get_eligible_networks(self):
         try:
             eligible_networks = []
@@ -131,8 +116,8 @@ class Memebridge:
                 logger.error(f"[{self.account_index}] No network found")
                 return False
             # Get web3 for the selected network
-            web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(MEMEBRIDGE_RPCS[network]))
-            gas_params = await self.get_gas_params(web3)
+            web3 = get_web3(MEMEBRIDGE_RPCS[network])
+            gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=1.5)
             # Estimate gas using the same gas parameters from get_balances
             gas_estimate = await web3.eth.estimate_gas({
                 'from': self.account.address,
@@ -167,7 +152,7 @@ class Memebridge:
                 
                 amount_wei = int(round(web3.to_wei(amount_ether, 'ether'), random.randint(8, 12)))
             # Get nonce
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(web3, self.account.address)
             
             tx = {
                 'from': self.account.address,
@@ -185,7 +170,7 @@ class Memebridge:
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for refuel transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{MEMEBRIDGE_EXPLORERS[network]}{tx_hash.hex()}"
             
@@ -5,10 +5,11 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.retry import give_up
 
 
 class MonadCurvance:
@@ -27,12 +28,7 @@ class MonadCurvance:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def login(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
@@ -40,6 +36,8 @@ class MonadCurvance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | MonadCurvance.login"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -1,4 +1,3 @@
-from web3 import AsyncWeb3
 from eth_account import Account
 import asyncio
 from typing import Dict, Optional, List, Tuple
@@ -19,35 +18,24 @@ from src.model.monad_xyz.constants import (
 from loguru import logger
 import random
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.retry import TransactionReverted
+from src.utils.tx_builder import TxBuilder
+from src.utils.account_state import read_token_state
 
 
 class AmbientDex:
     def __init__(
         self, private_key: str, proxy: Optional[str] = None, config: Config = None
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
         self.account = Account.from_key(private_key)
         self.proxy = proxy
         self.router_contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(AMBIENT_CONTRACT), abi=AMBIENT_ABI
         )
         self.config = config
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.tx_builder = TxBuilder(self.web3, self.account, abi=AMBIENT_ABI)
 
     def convert_to_wei(self, amount: float, token: str) -> int:
         """Convert amount to wei based on token decimals."""
@@ -67,39 +55,29 @@ class AmbientDex:
         """Get list of tokens with non-zero balances, including native token."""
         tokens_with_balance = []
 
-        # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
-        if native_balance > 0:
-            native_amount = float(self.web3.from_wei(native_balance, "ether"))
-            tokens_with_balance.append(("native", native_amount))
-
-        # Check other tokens
-        for token in AMBIENT_TOKENS:
-            try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        AMBIENT_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+        # Native and all token balances in one Multicall3 eth_call; fresh - swap amounts come from them
+        state = await read_token_state(
+            self.web3,
+            self.account.address,
+            {token: info["address"] for token, info in AMBIENT_TOKENS.items()},
+            fresh=True,
+        )
 
-                if balance > 0:
-                    decimals = AMBIENT_TOKENS[token]["decimals"]
-                    amount = float(Decimal(str(balance)) / Decimal(str(10**decimals)))
+        if state.native > 0:
+            native_amount = float(self.web3.from_wei(state.native, "ether"))
+            tokens_with_balance.append(("native", native_amount))
 
-                    # Skip SETH and WETH with low balances
-                    if token.lower() in ["seth", "weth"] and amount < 0.001:
-                        # logger.info(f"Skipping {token} with low balance ({amount}) for potential swaps")
-                        continue
+        for token, balance in state.balances.items():
+            if balance > 0:
+                decimals = AMBIENT_TOKENS[token]["decimals"]
+                amount = float(Decimal(str(balance)) / Decimal(str(10**decimals)))
 
-                    tokens_with_balance.append((token, amount))
+                # Skip SETH and WETH with low balances
+                if token.lower() in ["seth", "weth"] and amount < 0.001:
+                    # logger.info(f"Skipping {token} with low balance ({amount}) for potential swaps")
+                    continue
 
-            except Exception as e:
-                logger.error(f"Failed to get balance for {token}: {str(e)}")
-                continue
+                tokens_with_balance.append((token, amount))
 
         return tokens_with_balance
 
@@ -175,29 +153,18 @@ class AmbientDex:
             logger.error(f"Failed to generate Ambient swap data: {str(e)}")
             raise
 
-    async def execute_transaction(self, tx_data: Dict) -> str:
+    async def execute_transaction(self, tx_data: Dict, intent: Optional[str] = None) -> str:
         """Execute a transaction and wait for confirmation."""
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
-        gas_params = await self.get_gas_params()
-
-        transaction = {
-            "from": self.account.address,
-            "nonce": nonce,
-            "type": 2,
-            "chainId": 10143,
-            **tx_data,
-            **gas_params,
-        }
-
-        signed_txn = self.web3.eth.account.sign_transaction(
-            transaction, self.account.key
-        )
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
-
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(
-            tx_hash, poll_latency=2
+        # Повтор после таймаута сначала проверяет прошлую транзакцию, а не шлёт новую
+        receipt = await self.tx_builder.submit(
+            to=tx_data["to"],
+            data=tx_data["data"],
+            value=tx_data["value"],
+            gas=tx_data["gas"],
+            intent=intent,
         )
+        tx_hash = receipt["transactionHash"]
 
         if receipt["status"] == 1:
             logger.success(
@@ -207,7 +174,7 @@ class AmbientDex:
             logger.error(
                 f"Transaction failed! Explorer URL: {EXPLORER_URL}{tx_hash.hex()}"
             )
-            raise Exception("Transaction failed")
+            raise TransactionReverted("Transaction failed")
         return tx_hash.hex()
 
     async def approve_token(self, token: str, amount: int) -> str:
@@ -221,42 +188,23 @@ class AmbientDex:
             )
 
             # Check current allowance
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, AMBIENT_CONTRACT
-            ).call()
+            state = await read_token_state(
+                self.web3,
+                self.account.address,
+                {token: token_contract.address},
+                AMBIENT_CONTRACT,
+            )
+            current_allowance = state.allowances[(token, AMBIENT_CONTRACT)]
 
             if current_allowance >= amount:
                 logger.info(f"Allowance sufficient for {token}")
                 return None
 
-            # Prepare approval transaction
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
-            gas_params = await self.get_gas_params()
-
-            approve_tx = await token_contract.functions.approve(
-                AMBIENT_CONTRACT, amount
-            ).build_transaction(
-                {
-                    "from": self.account.address,
-                    "nonce": nonce,
-                    "type": 2,
-                    "chainId": 10143,
-                    **gas_params,
-                }
-            )
-
-            # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                approve_tx, self.account.key
-            )
-            tx_hash = await self.web3.eth.send_raw_transaction(
-                signed_txn.raw_transaction
-            )
-
             logger.info(f"Waiting for {token} approval confirmation...")
-            receipt = await self.web3.eth.wait_for_transaction_receipt(
-                tx_hash, poll_latency=2
+            receipt = await self.tx_builder.submit(
+                token_contract.functions.approve(AMBIENT_CONTRACT, amount)
             )
+            tx_hash = receipt["transactionHash"]
 
             if receipt["status"] == 1:
                 logger.success(
@@ -270,8 +218,11 @@ class AmbientDex:
             logger.error(f"Failed to approve {token}: {str(e)}")
             raise
 
-    async def swap(self, percentage_to_swap: float, type: str) -> str:
-        """Execute swap on Ambient DEX."""
+    async def swap(self, percentage_to_swap: float, type: str, intent: Optional[str] = None) -> str:
+        """
+        Execute swap on Ambient DEX. `intent` names the swap across retries:
+        a swap an earlier attempt already sent is not sent again.
+        """
         try:
             # Get tokens with actual balances
             tokens_with_balance = await self.get_tokens_with_balance()
@@ -320,7 +271,9 @@ class AmbientDex:
                         tx_data = await self.generate_swap_data(
                             token_in, "native", amount_wei
                         )
-                        tx_hash = await self.execute_transaction(tx_data)
+                        tx_hash = await self.execute_transaction(
+                            tx_data, intent=f"collect:{token_in}"
+                        )
 
                         # Wait between swaps
                         if token_in != tokens_to_swap[-1][0]:  # If not the last token
@@ -372,7 +325,7 @@ class AmbientDex:
             tx_data = await self.generate_swap_data(token_in, token_out, amount_wei)
 
             # Execute the transaction
-            return await self.execute_transaction(tx_data)
+            return await self.execute_transaction(tx_data, intent=intent)
 
         except Exception as e:
             logger.error(f"Ambient swap failed: {str(e)}")
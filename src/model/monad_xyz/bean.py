@@ -1,4 +1,3 @@
-from web3 import AsyncWeb3
 from eth_account import Account
 import asyncio
 from typing import Dict, Optional, List, Tuple
@@ -9,18 +8,18 @@ from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
 from src.model.monad_xyz.constants import BEAN_CONTRACT, BEAN_ABI, BEAN_TOKENS
 import time
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.account_state import get_native_balance, read_token_state
 
 
 class BeanDex:
     def __init__(
         self, private_key: str, proxy: Optional[str] = None, config: Config = None
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        )        
+        self.web3 = get_web3(RPC_URL, proxy)
         self.account = Account.from_key(private_key)
         self.proxy = proxy
         self.router_contract = self.web3.eth.contract(
@@ -28,30 +27,16 @@ class BeanDex:
         )
         self.config = config
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     async def get_token_balance(self, token: str) -> float:
         try:
             if token == "native":
-                balance_wei = await self.web3.eth.get_balance(self.account.address)
+                balance_wei = await get_native_balance(self.web3, self.account.address, fresh=True)
                 return float(self.web3.from_wei(balance_wei, "ether"))
 
-            token_contract = self.web3.eth.contract(
-                address=self.web3.to_checksum_address(BEAN_TOKENS[token]["address"]),
-                abi=ERC20_ABI,
+            state = await read_token_state(
+                self.web3, self.account.address, {token: BEAN_TOKENS[token]["address"]}, fresh=True
             )
-            balance = await token_contract.functions.balanceOf(
-                self.account.address
-            ).call()
+            balance = state.balances[token]
             decimals = BEAN_TOKENS[token]["decimals"]
             amount = float(Decimal(str(balance)) / Decimal(str(10**decimals)))
             return amount
@@ -64,8 +49,14 @@ class BeanDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
 
-        # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        # Native and all token balances in one Multicall3 eth_call; fresh - swap amounts come from them
+        state = await read_token_state(
+            self.web3,
+            self.account.address,
+            {token: info["address"] for token, info in BEAN_TOKENS.items()},
+            fresh=True,
+        )
+        native_balance = state.native
         if native_balance > 0:
             native_amount = float(self.web3.from_wei(native_balance, "ether"))
             tokens_with_balance.append(("native", native_amount))
@@ -73,15 +64,7 @@ class BeanDex:
         # Check other tokens
         for token in BEAN_TOKENS:
             try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        BEAN_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+                balance = state.balances[token]
 
                 if balance > 0:
                     decimals = BEAN_TOKENS[token]["decimals"]
@@ -101,16 +84,17 @@ class BeanDex:
                 abi=ERC20_ABI,
             )
 
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, BEAN_CONTRACT
-            ).call()
+            state = await read_token_state(
+                self.web3, self.account.address, {token: token_contract.address}, BEAN_CONTRACT
+            )
+            current_allowance = state.allowances[(token, self.web3.to_checksum_address(BEAN_CONTRACT))]
 
             if current_allowance >= amount:
                 logger.info(f"Allowance sufficient for {token}")
                 return None
 
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
-            gas_params = await self.get_gas_params()
+            nonce = await get_nonce(self.web3, self.account.address)
+            gas_params = await get_gas_params(self.web3)
 
             approve_tx = await token_contract.functions.approve(
                 BEAN_CONTRACT, amount
@@ -137,9 +121,7 @@ class BeanDex:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(
-            tx_hash, poll_latency=2
-        )
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
@@ -250,10 +232,8 @@ class BeanDex:
                     "from": self.account.address,
                     "value": value,
                     "gas": int(gas_estimate * 1.1),
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    **await self.get_gas_params(),
+                    "nonce": await get_nonce(self.web3, self.account.address),
+                    **await get_gas_params(self.web3),
                 }
             )
 
@@ -300,9 +280,15 @@ class BeanDex:
                             abi=ERC20_ABI,
                         )
 
-                        current_allowance = await token_contract.functions.allowance(
-                            self.account.address, BEAN_CONTRACT
-                        ).call()
+                        state = await read_token_state(
+                            self.web3,
+                            self.account.address,
+                            {token_in: token_contract.address},
+                            BEAN_CONTRACT,
+                        )
+                        current_allowance = state.allowances[
+                            (token_in, self.web3.to_checksum_address(BEAN_CONTRACT))
+                        ]
 
                         if current_allowance < amount_wei:
                             logger.info(
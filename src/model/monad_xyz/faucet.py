@@ -9,6 +9,7 @@ import hashlib
 from pynocaptcha import CloudFlareCracker, TlsV1Cracker
 from curl_cffi.requests import AsyncSession
 from src.utils.tls_client import TLSClient
+from src.utils.retry import give_up
 import json
 import platform
 import os
@@ -132,6 +133,8 @@ async def faucet(
                 continue
 
         except Exception as e:
+            if give_up(e, f"[{account_index}] | faucet"):
+                break
             random_pause = random.randint(
                 config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                 config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
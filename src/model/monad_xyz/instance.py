@@ -10,6 +10,15 @@ from src.model.monad_xyz.izumi import IzumiDex
 from src.model.monad_xyz.uniswap_swaps import MonadSwap
 from src.model.monad_xyz.faucet import faucet
 from src.utils.config import Config
+from src.utils.retry import retry, give_up
+
+# тип задачи -> (название для логов, класс свапалки)
+SWAPPERS = {
+    "swaps": ("monad.xyz", MonadSwap),
+    "ambient": ("Ambient", AmbientDex),
+    "bean": ("Bean", BeanDex),
+    "izumi": ("Izumi", IzumiDex),
+}
 
 
 class MonadXYZ:
@@ -33,265 +42,89 @@ class MonadXYZ:
 
     async def swaps(self, type: str):
         try:
-            if type == "swaps": 
+            if type in SWAPPERS:
+                name, swapper_class = SWAPPERS[type]
                 number_of_swaps = random.randint(
                     self.config.FLOW.NUMBER_OF_SWAPS[0], self.config.FLOW.NUMBER_OF_SWAPS[1]
                 )
-                logger.info(f"[{self.account_index}] | Will perform {number_of_swaps} swaps")
-                
-                for swap_num in range(number_of_swaps):
-                    success = False
-                    for retry in range(self.config.SETTINGS.ATTEMPTS):
-                        try:
-                            swapper = MonadSwap(self.private_key, self.proxy)
-                            amount = random.randint(
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
-                            )
-                            random_token = random.choice(["DAK", "YAKI", "CHOG"])
-                            logger.info(
-                                f"[{self.account_index}] | Swapping {amount}% of balance to {random_token}"
-                            )
-
-                            await swapper.swap(
-                                percentage_to_swap=amount, token_out=random_token,
-                            )
-                            random_pause = random.randint(
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                            )
-                            logger.success(
-                                f"[{self.account_index}] | Swapped {amount}% of balance to {random_token}. Swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
-                            )
-                            await asyncio.sleep(random_pause)
-                            success = True
-                            break  # Break retry loop on success
-                            
-                        except Exception as e:
-                            logger.error(
-                                f"[{self.account_index}] | Error swap in monad.xyz ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
-                            )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
-                            continue
-                    
-                    if not success:
-                        logger.error(f"[{self.account_index}] | Failed to complete swap {swap_num + 1}/{number_of_swaps} after all retries")
-                        break
+                logger.info(f"[{self.account_index}] | Will perform {number_of_swaps} {name} swaps")
 
-                return True
-            
-            elif type == "ambient":
-                number_of_swaps = random.randint(
-                    self.config.FLOW.NUMBER_OF_SWAPS[0], self.config.FLOW.NUMBER_OF_SWAPS[1]
-                )
-                logger.info(f"[{self.account_index}] | Will perform {number_of_swaps} Ambient swaps")
-                
                 for swap_num in range(number_of_swaps):
-                    success = False
-                    for retry in range(self.config.SETTINGS.ATTEMPTS):
-                        try:
-                            swapper = AmbientDex(self.private_key, self.proxy, self.config)
-                            amount = random.randint(
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
-                            )
-                            await swapper.swap(
-                                percentage_to_swap=amount,
-                                type="swap",
-                            )
-                            random_pause = random.randint(
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                            )
-                            logger.success(
-                                f"[{self.account_index}] | Completed Ambient swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
-                            )
-                            await asyncio.sleep(random_pause)
-                            success = True
-                            break  # Break retry loop on success
-                            
-                        except Exception as e:
-                            logger.error(
-                                f"[{self.account_index}] | Error swap in ambient ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
-                            )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
-                            continue
-                    
-                    if not success:
-                        logger.error(f"[{self.account_index}] | Failed to complete swap {swap_num + 1}/{number_of_swaps} after all retries")
-                        break
+                    # Параметры свапа выбираются один раз: повтор - тот же свап, а не новый
+                    amount = random.randint(
+                        self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
+                        self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
+                    )
+                    token_out = random.choice(["DAK", "YAKI", "CHOG"])
+                    # Повтор только для ошибок, которые могут пройти: revert не повторяем
+                    await retry(
+                        self._swap,
+                        swapper_class,
+                        amount,
+                        token_out,
+                        f"swap {swap_num + 1}",
+                        name=f"[{self.account_index}] | {name} swap",
+                    )
+                    random_pause = random.randint(
+                        self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+                        self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+                    )
+                    logger.success(
+                        f"[{self.account_index}] | Completed {name} swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
+                    )
+                    await asyncio.sleep(random_pause)
 
                 return True
-            
-            elif type == "bean":
-                number_of_swaps = random.randint(
-                    self.config.FLOW.NUMBER_OF_SWAPS[0], self.config.FLOW.NUMBER_OF_SWAPS[1]
-                )
-                logger.info(f"[{self.account_index}] | Will perform {number_of_swaps} Bean swaps")
-                
-                for swap_num in range(number_of_swaps):
-                    success = False
-                    for retry in range(self.config.SETTINGS.ATTEMPTS):
-                        try:
-                            swapper = BeanDex(self.private_key, self.proxy, self.config)
-                            amount = random.randint(
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
-                            )
-                            await swapper.swap(
-                                percentage_to_swap=amount,
-                                type="swap",
-                            )
-                            random_pause = random.randint(
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                            )
-                            logger.success(
-                                f"[{self.account_index}] | Completed Bean swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
-                            )
-                            await asyncio.sleep(random_pause)
-                            success = True
-                            break  # Break retry loop on success
-                            
-                        except Exception as e:
-                            logger.error(
-                                f"[{self.account_index}] | Error swap in bean ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
-                            )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
-                            continue
-                    
-                    if not success:
-                        logger.error(f"[{self.account_index}] | Failed to complete swap {swap_num + 1}/{number_of_swaps} after all retries")
-                        break
 
-                return True
-            
-            elif type == "izumi":
-                number_of_swaps = random.randint(
-                    self.config.FLOW.NUMBER_OF_SWAPS[0], self.config.FLOW.NUMBER_OF_SWAPS[1]
+            elif type == "collect_all_to_monad":
+                await retry(
+                    self._collect_all, name=f"[{self.account_index}] | Collect all to MON"
                 )
-                logger.info(f"[{self.account_index}] | Will perform {number_of_swaps} Izumi swaps")
-                
-                for swap_num in range(number_of_swaps):
-                    success = False
-                    for retry in range(self.config.SETTINGS.ATTEMPTS):
-                        try:
-                            swapper = IzumiDex(self.private_key, self.proxy, self.config)
-                            amount = random.randint(
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[0],
-                                self.config.FLOW.PERCENT_OF_BALANCE_TO_SWAP[1],
-                            )
-                            await swapper.swap(
-                                percentage_to_swap=amount,
-                                type="swap",
-                            )
-                            random_pause = random.randint(
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                                self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                            )
-                            logger.success(
-                                f"[{self.account_index}] | Completed Izumi swap {swap_num + 1}/{number_of_swaps}. Next swap in {random_pause} seconds"
-                            )
-                            await asyncio.sleep(random_pause)
-                            success = True
-                            break  # Break retry loop on success
-                            
-                        except Exception as e:
-                            logger.error(
-                                f"[{self.account_index}] | Error swap in izumi ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}"
-                            )
-                            if retry == self.config.SETTINGS.ATTEMPTS - 1:
-                                raise  # Re-raise if all retries failed
-                            continue
-                    
-                    if not success:
-                        logger.error(f"[{self.account_index}] | Failed to complete swap {swap_num + 1}/{number_of_swaps} after all retries")
-                        break
-
                 return True
-            
-            elif type == "collect_all_to_monad":
-                success = False
-                for retry in range(self.config.SETTINGS.ATTEMPTS):
-                    try:
-                        # First try collecting via MonadSwap
-                        swapper = MonadSwap(self.private_key, self.proxy)
-                        await swapper.swap(
-                            percentage_to_swap=100, token_out="native",
-                        )
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                        )
-                        logger.success(
-                            f"[{self.account_index}] | Collected all to monad.xyz. Next collect in {random_pause} seconds"
-                        )
-                        await asyncio.sleep(random_pause)
-
-                        # Then try collecting via Ambient
-                        ambient_swapper = AmbientDex(self.private_key, self.proxy, self.config)
-                        await ambient_swapper.swap(
-                            percentage_to_swap=100, type="collect"
-                        )
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                        )
-                        logger.success(
-                            f"[{self.account_index}] | Collected all tokens via Ambient. Next collect in {random_pause} seconds"
-                        )
-                        await asyncio.sleep(random_pause)
-                        
-                        # Then try collecting via Bean
-                        bean_swapper = BeanDex(self.private_key, self.proxy, self.config)
-                        await bean_swapper.swap(
-                            percentage_to_swap=100, type="collect"
-                        )
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                        )
-                        logger.success(
-                            f"[{self.account_index}] | Collected all tokens via Bean. Next collect in {random_pause} seconds"
-                        )
-                        await asyncio.sleep(random_pause)
-
-                        # Then try collecting via Izumi
-                        izumi_swapper = IzumiDex(self.private_key, self.proxy, self.config)
-                        await izumi_swapper.swap(
-                            percentage_to_swap=100, type="collect"
-                        )
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
-                        )   
-                        logger.success(
-                            f"[{self.account_index}] | Collected all tokens via Izumi. Next collect in {random_pause} seconds"
-                        )
-                        await asyncio.sleep(random_pause)
-
-                        success = True
-                        break  # Break the retry loop on success
-                        
-                    except Exception as e:
-                        random_pause = random.randint(
-                            self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
-                            self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
-                        )
-                        logger.error(
-                            f"[{self.account_index}] | Error collecting tokens ({retry + 1}/{self.config.SETTINGS.ATTEMPTS}): {e}. Next collect in {random_pause} seconds"
-                        )
-                        await asyncio.sleep(random_pause)
-                        continue
-                    
-                return success  # Return True if succeeded, False if all retries failed
         except Exception as e:
             logger.error(f"[{self.account_index}] | Error swaps: {e}")
             return False
 
+    async def _swap(self, swapper_class, amount: int, token_out: str, intent: str):
+        if swapper_class is MonadSwap:
+            swapper = MonadSwap(self.private_key, self.proxy)
+            logger.info(
+                f"[{self.account_index}] | Swapping {amount}% of balance to {token_out}"
+            )
+            await swapper.swap(percentage_to_swap=amount, token_out=token_out)
+        elif swapper_class is AmbientDex:
+            swapper = AmbientDex(self.private_key, self.proxy, self.config)
+            await swapper.swap(percentage_to_swap=amount, type="swap", intent=intent)
+        else:
+            swapper = swapper_class(self.private_key, self.proxy, self.config)
+            await swapper.swap(percentage_to_swap=amount, type="swap")
+
+    async def _collect_all(self):
+        # First try collecting via MonadSwap
+        swapper = MonadSwap(self.private_key, self.proxy)
+        await swapper.swap(percentage_to_swap=100, token_out="native")
+        await self._pause_after_collect("monad.xyz")
+
+        # Then Ambient, Bean and Izumi
+        for name, swapper_class in (
+            ("Ambient", AmbientDex),
+            ("Bean", BeanDex),
+            ("Izumi", IzumiDex),
+        ):
+            swapper = swapper_class(self.private_key, self.proxy, self.config)
+            await swapper.swap(percentage_to_swap=100, type="collect")
+            await self._pause_after_collect(name)
+
+    async def _pause_after_collect(self, name: str):
+        random_pause = random.randint(
+            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[0],
+            self.config.SETTINGS.PAUSE_BETWEEN_SWAPS[1],
+        )
+        logger.success(
+            f"[{self.account_index}] | Collected all tokens via {name}. Next collect in {random_pause} seconds"
+        )
+        await asyncio.sleep(random_pause)
+
     async def faucet(self):
         try:
             return await faucet(
@@ -448,6 +281,8 @@ class MonadXYZ:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | MonadXYZ.connect_discord"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -1,4 +1,3 @@
-from web3 import AsyncWeb3
 from eth_account import Account
 import asyncio
 from typing import Dict, Optional, List, Tuple
@@ -9,18 +8,18 @@ from src.utils.constants import RPC_URL, EXPLORER_URL, ERC20_ABI
 from src.model.monad_xyz.constants import IZUMI_ABI, IZUMI_TOKENS, IZUMI_CONTRACT
 import time
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.account_state import read_token_state
 
 
 class IzumiDex:
     def __init__(
         self, private_key: str, proxy: Optional[str] = None, config: Config = None
     ):
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        )        
+        self.web3 = get_web3(RPC_URL, proxy)
         self.account = Account.from_key(private_key)
         self.proxy = proxy
         self.router_contract = self.web3.eth.contract(
@@ -29,17 +28,6 @@ class IzumiDex:
         self.FEE_TIER = 10000  # 1%
         self.config = config
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     def convert_to_wei(self, amount: float, token: str) -> int:
         """Convert amount to wei based on token decimals."""
         if token == "native":
@@ -58,8 +46,14 @@ class IzumiDex:
         """Get list of tokens with non-zero balances."""
         tokens_with_balance = []
 
-        # Check native token balance
-        native_balance = await self.web3.eth.get_balance(self.account.address)
+        # Native and all token balances in one Multicall3 eth_call; fresh - swap amounts come from them
+        state = await read_token_state(
+            self.web3,
+            self.account.address,
+            {token: info["address"] for token, info in IZUMI_TOKENS.items()},
+            fresh=True,
+        )
+        native_balance = state.native
         if native_balance > 10**14:  # More than 0.0001 MON
             native_amount = float(self.web3.from_wei(native_balance, "ether"))
             tokens_with_balance.append(("native", native_amount))
@@ -69,15 +63,7 @@ class IzumiDex:
             if token == "wmon":  # Skip WMON as we handle it internally
                 continue
             try:
-                token_contract = self.web3.eth.contract(
-                    address=self.web3.to_checksum_address(
-                        IZUMI_TOKENS[token]["address"]
-                    ),
-                    abi=ERC20_ABI,
-                )
-                balance = await token_contract.functions.balanceOf(
-                    self.account.address
-                ).call()
+                balance = state.balances[token]
 
                 # Only add tokens with sufficient balance (more than 0.0001 tokens)
                 min_amount = 10 ** (IZUMI_TOKENS[token]["decimals"] - 4)
@@ -100,16 +86,17 @@ class IzumiDex:
                 abi=ERC20_ABI,
             )
 
-            current_allowance = await token_contract.functions.allowance(
-                self.account.address, IZUMI_CONTRACT
-            ).call()
+            state = await read_token_state(
+                self.web3, self.account.address, {token: token_contract.address}, IZUMI_CONTRACT
+            )
+            current_allowance = state.allowances[(token, self.web3.to_checksum_address(IZUMI_CONTRACT))]
 
             if current_allowance >= amount:
                 logger.info(f"Allowance sufficient for {token}")
                 return None
 
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
-            gas_params = await self.get_gas_params()
+            nonce = await get_nonce(self.web3, self.account.address)
+            gas_params = await get_gas_params(self.web3)
 
             approve_tx = await token_contract.functions.approve(
                 IZUMI_CONTRACT, amount
@@ -137,9 +124,7 @@ class IzumiDex:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(
-            tx_hash, poll_latency=2
-        )
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
@@ -345,8 +330,8 @@ class IzumiDex:
             )
 
             # Prepare base transaction
-            nonce = await self.web3.eth.get_transaction_count(self.account.address)
-            gas_params = await self.get_gas_params()
+            nonce = await get_nonce(self.web3, self.account.address)
+            gas_params = await get_gas_params(self.web3)
 
             tx_data = {
                 "from": self.account.address,
@@ -1,5 +1,4 @@
 import random
-from web3 import AsyncWeb3
 from eth_account import Account
 import json
 import asyncio
@@ -9,6 +8,11 @@ from src.utils.constants import TOKENS, ERC20_ABI, RPC_URL, EXPLORER_URL
 from loguru import logger
 from src.utils.client import create_client
 from src.utils.config import get_config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.account_state import get_native_balance, read_token_state
 
 
 # Get config singleton
@@ -26,29 +30,10 @@ class MonadSwap:
             private_key: Private key for the wallet
             proxy: Optional proxy URL for API requests
         """
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        )     
+        self.web3 = get_web3(RPC_URL, proxy)
         self.account = Account.from_key(private_key)
         self.proxy = proxy
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     async def get_token_balance_ether(self, token_out: str) -> Decimal:
         """Get balance of specified token."""
         max_retries = 10  # Fixed number of retries
@@ -56,17 +41,13 @@ class MonadSwap:
         for attempt in range(max_retries):
             try:
                 if token_out == "native":
-                    balance_wei = await self.web3.eth.get_balance(self.account.address)
+                    balance_wei = await get_native_balance(self.web3, self.account.address, fresh=True)
                     return Decimal(self.web3.from_wei(balance_wei, "ether"))
                 else:
-                    # Prepare the contract call data manually
-                    contract_address = self.web3.to_checksum_address(TOKENS[token_out])
-                    contract = self.web3.eth.contract(
-                        address=contract_address, abi=ERC20_ABI
+                    state = await read_token_state(
+                        self.web3, self.account.address, {token_out: TOKENS[token_out]}, fresh=True
                     )
-                    balance_wei = await contract.functions.balanceOf(
-                        self.account.address
-                    ).call()
+                    balance_wei = state.balances[token_out]
                     balance_ether = Decimal(self.web3.from_wei(balance_wei, "ether"))
                     logger.info(f"Balance: {balance_ether:.4f} {token_out}")
                     return balance_ether
@@ -82,10 +63,16 @@ class MonadSwap:
     async def get_tokens_with_balance(self) -> List[Tuple[str, Decimal]]:
         tokens_with_balance = []
         MIN_BALANCE = Decimal("0.0001")  # Minimum balance threshold
-        for token in TOKENS:
-            if token == "native":
-                continue
-            balance = await self.get_token_balance_ether(token)
+
+        # All token balances in one Multicall3 eth_call
+        state = await read_token_state(
+            self.web3,
+            self.account.address,
+            {token: address for token, address in TOKENS.items() if token != "native"},
+            fresh=True,
+        )
+        for token, balance_wei in state.balances.items():
+            balance = Decimal(self.web3.from_wei(balance_wei, "ether"))
             if balance > MIN_BALANCE:  # Only include tokens with sufficient balance
                 tokens_with_balance.append((token, balance))
             else:
@@ -276,8 +263,8 @@ class MonadSwap:
             raise
 
     async def execute_transaction(self, tx_data: Dict) -> str:
-        nonce = await self.web3.eth.get_transaction_count(self.account.address)
-        gas_params = await self.get_gas_params()
+        nonce = await get_nonce(self.web3, self.account.address)
+        gas_params = await get_gas_params(self.web3)
 
         transaction = {
             "from": self.account.address,
@@ -294,9 +281,7 @@ class MonadSwap:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_txn.raw_transaction)
 
         logger.info("Waiting for transaction confirmation...")
-        receipt = await self.web3.eth.wait_for_transaction_receipt(
-            tx_hash, poll_latency=2
-        )
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
@@ -2,11 +2,15 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 
@@ -86,12 +90,7 @@ class Monadking:
         self.config = config
         self.nft_contract_address = "0x5DCC4Cc8F56295Cb486809C77d476B2ea09a6938"
         self.unlocked_contract_address = "0xeC5Fc06e3C1D5d320199f1930cE3c3de9B262570"
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        )        
+        self.web3 = get_web3(RPC_URL, proxy)
         self.nft_contract = self.web3.eth.contract(
             address=self.nft_contract_address, abi=MONAD_KING_ABI
         )
@@ -179,11 +178,9 @@ class Monadking:
                     {
                         "from": self.account.address,
                         "value": price,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "nonce": await get_nonce(self.web3, self.account.address),
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     }
                 )
 
@@ -198,7 +195,7 @@ class Monadking:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -212,6 +209,8 @@ class Monadking:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Monadking.mint"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -271,11 +270,9 @@ class Monadking:
                     {
                         "from": self.account.address,
                         "value": price,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "nonce": await get_nonce(self.web3, self.account.address),
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     }
                 )
 
@@ -290,7 +287,7 @@ class Monadking:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -304,6 +301,8 @@ class Monadking:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Monadking.mint_unlocked"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
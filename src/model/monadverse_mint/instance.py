@@ -2,11 +2,15 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 
@@ -48,12 +52,7 @@ class MonadverseMint:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
         self.nft_contract_address = "0xba838E4Cca4b852e1AebD32f248967aD98C3AA45"
         self.nft_contract: Contract = self.web3.eth.contract(
             address=self.nft_contract_address, abi=ERC1155_ABI
@@ -95,11 +94,9 @@ class MonadverseMint:
                         "value": self.web3.to_wei(
                             1.79, "ether"  # Updated minting value
                         ),
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "nonce": await get_nonce(self.web3, self.account.address),
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     }
                 )
 
@@ -114,7 +111,7 @@ class MonadverseMint:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -128,6 +125,8 @@ class MonadverseMint:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | MonadverseMint.mint"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -4,11 +4,15 @@ import string
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from typing import Dict, Optional, Tuple
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from src.model.nad_domains.constants import NAD_CONTRACT_ADDRESS, NAD_API_URL, NAD_ABI, NAD_NFT_ADDRESS, NAD_NFT_ABI
 
 
@@ -28,12 +32,7 @@ class NadDomains:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
         # Initialize contract using constants
         self.contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(NAD_CONTRACT_ADDRESS),
@@ -46,20 +45,6 @@ class NadDomains:
             abi=NAD_NFT_ABI
         )
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     def generate_random_name(self, min_length=6, max_length=12) -> str:
         """Generate a random domain name."""
         # Choose a random length between min and max
@@ -157,7 +142,7 @@ class NadDomains:
             signature = signature_data['signature']
             
             # Get gas parameters
-            gas_params = await self.get_gas_params()
+            gas_params = await get_gas_params(self.web3)
             
             # Estimate gas for the transaction
             try:
@@ -184,7 +169,7 @@ class NadDomains:
                 'from': self.account.address,
                 'value': fee,
                 'gas': gas_with_buffer,
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address),
+                'nonce': await get_nonce(self.web3, self.account.address),
                 'chainId': 10143,
                 'type': 2,
                 **gas_params
@@ -198,7 +183,7 @@ class NadDomains:
             logger.info(f"[{self.account_index}] Registering {name} - Transaction sent: {EXPLORER_URL}{tx_hash.hex()}")
             
             # Wait for transaction receipt
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
             success = receipt['status'] == 1
             
             if success:
@@ -251,6 +236,8 @@ class NadDomains:
                         continue
                     
                 except Exception as e:
+                    if give_up(e, f"[{self.account_index}] | NadDomains.register_random_domain"):
+                        break
                     random_pause = random.randint(
                         self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                         self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1]
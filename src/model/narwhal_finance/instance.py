@@ -3,12 +3,16 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
-from typing import Dict
+from web3 import Web3
 
 from src.model.narwhal_finance.constants import SLOTS_ABI
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 
 
 class NarwhalFinance:
@@ -27,26 +31,7 @@ class NarwhalFinance:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -143,7 +128,7 @@ class NarwhalFinance:
                 )
 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Используем build_transaction вместо encodeABI
                 transaction = await contract.functions.mint().build_transaction(
@@ -152,10 +137,7 @@ class NarwhalFinance:
                         "chainId": 10143,
                         "type": 2,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         **gas_params,
                     }
                 )
@@ -181,7 +163,7 @@ class NarwhalFinance:
                 logger.info(
                     f"[{self.account_index}] Waiting for faucet transaction confirmation..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 # Get new balance after mint
                 new_balance = await usdt_contract.functions.balanceOf(
@@ -195,6 +177,8 @@ class NarwhalFinance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | NarwhalFinance.faucet"):
+                    break
                 random_pause = random.uniform(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -264,6 +248,8 @@ class NarwhalFinance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | NarwhalFinance.gamble"):
+                    break
                 logger.error(f"[{self.account_index}] Error in gamble: {e}")
                 await asyncio.sleep(
                     random.uniform(
@@ -310,10 +296,8 @@ class NarwhalFinance:
                 )
 
                 # Get nonce and gas parameters
-                nonce = await self.web3.eth.get_transaction_count(
-                    self.account.address, "latest"
-                )
-                gas_params = await self.get_gas_params()
+                nonce = await get_nonce(self.web3, self.account.address)
+                gas_params = await get_gas_params(self.web3)
 
                 # Create transaction
                 transaction = {
@@ -343,7 +327,7 @@ class NarwhalFinance:
                 logger.info(
                     f"[{self.account_index}] Waiting for Slots_Play transaction confirmation..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played Slots with {usdt_amount / (10**18)} USDT. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -351,6 +335,8 @@ class NarwhalFinance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | NarwhalFinance.slots"):
+                    break
                 random_pause = random.uniform(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -397,7 +383,7 @@ class NarwhalFinance:
             )
 
             # Get gas parameters
-            gas_params = await self.get_gas_params()
+            gas_params = await get_gas_params(self.web3)
 
             # Build the approval transaction
             transaction = await usdt_contract.functions.approve(
@@ -406,9 +392,7 @@ class NarwhalFinance:
                 {
                     "from": self.account.address,
                     "chainId": 10143,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     **gas_params,
                 }
             )
@@ -429,7 +413,7 @@ class NarwhalFinance:
             logger.info(
                 f"[{self.account_index}] Waiting for approval transaction confirmation..."
             )
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
 
             logger.success(
                 f"[{self.account_index}] Successfully approved {amount / (10**18)} USDT for spender {spender}. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -477,10 +461,8 @@ class NarwhalFinance:
                 )
 
                 # Get nonce and gas parameters
-                nonce = await self.web3.eth.get_transaction_count(
-                    self.account.address, "latest"
-                )
-                gas_params = await self.get_gas_params()
+                nonce = await get_nonce(self.web3, self.account.address)
+                gas_params = await get_gas_params(self.web3)
 
                 # Create transaction
                 transaction = {
@@ -510,7 +492,7 @@ class NarwhalFinance:
                 logger.info(
                     f"[{self.account_index}] Waiting for CoinFlip_Play transaction confirmation..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played CoinFlip with {usdt_amount / (10**18)} USDT. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -518,6 +500,8 @@ class NarwhalFinance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | NarwhalFinance.coinflip"):
+                    break
                 random_pause = random.uniform(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -583,10 +567,8 @@ class NarwhalFinance:
                 )
 
                 # Get nonce and gas parameters
-                nonce = await self.web3.eth.get_transaction_count(
-                    self.account.address, "latest"
-                )
-                gas_params = await self.get_gas_params()
+                nonce = await get_nonce(self.web3, self.account.address)
+                gas_params = await get_gas_params(self.web3)
 
                 # Create transaction
                 transaction = {
@@ -616,7 +598,7 @@ class NarwhalFinance:
                 logger.info(
                     f"[{self.account_index}] Waiting for Dice_Play transaction confirmation with multiplier {multiplier}x and amount {usdt_amount / (10**18)} USDT..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully played Dice with {usdt_amount / (10**18)} USDT and multiplier {multiplier}x. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -624,6 +606,8 @@ class NarwhalFinance:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | NarwhalFinance.dice"):
+                    break
                 random_pause = random.uniform(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -2,11 +2,16 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 
@@ -48,12 +53,7 @@ class Monai:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
         # Изменяем адрес контракта на новый
         self.nft_contract_address = Web3.to_checksum_address(
@@ -111,11 +111,9 @@ class Monai:
                         "value": self.web3.to_wei(
                             3.49, "ether"  # Обновляем сумму для минта на 3.49 MON
                         ),
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "nonce": await get_nonce(self.web3, self.account.address),
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     }
                 )
 
@@ -130,7 +128,7 @@ class Monai:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -144,6 +142,8 @@ class Monai:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Monai.mint"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -2,11 +2,16 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 # Обновляем ABI для ERC1155
@@ -69,12 +74,7 @@ class Morkie:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
         # Изменяем адрес контракта на MonAI Qingyi (Week2NFT)
         self.monhog_contract_address = Web3.to_checksum_address(
@@ -168,12 +168,10 @@ class Morkie:
                     "to": self.monhog_contract_address,
                     "value": self.web3.to_wei(0.5, "ether"),  # 0.5 MON для минта
                     "data": payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "chainId": 10143,  # Добавляем Chain ID
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "gas": estimated_gas,
                 }
 
@@ -188,7 +186,7 @@ class Morkie:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -202,6 +200,8 @@ class Morkie:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Morkie.mint_monhog"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -256,12 +256,10 @@ class Morkie:
                     "to": self.monarch_contract_address,
                     "value": self.web3.to_wei(0.1, "ether"),  # 0.1 MON для минта
                     "data": payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "chainId": 10143,  # Добавляем Chain ID
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "gas": estimated_gas,
                 }
 
@@ -276,7 +274,7 @@ class Morkie:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -290,6 +288,8 @@ class Morkie:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Morkie.mint_monarch"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -344,12 +344,10 @@ class Morkie:
                     {
                         "from": self.account.address,
                         "value": 0,  # бесплатный минт
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "chainId": 10143,  # Добавляем Chain ID
-                        "maxFeePerGas": await self.web3.eth.gas_price,
-                        "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                        "maxFeePerGas": await get_gas_price(self.web3),
+                        "maxPriorityFeePerGas": await get_gas_price(self.web3),
                         "gas": estimated_gas,
                     }
                 )
@@ -365,7 +363,7 @@ class Morkie:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -379,6 +377,8 @@ class Morkie:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Morkie.mint_morkie"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -434,12 +434,10 @@ class Morkie:
                     "to": self.gtm_contract_address,
                     "value": self.web3.to_wei(0.1, "ether"),  # 0.1 MON для минта
                     "data": payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "chainId": 10143,  # Добавляем Chain ID
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "gas": estimated_gas,
                 }
 
@@ -454,7 +452,7 @@ class Morkie:
                 )
 
                 # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     logger.success(
@@ -468,6 +466,8 @@ class Morkie:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Morkie.mint_gtm"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -1,12 +1,13 @@
-import asyncio
-import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.retry import TransactionReverted, retry
+from src.utils.tx_builder import TxBuilder
 from loguru import logger
 
 # Обновляем ABI для ERC1155
@@ -69,12 +70,8 @@ class NerzoMonad:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
+        self.tx_builder = TxBuilder(self.web3, self.account)
 
         # Изменяем адрес контракта на новый
         self.nft_contract_address = Web3.to_checksum_address(
@@ -106,84 +103,38 @@ class NerzoMonad:
             return 0
 
     async def mint(self):
-        for retry in range(self.config.SETTINGS.ATTEMPTS):
-            try:
-                logger.info(f"[{self.account_index}] Minting Nerzo Monad")
-
-                # Адрес контракта
-                contract_address = Web3.to_checksum_address(
-                    "0xc5D75b6F3F1d936B17923Df228409800DD31A1DA"
-                )
-
-                # Получаем адрес кошелька без 0x для пейлоада
-                wallet_address_without_0x = self.account.address[2:].lower()
-
-                # Значение в wei (0.1 MON)
-                value_in_wei = self.web3.to_wei(0.01, "ether")
-                value_in_wei_hex = hex(value_in_wei)[2:].zfill(
-                    64
-                )  # Convert to hex and pad
-
-                # Формируем данные для пейлоада - метод claim с адресом кошелька
-                data = f"0x84bb1e42000000000000000000000000{wallet_address_without_0x}0000000000000000000000000000000000000000000000000000000000000001000000000000000000000000eeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee000000000000000000000000000000000000000000000000002386f26fc1000000000000000000000000000000000000000000000000000000000000000000c0000000000000000000000000000000000000000000000000000000000000016000000000000000000000000000000000000000000000000000000000000000800000000000000000000000000000000000000000000000000000000000000000ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
-
-                # Формируем предварительную транзакцию для расчета газа
-                transaction = {
-                    "from": self.account.address,
-                    "to": contract_address,
-                    "value": value_in_wei,
-                    "data": data,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
-                    "chainId": 10143,
-                }
-
-                # Получаем оценку газа
-                try:
-                    estimated_gas = await self.web3.eth.estimate_gas(transaction)
-                    # Добавляем небольшой запас для надежности (10%)
-                    gas_limit = int(estimated_gas * 1.1)
-                except Exception as gas_error:
-                    raise gas_error
-
-                # Добавляем gas_limit в транзакцию
-                transaction["gas"] = gas_limit
-
-                # Подписываем транзакцию
-                signed_txn = self.web3.eth.account.sign_transaction(
-                    transaction, self.private_key
-                )
-
-                # Отправляем транзакцию
-                tx_hash = await self.web3.eth.send_raw_transaction(
-                    signed_txn.raw_transaction
-                )
-
-                # Ждем подтверждения
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
-
-                if receipt["status"] == 1:
-                    logger.success(
-                        f"[{self.account_index}] Successfully minted Nerzo Monad. TX: {EXPLORER_URL}{tx_hash.hex()}"
-                    )
-                    return True
-                else:
-                    logger.error(
-                        f"[{self.account_index}] Transaction failed. TX: {EXPLORER_URL}{tx_hash.hex()}"
-                    )
-                    return False
-
-            except Exception as e:
-                random_pause = random.randint(
-                    self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
-                    self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
-                )
-                logger.error(
-                    f"[{self.account_index}] Error sending transaction: {e}. Pause {random_pause} seconds"
-                )
-                await asyncio.sleep(random_pause)
-
-        return False
+        try:
+            # revert (уже сминчено, не хватает MON) не повторяем: его ловит preflight до отправки
+            return await retry(self._mint_once, name=f"[{self.account_index}] Nerzo Monad mint")
+        except Exception as e:
+            logger.error(f"[{self.account_index}] Error sending transaction: {e}")
+            return False
+
+    async def _mint_once(self):
+        logger.info(f"[{self.account_index}] Minting Nerzo Monad")
+
+        # Адрес контракта
+        contract_address = Web3.to_checksum_address(
+            "0xc5D75b6F3F1d936B17923Df228409800DD31A1DA"
+        )
+
+        # Получаем адрес кошелька без 0x для пейлоада
+        wallet_address_without_0x = self.account.address[2:].lower()
+
+        # Значение в wei (0.1 MON)
+        value_in_wei = self.web3.to_wei(0.01, "ether")
+
+        # Формируем данные для пейлоада - метод claim с адресом кошелька
+        data = f"0x84bb1e42000000000000000000000000{wallet_address_without_0x}0000000000000000000000000000000000000000000000000000000000000001000000000000000000000000eeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee000000000000000000000000000000000000000000000000002386f26fc1000000000000000000000000000000000000000000000000000000000000000000c0000000000000000000000000000000000000000000000000000000000000016000000000000000000000000000000000000000000000000000000000000000800000000000000000000000000000000000000000000000000000000000000000ffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffffff000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000000"
+
+        receipt = await self.tx_builder.submit(
+            to=contract_address, data=data, value=value_in_wei, intent="mint"
+        )
+        tx_hash = receipt["transactionHash"]
+
+        if receipt["status"] == 1:
+            logger.success(
+                f"[{self.account_index}] Successfully minted Nerzo Monad. TX: {EXPLORER_URL}{tx_hash.hex()}"
+            )
+            return True
+        raise TransactionReverted(f"mint tx {tx_hash.hex()} failed (status 0)")
@@ -4,9 +4,9 @@ import random
 import aiohttp
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
-from typing import Dict, Optional, List, Union, Tuple
+from typing import Optional, List, Union, Tuple
 import time
 from functools import wraps
 
@@ -24,6 +24,11 @@ from .constants import (
     STANDARD_TOKEN_ABI, STANDARD_PROTOCOL_ABI,
 )
 from src.utils.constants import ERC20_ABI
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 
 class Nostra:
     def __init__(
@@ -43,12 +48,7 @@ class Nostra:
         self.account: Account = Account.from_key(private_key=private_key)
         
         # Create a configured Web3 client with retry middleware
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
         
         # Define assets mapping
         self.assets = {
@@ -78,20 +78,6 @@ class Nostra:
             }
         }
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
         try:
@@ -191,7 +177,7 @@ class Nostra:
             token_contract = self.web3.eth.contract(address=token_address, abi=ERC20_ABI)
             
             # Create transaction for approval
-            gas_params = await self.get_gas_params()
+            gas_params = await get_gas_params(self.web3)
             max_uint256 = (2**256) - 1  # Max uint256 value for unlimited approval
             
             transaction = {
@@ -202,9 +188,7 @@ class Nostra:
                 )._encode_transaction_data(),
                 "chainId": 10143,
                 "type": 2,
-                "nonce": await self.web3.eth.get_transaction_count(
-                    self.account.address, "latest"
-                ),
+                "nonce": await get_nonce(self.web3, self.account.address),
             }
             
             # Estimate gas
@@ -217,7 +201,7 @@ class Nostra:
             
             # Wait for confirmation
             logger.info(f"[{self.account_index}] Waiting for approval transaction confirmation...")
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
             
             if receipt["status"] == 1:
                 logger.success(
@@ -295,7 +279,7 @@ class Nostra:
                 )
                 
                 # Prepare deposit transaction
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 transaction = {
                     "from": self.account.address,
@@ -305,9 +289,7 @@ class Nostra:
                     )._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
                 
                 # Estimate gas
@@ -320,7 +302,7 @@ class Nostra:
                 
                 # Wait for confirmation
                 logger.info(f"[{self.account_index}] Waiting for deposit transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -336,6 +318,8 @@ class Nostra:
                     continue
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Nostra.deposit_asset"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
@@ -383,7 +367,7 @@ class Nostra:
                 logger.info(f"[{self.account_index}] Found {asset_symbol} deposit amount: {withdraw_amount_human}")
                 
                 # Prepare withdraw transaction
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 transaction = {
                     "from": self.account.address,
@@ -393,9 +377,7 @@ class Nostra:
                     )._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
                 
                 # Estimate gas
@@ -408,7 +390,7 @@ class Nostra:
                 
                 # Wait for confirmation
                 logger.info(f"[{self.account_index}] Waiting for withdraw transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -421,6 +403,8 @@ class Nostra:
                     continue
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Nostra.withdraw_asset"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
@@ -465,7 +449,7 @@ class Nostra:
                 )
                 
                 # Prepare borrow transaction
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 
                 transaction = {
                     "from": self.account.address,
@@ -475,9 +459,7 @@ class Nostra:
                     )._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
                 
                 # Estimate gas
@@ -490,7 +472,7 @@ class Nostra:
                 
                 # Wait for confirmation
                 logger.info(f"[{self.account_index}] Waiting for borrow transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -503,6 +485,8 @@ class Nostra:
                     continue
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Nostra.borrow_asset"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
@@ -579,7 +563,7 @@ class Nostra:
                         continue
                 
                 # Prepare repay transaction
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
                 transaction = {
                     "from": self.account.address,
                     "to": asset_info["borrower_address"],
@@ -588,9 +572,7 @@ class Nostra:
                     )._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
                 estimated_gas = await self.estimate_gas(transaction)
                 transaction.update({"gas": estimated_gas, **gas_params})
@@ -601,7 +583,7 @@ class Nostra:
                 
                 # Wait for confirmation
                 logger.info(f"[{self.account_index}] Waiting for repay transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 
                 if receipt["status"] == 1:
                     logger.success(
@@ -614,6 +596,8 @@ class Nostra:
                     continue
                     
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Nostra.repay_asset"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1]
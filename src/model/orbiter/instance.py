@@ -1,8 +1,6 @@
 import random
-from typing import Dict
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 import asyncio
 
 from src.model.orbiter.constants import SEPOLIA_EXPLORER_URL, SEPOLIA_RPC_URL, MONAD_SEPOLIA_ETHEREUM_ADDRESS
@@ -10,6 +8,10 @@ from src.utils.client import create_client
 from src.utils.config import Config
 from loguru import logger
 from src.utils.constants import RPC_URL, ERC20_ABI
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 
 
 class Orbiter:
@@ -28,36 +30,14 @@ class Orbiter:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                SEPOLIA_RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
-        self.monad_web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(RPC_URL, request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(SEPOLIA_RPC_URL, proxy)
+        self.monad_web3 = get_web3(RPC_URL, proxy)
         # Initialize ERC20 contract
         self.monad_sepolia = self.monad_web3.eth.contract(
             address=self.monad_web3.to_checksum_address(MONAD_SEPOLIA_ETHEREUM_ADDRESS),
             abi=ERC20_ABI
         )
         
-    async def get_gas_params(self) -> Dict[str, int]:
-        latest_block = await self.web3.eth.get_block('latest')
-        base_fee = latest_block['baseFeePerGas']
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        
-        # Multiply both fees by 1.5
-        max_priority_fee = int(max_priority_fee * 1.5)
-        max_fee = int((base_fee + max_priority_fee) * 1.5)
-        
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-    
     async def wait_for_funds(self, initial_balance: int):
         """Wait for funds to arrive in Monad network."""
         max_attempts = self.config.ORBITER.MAX_WAIT_TIME // 10  # Convert total wait time to number of 10-second attempts
@@ -97,7 +77,7 @@ class Orbiter:
             balance_wei = await self.web3.eth.get_balance(self.account.address)
             
             # Get gas parameters for fee estimation
-            gas_params = await self.get_gas_params()
+            gas_params = await get_gas_params(self.web3, strategy="percentile", fee_multiplier=1.5, tip_multiplier=1.5)
             gas_cost_wei = gas_params['maxFeePerGas'] * 21000
             
             # Determine amount to bridge in Wei
@@ -141,7 +121,7 @@ class Orbiter:
                 'from': self.account.address,
                 'to': "0xB5AADef97d81A77664fcc3f16Bfe328ad6CEc7ac",
                 'value': amount_wei,
-                'nonce': await self.web3.eth.get_transaction_count(self.account.address),
+                'nonce': await get_nonce(self.web3, self.account.address),
                 'chainId': 11155111,
                 'type': 2,
                 'gas': 21000,
@@ -157,7 +137,7 @@ class Orbiter:
                     tx_hash_str = tx_hash_str[2:]  # Remove '0x' prefix if present
                 
                 logger.info(f"[{self.account_index}] Waiting for bridge transaction confirmation...")
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt['status'] == 1:
                     logger.success(f"[{self.account_index}] Successfully initiated bridge to Monad. TX: {SEPOLIA_EXPLORER_URL}{tx_hash_str}")
@@ -4,6 +4,7 @@ import random
 import primp
 from src.model.help.captcha import Capsolver, Solvium
 from src.utils.config import Config
+from src.utils.retry import give_up
 from eth_account import Account
 import json
 import platform
@@ -62,6 +63,8 @@ async def monsternad_whitelist(
             raise Exception(response.text)
 
         except Exception as e:
+            if give_up(e, f"[{account_index}] | monsternad_whitelist"):
+                break
             random_pause = random.randint(
                 config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                 config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
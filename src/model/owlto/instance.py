@@ -3,11 +3,15 @@ import random
 from eth_account import Account
 from loguru import logger
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
-from typing import Dict
+from web3 import Web3
 
 from src.utils.config import Config
 from src.utils.constants import RPC_URL, EXPLORER_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from .constants import DEPLOY_CONTRACT_BYTECODE
 
 
@@ -27,25 +31,7 @@ class Owlto:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL, request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
@@ -64,7 +50,7 @@ class Owlto:
             try:
                 logger.info(f"[{self.account_index}] Deploying Owlto contract...")
 
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -82,10 +68,7 @@ class Owlto:
                 # Добавляем остальные параметры транзакции
                 transaction.update(
                     {
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address,
-                            "latest",
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -102,7 +85,7 @@ class Owlto:
                 logger.info(
                     f"[{self.account_index}] Waiting for contract deployment confirmation..."
                 )
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 logger.success(
                     f"[{self.account_index}] Successfully deployed Owlto contract at {receipt['contractAddress']}. TX: {EXPLORER_URL}{tx_hash.hex()}"
@@ -110,6 +93,8 @@ class Owlto:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Owlto.deploy_contract"):
+                    break
                 random_pause = random.uniform(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -3,11 +3,14 @@ import random
 from loguru import logger
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from src.model.shmonad.constants import SHMONAD_ADDRESS, SHMONAD_ABI, STAKE_POLICY_ID
-from typing import Dict
 
 
 class Shmonad:
@@ -26,12 +29,7 @@ class Shmonad:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-             AsyncWeb3.AsyncHTTPProvider(
-                 RPC_URL,
-                 request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-             )
-        ) 
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def _get_shmon_balance(self):
         for retry in range(self.config.SETTINGS.ATTEMPTS):
@@ -45,6 +43,8 @@ class Shmonad:
                 ).call()
                 return balance, balance / 10**18
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad._get_shmon_balance"):
+                    break
                 logger.error(
                     f"[{self.account_index}] | Error getting Shmonad balance: {e}"
                 )
@@ -190,6 +190,8 @@ class Shmonad:
                 return True
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad.swaps"):
+                    break
                 logger.error(f"[{self.account_index}] | Error swapping Shmonad: {e}")
                 await asyncio.sleep(1)
                 continue
@@ -217,7 +219,7 @@ class Shmonad:
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -241,9 +243,7 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": amount_to_swap,  # отправляем такое же количество MON
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -260,7 +260,7 @@ class Shmonad:
                     f"[{self.account_index}] | Buying Shmon with {amount_to_swap / 10**18:.6f} MON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully bought Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -271,6 +271,8 @@ class Shmonad:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad.buy_shmon"):
+                    break
                 logger.error(f"[{self.account_index}] | Error buying Shmon: {e}")
                 await asyncio.sleep(1)
                 continue
@@ -292,7 +294,7 @@ class Shmonad:
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -319,9 +321,7 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -338,7 +338,7 @@ class Shmonad:
                     f"[{self.account_index}] | Selling {shmon_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully sold Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -349,6 +349,8 @@ class Shmonad:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad.sell_shmon"):
+                    break
                 logger.error(f"[{self.account_index}] | Error selling Shmon: {e}")
                 await asyncio.sleep(1)
                 continue
@@ -370,7 +372,7 @@ class Shmonad:
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем базовую транзакцию для оценки газа
                 transaction = {
@@ -396,9 +398,7 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -415,7 +415,7 @@ class Shmonad:
                     f"[{self.account_index}] | Bonding {shmon_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully bonded Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -426,6 +426,8 @@ class Shmonad:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad.stake_shmon"):
+                    break
                 logger.error(f"[{self.account_index}] | Error bonding Shmon: {e}")
                 await asyncio.sleep(1)
                 continue
@@ -444,6 +446,8 @@ class Shmonad:
                 ).call()
                 return balance, balance / 10**18
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad._get_bonded_balance"):
+                    break
                 logger.error(
                     f"[{self.account_index}] | Error getting bonded balance: {e}"
                 )
@@ -471,7 +475,7 @@ class Shmonad:
                     address=SHMONAD_ADDRESS, abi=SHMONAD_ABI
                 )
 
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Первая транзакция - unbond
                 transaction = {
@@ -496,9 +500,7 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -515,7 +517,7 @@ class Shmonad:
                     f"[{self.account_index}] | Unbonding {bonded_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] != 1:
                     logger.error(f"[{self.account_index}] | Failed to unbond Shmon")
                     return False
@@ -557,9 +559,7 @@ class Shmonad:
                     {
                         "from": self.account.address,
                         "value": 0,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                         "gas": estimated_gas,
                         **gas_params,
                     }
@@ -576,7 +576,7 @@ class Shmonad:
                     f"[{self.account_index}] | Claiming {bonded_balance_formatted:.6f} shMON | Tx: {EXPLORER_URL}{tx_hash.hex()}"
                 )
 
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully claimed Shmon | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -587,25 +587,13 @@ class Shmonad:
                     return False
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Shmonad.unstake_shmon"):
+                    break
                 logger.error(f"[{self.account_index}] | Error unstaking Shmon: {e}")
                 await asyncio.sleep(1)
                 continue
         return False
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Calculate maxFeePerGas (base fee + priority fee)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add some buffer."""
         try:
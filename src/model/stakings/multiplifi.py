@@ -4,7 +4,7 @@ import random
 import aiohttp
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
 from typing import Dict, Optional, List, Union, Tuple
 import time
@@ -12,6 +12,11 @@ from functools import wraps
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 
 
 class Multiplifi:
@@ -32,12 +37,7 @@ class Multiplifi:
         self.account: Account = Account.from_key(private_key=private_key)
 
         # Create a configured Web3 client with retry middleware
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def faucet(self):
         for retry in range(3):
@@ -71,10 +71,7 @@ class Multiplifi:
                     )
 
                 # Get gas parameters
-                latest_block = await self.web3.eth.get_block("latest")
-                base_fee = latest_block["baseFeePerGas"]
-                max_priority_fee = await self.web3.eth.max_priority_fee
-                max_fee = base_fee + max_priority_fee
+                gas_params = await get_gas_params(self.web3)
 
                 # Build complete transaction
                 transaction = {
@@ -82,12 +79,9 @@ class Multiplifi:
                     "to": contract_address,
                     "value": 0,
                     "data": payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "gas": estimated_gas,
-                    "maxFeePerGas": max_fee,
-                    "maxPriorityFeePerGas": max_priority_fee,
+                    **gas_params,
                     "chainId": 10143,
                     "type": 2,
                 }
@@ -105,7 +99,7 @@ class Multiplifi:
                 )
 
                 # Wait for transaction receipt
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully claimed MultipliFi tokens | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -214,10 +208,7 @@ class Multiplifi:
                     )
 
                 # Get gas parameters
-                latest_block = await self.web3.eth.get_block("latest")
-                base_fee = latest_block["baseFeePerGas"]
-                max_priority_fee = await self.web3.eth.max_priority_fee
-                max_fee = base_fee + max_priority_fee
+                gas_params = await get_gas_params(self.web3)
 
                 # Build complete transaction
                 approve_transaction = {
@@ -225,12 +216,9 @@ class Multiplifi:
                     "to": usdc_contract_address,
                     "value": 0,
                     "data": approve_payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "gas": estimated_gas,
-                    "maxFeePerGas": max_fee,
-                    "maxPriorityFeePerGas": max_priority_fee,
+                    **gas_params,
                     "chainId": 10143,
                     "type": 2,
                 }
@@ -248,7 +236,7 @@ class Multiplifi:
                 )
 
                 # Wait for transaction receipt
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] != 1:
                     raise Exception(
                         f"[{self.account_index}] Failed to approve USDC for MultipliFi staking"
@@ -303,10 +291,7 @@ class Multiplifi:
                     )
 
                 # Get fresh gas parameters
-                latest_block = await self.web3.eth.get_block("latest")
-                base_fee = latest_block["baseFeePerGas"]
-                max_priority_fee = await self.web3.eth.max_priority_fee
-                max_fee = base_fee + max_priority_fee
+                gas_params = await get_gas_params(self.web3)
 
                 # Build complete transaction
                 deposit_transaction = {
@@ -314,12 +299,9 @@ class Multiplifi:
                     "to": staking_contract_address,
                     "value": 0,
                     "data": deposit_payload,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                     "gas": estimated_gas,
-                    "maxFeePerGas": max_fee,
-                    "maxPriorityFeePerGas": max_priority_fee,
+                    **gas_params,
                     "chainId": 10143,
                     "type": 2,
                 }
@@ -337,7 +319,7 @@ class Multiplifi:
                 )
 
                 # Wait for transaction receipt
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 if receipt["status"] == 1:
                     logger.success(
                         f"[{self.account_index}] | Successfully deposited {usdc_balance_formatted:.6f} USDC to MultipliFi staking | Tx: {EXPLORER_URL}{tx_hash.hex()}"
@@ -349,6 +331,8 @@ class Multiplifi:
                     )
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Multiplifi.stake"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -4,7 +4,7 @@ import random
 import asyncio
 from decimal import Decimal
 from typing import Dict, List, Optional, Union, Tuple
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 from web3.types import TxParams, Wei, ChecksumAddress
 from eth_account import Account
@@ -14,6 +14,11 @@ import aiohttp
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.rate_limit import rate_limit
 
 
 class Flapsh:
@@ -35,12 +40,7 @@ class Flapsh:
         self.account: Account = Account.from_key(private_key=private_key)
 
         # Создаем настроенный Web3 клиент с middleware для повторных попыток
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def execute(self):
         """
@@ -195,7 +195,7 @@ class Flapsh:
         data = function_selector + token_param + recipient_param + min_amount_param
 
         # Получаем текущую цену газа
-        gas_price = await self.web3.eth.gas_price
+        gas_price = await get_gas_price(self.web3)
 
         # Составляем транзакцию
         tx = {
@@ -211,7 +211,7 @@ class Flapsh:
                 }
             ),
             "gasPrice": gas_price,
-            "nonce": await self.web3.eth.get_transaction_count(self.account.address),
+            "nonce": await get_nonce(self.web3, self.account.address),
             "data": data,
             "chainId": await self.web3.eth.chain_id,
         }
@@ -227,7 +227,7 @@ class Flapsh:
             tx_hash_hex = tx_hash.hex()
 
             # Ждем подтверждения транзакции
-            receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(self.web3, tx_hash)
 
             if receipt["status"] == 1:
                 logger.success(
@@ -293,6 +293,7 @@ class Flapsh:
 
                 api_url = "https://v8xq3y0pc5.execute-api.eu-west-3.amazonaws.com/v1"
 
+                await rate_limit(api_url)
                 # Используем контекстный менеджер для сессии aiohttp
                 async with aiohttp.ClientSession() as session:
                     # Настраиваем прокси для запроса
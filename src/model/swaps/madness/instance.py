@@ -4,7 +4,7 @@ import random
 import asyncio
 from decimal import Decimal
 from typing import Dict, List, Optional, Union, Tuple
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 from web3.types import TxParams, Wei, ChecksumAddress
 from eth_account import Account
@@ -13,6 +13,12 @@ from primp import AsyncClient
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.multicall import get_token_amounts
+from src.utils.retry import give_up
 from .constants import (
     ROUTER_CONTRACT,
     WMON_CONTRACT,
@@ -42,12 +48,7 @@ class Madness:
         self.account: Account = Account.from_key(private_key=private_key)
 
         # Создаем настроенный Web3 клиент с middleware для повторных попыток
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def execute(self):
         """
@@ -69,10 +70,8 @@ class Madness:
             return
 
         # Get balances of all available tokens
-        token_balances = {}
-        for symbol, token_info in AVAILABLE_TOKENS.items():
-            balance = await self.get_token_balance(self.account.address, token_info)
-            token_balances[symbol] = balance
+        token_balances = await self._get_all_token_balances()
+        for symbol, balance in token_balances.items():
             logger.info(f"[{self.account_index}] Balance of {symbol}: {balance}")
 
         # Check if we have any tokens other than MON
@@ -96,9 +95,7 @@ class Madness:
             logger.info(f"[{self.account_index}] Executing swap {swap_num}/{num_swaps}")
 
             # Update token balances for accurate selection
-            for symbol, token_info in AVAILABLE_TOKENS.items():
-                balance = await self.get_token_balance(self.account.address, token_info)
-                token_balances[symbol] = balance
+            token_balances = await self._get_all_token_balances()
 
             # Choose random token pair for swap
             token_from, token_to, amount = await self._select_random_token_pair(
@@ -163,17 +160,6 @@ class Madness:
             f"[{self.account_index}] Completed all {num_swaps} Madness swap operations"
         )
 
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Get current gas parameters from the network."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-        max_fee = base_fee + max_priority_fee
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
-
     async def estimate_gas(self, transaction: dict) -> int:
         """Estimate gas for transaction and add a buffer."""
         try:
@@ -205,6 +191,10 @@ class Madness:
             address=Web3.to_checksum_address(token_address), abi=abi
         )
 
+    async def _get_all_token_balances(self) -> Dict[str, float]:
+        """Balances of all AVAILABLE_TOKENS in one Multicall3 eth_call."""
+        return await get_token_amounts(self.web3, self.account.address, AVAILABLE_TOKENS)
+
     async def get_token_balance(self, wallet_address: str, token: Dict) -> float:
         """
         Get token balance for a wallet
@@ -288,7 +278,7 @@ class Madness:
         approve_func = token_contract.functions.approve(spender_address, max_uint256)
 
         # Get gas parameters
-        gas_params = await self.get_gas_params()
+        gas_params = await get_gas_params(self.web3)
 
         # Create transaction
         transaction = {
@@ -297,9 +287,7 @@ class Madness:
             "data": approve_func._encode_transaction_data(),
             "chainId": 10143,
             "type": 2,
-            "nonce": await self.web3.eth.get_transaction_count(
-                self.account.address, "latest"
-            ),
+            "nonce": await get_nonce(self.web3, self.account.address),
         }
 
         # Estimate gas
@@ -321,7 +309,7 @@ class Madness:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
 
         # Wait for transaction confirmation
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
@@ -354,7 +342,7 @@ class Madness:
                 deposit_func = wmon_contract.functions.deposit()
 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Create transaction
                 transaction = {
@@ -364,9 +352,7 @@ class Madness:
                     "data": deposit_func._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
 
                 # Estimate gas
@@ -395,7 +381,7 @@ class Madness:
                 )
 
                 # Wait for transaction confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -414,6 +400,8 @@ class Madness:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Madness._deposit_mon_to_wmon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -448,7 +436,7 @@ class Madness:
                 withdraw_func = wmon_contract.functions.withdraw(amount_wei)
 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Create transaction
                 transaction = {
@@ -457,9 +445,7 @@ class Madness:
                     "data": withdraw_func._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
 
                 # Estimate gas
@@ -488,7 +474,7 @@ class Madness:
                 )
 
                 # Wait for transaction confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -507,6 +493,8 @@ class Madness:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Madness._withdraw_wmon_to_mon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -529,8 +517,7 @@ class Madness:
         # Get balances of all tokens
         available_tokens = []
 
-        for symbol, token_info in AVAILABLE_TOKENS.items():
-            balance = await self.get_token_balance(self.account.address, token_info)
+        for symbol, balance in (await self._get_all_token_balances()).items():
             if balance > 0.01:  # Minimum balance for swap
                 available_tokens.append((symbol, balance))
 
@@ -581,6 +568,9 @@ class Madness:
         # Default threshold for any token not in the list
         default_threshold = 0.0000001
 
+        # Read all balances at once: swapping one token does not change the others
+        token_balances = await self._get_all_token_balances()
+
         # Iterate through all available tokens
         for symbol, token in AVAILABLE_TOKENS.items():
             # Skip MON, as it's the target token
@@ -588,7 +578,7 @@ class Madness:
                 continue
 
             # Get token balance
-            balance = await self.get_token_balance(self.account.address, token)
+            balance = token_balances[symbol]
 
             # Get threshold for this token
             threshold = token_thresholds.get(symbol, default_threshold)
@@ -746,7 +736,7 @@ class Madness:
                     await self.approve_token(token_a, amount_in_wei, ROUTER_CONTRACT)
 
                 # Get gas parameters
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Prepare transaction based on token types
                 if token_a["native"]:  # MON -> Token
@@ -761,9 +751,7 @@ class Madness:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
                 elif token_b["native"]:  # Token -> MON
                     tx_func = router_contract.functions.swapExactTokensForETH(
@@ -780,9 +768,7 @@ class Madness:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
                 else:  # Token -> Token
                     tx_func = router_contract.functions.swapExactTokensForTokens(
@@ -799,9 +785,7 @@ class Madness:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
 
                 # Estimate gas
@@ -830,7 +814,7 @@ class Madness:
                 )
 
                 # Wait for transaction confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -850,6 +834,8 @@ class Madness:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Madness.swap"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -4,7 +4,7 @@ import random
 import asyncio
 from decimal import Decimal
 from typing import Dict, List, Optional, Union, Tuple
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 from web3.types import TxParams, Wei, ChecksumAddress
 from eth_account import Account
@@ -13,6 +13,12 @@ from primp import AsyncClient
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.multicall import get_token_amounts
+from src.utils.retry import give_up
 
 from .constants import (
     ROUTER_CONTRACT,
@@ -56,26 +62,7 @@ class OctoSwap:
         self.account: Account = Account.from_key(private_key=private_key)
 
         # Создаем настроенный Web3 клиент с middleware для повторных попыток
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
-
-    async def get_gas_params(self) -> Dict[str, int]:
-        """Получить текущие параметры газа из сети."""
-        latest_block = await self.web3.eth.get_block("latest")
-        base_fee = latest_block["baseFeePerGas"]
-        max_priority_fee = await self.web3.eth.max_priority_fee
-
-        # Рассчитываем maxFeePerGas (базовая комиссия + приоритетная комиссия)
-        max_fee = base_fee + max_priority_fee
-
-        return {
-            "maxFeePerGas": max_fee,
-            "maxPriorityFeePerGas": max_priority_fee,
-        }
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def estimate_gas(self, transaction: dict) -> int:
         """Оценить газ для транзакции и добавить буфер."""
@@ -103,6 +90,10 @@ class OctoSwap:
             address=Web3.to_checksum_address(token_address), abi=ABI["token"]
         )
 
+    async def _get_all_token_balances(self) -> Dict[str, float]:
+        """Balances of all AVAILABLE_TOKENS in one Multicall3 eth_call."""
+        return await get_token_amounts(self.web3, self.account.address, AVAILABLE_TOKENS)
+
     async def get_token_balance(self, wallet_address: str, token: Dict) -> float:
         """
         Получить баланс токена для указанного кошелька
@@ -183,7 +174,7 @@ class OctoSwap:
         approve_func = token_contract.functions.approve(ROUTER_CONTRACT, max_uint256)
 
         # Получаем параметры газа
-        gas_params = await self.get_gas_params()
+        gas_params = await get_gas_params(self.web3)
 
         # Создаем транзакцию
         transaction = {
@@ -192,9 +183,7 @@ class OctoSwap:
             "data": approve_func._encode_transaction_data(),
             "chainId": 10143,
             "type": 2,
-            "nonce": await self.web3.eth.get_transaction_count(
-                self.account.address, "latest"
-            ),
+            "nonce": await get_nonce(self.web3, self.account.address),
         }
 
         # Оценка газа
@@ -216,7 +205,7 @@ class OctoSwap:
         tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
 
         # Ожидание подтверждения транзакции
-        receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = await wait_for_receipt(self.web3, tx_hash)
 
         if receipt["status"] == 1:
             logger.success(
@@ -307,7 +296,7 @@ class OctoSwap:
                     await self.approve_token(token_a, amount_in_wei)
 
                 # Получаем параметры газа
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Подготавливаем транзакцию в зависимости от типов токенов
                 if token_a["native"]:  # MON -> Token
@@ -322,9 +311,7 @@ class OctoSwap:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
                 elif token_b["native"]:  # Token -> MON
                     tx_func = router_contract.functions.swapExactTokensForETH(
@@ -341,9 +328,7 @@ class OctoSwap:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
                 else:  # Token -> Token
                     tx_func = router_contract.functions.swapExactTokensForTokens(
@@ -360,9 +345,7 @@ class OctoSwap:
                         "data": tx_func._encode_transaction_data(),
                         "chainId": 10143,
                         "type": 2,
-                        "nonce": await self.web3.eth.get_transaction_count(
-                            self.account.address, "latest"
-                        ),
+                        "nonce": await get_nonce(self.web3, self.account.address),
                     }
 
                 # Оценка газа
@@ -391,7 +374,7 @@ class OctoSwap:
                 )
 
                 # Ожидаем подтверждения транзакции
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -411,6 +394,8 @@ class OctoSwap:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | OctoSwap.swap"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -445,7 +430,7 @@ class OctoSwap:
                 deposit_func = wmon_contract.functions.deposit()
 
                 # Получаем параметры газа
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем транзакцию
                 transaction = {
@@ -455,9 +440,7 @@ class OctoSwap:
                     "data": deposit_func._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
 
                 # Оценка газа
@@ -486,7 +469,7 @@ class OctoSwap:
                 )
 
                 # Ожидаем подтверждения транзакции
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -505,6 +488,8 @@ class OctoSwap:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | OctoSwap._deposit_mon_to_wmon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -539,7 +524,7 @@ class OctoSwap:
                 withdraw_func = wmon_contract.functions.withdraw(amount_wei)
 
                 # Получаем параметры газа
-                gas_params = await self.get_gas_params()
+                gas_params = await get_gas_params(self.web3)
 
                 # Создаем транзакцию
                 transaction = {
@@ -548,9 +533,7 @@ class OctoSwap:
                     "data": withdraw_func._encode_transaction_data(),
                     "chainId": 10143,
                     "type": 2,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address, "latest"
-                    ),
+                    "nonce": await get_nonce(self.web3, self.account.address),
                 }
 
                 # Оценка газа
@@ -579,7 +562,7 @@ class OctoSwap:
                 )
 
                 # Ожидаем подтверждения транзакции
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
                 block_number = receipt["blockNumber"]
 
                 if receipt["status"] == 1:
@@ -598,6 +581,8 @@ class OctoSwap:
                     continue
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | OctoSwap._withdraw_wmon_to_mon"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -620,8 +605,7 @@ class OctoSwap:
         # Получаем балансы всех токенов
         available_tokens = []
 
-        for symbol, token_info in AVAILABLE_TOKENS.items():
-            balance = await self.get_token_balance(self.account.address, token_info)
+        for symbol, balance in (await self._get_all_token_balances()).items():
             if balance > 0.01:  # Минимальный баланс для свапа
                 available_tokens.append((symbol, balance))
 
@@ -657,6 +641,9 @@ class OctoSwap:
         target_token = AVAILABLE_TOKENS["MON"]
         logger.info(f"[{self.account_index}] 🔄 Swapping all tokens to MON")
 
+        # Балансы всех токенов одним запросом; свап одного токена не меняет остальные
+        token_balances = await self._get_all_token_balances()
+
         # Перебираем все доступные токены
         for symbol, token in AVAILABLE_TOKENS.items():
             # Пропускаем MON, так как это целевой токен
@@ -664,7 +651,7 @@ class OctoSwap:
                 continue
 
             # Получаем баланс токена
-            balance = await self.get_token_balance(self.account.address, token)
+            balance = token_balances[symbol]
 
             # Если баланс слишком мал, пропускаем
             if balance <= 0.01:
@@ -3,12 +3,14 @@ from decimal import Decimal
 import random
 from eth_account import Account
 from loguru import logger
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from primp import AsyncClient
 from typing import Dict
 
 from src.utils.config import Config
 from src.utils.constants import EXPLORER_URL, RPC_URL
+from src.utils.web3_provider import get_web3
+from src.utils.retry import give_up
 from primp import AsyncClient
 
 class Talentum:
@@ -18,7 +20,7 @@ class Talentum:
         self.config = config
         self.session = session
 
-        self.web3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(RPC_URL))
+        self.web3 = get_web3(RPC_URL)
         self.account = Account.from_key(private_key)
 
     async def login(self):
@@ -26,6 +28,8 @@ class Talentum:
             try:
                 pass
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | Talentum.login"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[0],
                     self.config.SETTINGS.PAUSE_BETWEEN_ATTEMPTS[1],
@@ -0,0 +1,332 @@
+import importlib
+from dataclasses import dataclass
+from types import ModuleType
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List, Set
+
+if TYPE_CHECKING:
+    from src.model.start import Start
+
+TaskHandler = Callable[["Start", ModuleType], Awaitable]
+
+
+@dataclass
+class TaskSpec:
+    # Модуль импортируется только когда задача реально нужна
+    module: str
+    run: TaskHandler
+
+
+TASK_REGISTRY: Dict[str, TaskSpec] = {}
+
+# Задачи, которые обрабатывает process.start, а не Start.execute_task
+PROCESS_TASKS = frozenset(
+    {
+        "farm_faucet",
+        "disperse_farm_accounts",
+        "disperse_from_one_wallet",
+        "crusty_refuel_from_one_to_all",
+    }
+)
+
+
+def register_task(*names: str, module: str):
+    """
+    Register handler(start, module) for task names without importing module.
+    The handler returns the result of the module; False marks the task failed.
+    """
+
+    def decorator(func: TaskHandler) -> TaskHandler:
+        for name in names:
+            TASK_REGISTRY[name] = TaskSpec(module, func)
+        return func
+
+    return decorator
+
+
+def flatten_tasks(tasks: Iterable) -> Set[str]:
+    """All task names of FLOW.TASKS, including ones inside [] and ()."""
+    names = set()
+    for task in tasks:
+        if isinstance(task, (list, tuple)):
+            names |= flatten_tasks(task)
+        else:
+            names.add(str(task).lower())
+    return names
+
+
+def validate_tasks(tasks: Iterable) -> None:
+    unknown = sorted(flatten_tasks(tasks) - set(TASK_REGISTRY) - PROCESS_TASKS)
+    if unknown:
+        raise ValueError(f"Unknown tasks in tasks.py: {', '.join(unknown)}")
+
+
+def import_task_modules(tasks: Iterable) -> List[str]:
+    """Import modules of the given FLOW.TASKS up front, before accounts start."""
+    modules = sorted(
+        {TASK_REGISTRY[name].module for name in flatten_tasks(tasks) if name in TASK_REGISTRY}
+    )
+    for module in modules:
+        importlib.import_module(module)
+    return modules
+
+
+async def run_task(start: "Start", task: str):
+    """Run the handler of `task`; returns what the module returned (False - the task failed)."""
+    spec = TASK_REGISTRY.get(task.lower())
+    if spec is None:
+        raise ValueError(f"Unknown task: {task}")
+    return await spec.run(start, importlib.import_module(spec.module))
+
+
+def _instance(start: "Start", cls, with_session: bool = True):
+    """Most modules take (account_index, proxy, private_key, config[, session])."""
+    args = [start.account_index, start.proxy, start.private_key, start.config]
+    if with_session:
+        args.append(start.session)
+    return cls(*args)
+
+
+def _monad(start: "Start", module: ModuleType):
+    # Один MonadXYZ на аккаунт, как раньше в Start.flow
+    if start.monad is None:
+        start.monad = module.MonadXYZ(
+            start.account_index,
+            start.proxy,
+            start.private_key,
+            start.discord_token,
+            start.config,
+            start.session,
+        )
+    return start.monad
+
+
+@register_task("skip", module="src.model.tasks")
+async def _skip(start, module):
+    return True
+
+
+@register_task("faucet", module="src.model.monad_xyz.instance")
+async def _faucet(start, module):
+    return await _monad(start, module).faucet()
+
+
+@register_task("swaps", "ambient", "bean", "izumi", "collect_all_to_monad", module="src.model.monad_xyz.instance")
+async def _monad_swaps(start, module):
+    return await _monad(start, module).swaps(type=start.current_task)
+
+
+@register_task("gaszip", module="src.model.gaszip.instance")
+async def _gaszip(start, module):
+    return await _instance(start, module.Gaszip, with_session=False).refuel()
+
+
+@register_task("memebridge", module="src.model.memebridge.instance")
+async def _memebridge(start, module):
+    return await _instance(start, module.Memebridge, with_session=False).refuel()
+
+
+@register_task("crusty_refuel", module="src.model.crusty_swap.instance")
+async def _crusty_refuel(start, module):
+    return await _instance(start, module.CrustySwap, with_session=False).refuel()
+
+
+@register_task("crusty_sell", module="src.model.crusty_swap.instance")
+async def _crusty_sell(start, module):
+    return await _instance(start, module.CrustySwap, with_session=False).sell_monad()
+
+
+@register_task("apriori", module="src.model.apriori")
+async def _apriori(start, module):
+    return await _instance(start, module.Apriori).execute()
+
+
+@register_task("magma", module="src.model.magma.instance")
+async def _magma(start, module):
+    return await _instance(start, module.Magma).execute()
+
+
+@register_task("owlto", module="src.model.owlto.instance")
+async def _owlto(start, module):
+    return await _instance(start, module.Owlto).deploy_contract()
+
+
+@register_task("monadverse", module="src.model.monadverse_mint.instance")
+async def _monadverse(start, module):
+    return await _instance(start, module.MonadverseMint).mint()
+
+
+@register_task("shmonad", module="src.model.shmonad.instance")
+async def _shmonad(start, module):
+    return await _instance(start, module.Shmonad).swaps()
+
+
+@register_task("orbiter", module="src.model.orbiter.instance")
+async def _orbiter(start, module):
+    return await _instance(start, module.Orbiter).bridge()
+
+
+@register_task("testnet_bridge", module="src.model.testnet_bridge.instance")
+async def _testnet_bridge(start, module):
+    return await _instance(start, module.TestnetBridge).execute()
+
+
+@register_task("logs", module="src.model.help.stats")
+async def _logs(start, module):
+    wallet_stats = module.WalletStats(start.config, start.proxy)
+    return await wallet_stats.get_wallet_stats(start.private_key, start.account_index)
+
+
+@register_task("nad_domains", module="src.model.nad_domains.instance")
+async def _nad_domains(start, module):
+    return await _instance(start, module.NadDomains).register_random_domain()
+
+
+@register_task("kintsu", module="src.model.kintsu.instance")
+async def _kintsu(start, module):
+    return await _instance(start, module.Kintsu).execute()
+
+
+@register_task("lilchogstars", module="src.model.lilchogstars_mint.instance")
+async def _lilchogstars(start, module):
+    return await _instance(start, module.Lilchogstars).mint()
+
+
+@register_task("monadking", module="src.model.monadking_mint.instance")
+async def _monadking(start, module):
+    return await _instance(start, module.Monadking, with_session=False).mint()
+
+
+@register_task("monadking_unlocked", module="src.model.monadking_mint.instance")
+async def _monadking_unlocked(start, module):
+    return await _instance(start, module.Monadking, with_session=False).mint_unlocked()
+
+
+@register_task("nostra", module="src.model.nostra.instance")
+async def _nostra(start, module):
+    return await _instance(start, module.Nostra).execute()
+
+
+@register_task("magiceden", module="src.model.magiceden.instance")
+async def _magiceden(start, module):
+    magiceden = module.MagicEden(
+        start.account_index, start.proxy, start.config, start.private_key, start.session
+    )
+    return await magiceden.mint()
+
+
+@register_task("dusted", module="src.model.dusted.instance")
+async def _dusted(start, module):
+    dusty = module.Dusted(
+        start.account_index,
+        start.proxy,
+        start.private_key,
+        start.twitter_token,
+        start.config,
+        start.session,
+    )
+    return await dusty.execute()
+
+
+@register_task("frontrunner", module="src.model.frontrunner.instance")
+async def _frontrunner(start, module):
+    return await _instance(start, module.Frontrunner).send_transaction()
+
+
+@register_task("cex_withdrawal", module="src.model.cex_withdrawal.instance")
+async def _cex_withdrawal(start, module):
+    return await module.CexWithdraw(start.account_index, start.private_key, start.config).withdraw()
+
+
+@register_task("octo_swap", module="src.model.swaps.octo_swap")
+async def _octo_swap(start, module):
+    return await _instance(start, module.OctoSwap).execute()
+
+
+@register_task("easynode_deploy", module="src.model.deploy.easy_node.instance")
+async def _easynode_deploy(start, module):
+    return await _instance(start, module.EasyNode).deploy_contract()
+
+
+@register_task("onchaingm_deploy", module="src.model.deploy.onchaingm.instance")
+async def _onchaingm_deploy(start, module):
+    return await _instance(start, module.OnChainGM).deploy_contract()
+
+
+@register_task("narwhal_finance", module="src.model.narwhal_finance.instance")
+async def _narwhal_finance(start, module):
+    return await _instance(start, module.NarwhalFinance).gamble()
+
+
+@register_task("monsternad_whitelist", module="src.model.others.monsternad")
+async def _monsternad_whitelist(start, module):
+    return await module.monsternad_whitelist(
+        start.session, start.account_index, start.config, start.private_key
+    )
+
+
+@register_task("multiplifi", module="src.model.stakings.multiplifi")
+async def _multiplifi(start, module):
+    multiplifi = _instance(start, module.Multiplifi)
+    faucet = await multiplifi.faucet()
+    stake = await multiplifi.stake()
+    return faucet is not False and stake is not False
+
+
+@register_task("flapsh", module="src.model.swaps.flapsh.instance")
+async def _flapsh(start, module):
+    return await _instance(start, module.Flapsh).execute()
+
+
+@register_task("morkie_monhog", "morkie_monarch", "morkie_gtm", module="src.model.nfts.morkie")
+async def _morkie(start, module):
+    morkie = _instance(start, module.Morkie)
+    # morkie_monhog -> mint_monhog
+    return await getattr(morkie, "mint_" + start.current_task.removeprefix("morkie_"))()
+
+
+@register_task("monaigg", module="src.model.nfts.monaigg_nft")
+async def _monaigg(start, module):
+    return await _instance(start, module.Monai).mint()
+
+
+@register_task("nerzo_soulbound", module="src.model.nfts.nerzo")
+async def _nerzo_soulbound(start, module):
+    return await _instance(start, module.Nerzo).mint()
+
+
+@register_task("nerzo_rebels", module="src.model.nfts.nerzo_rebels")
+async def _nerzo_rebels(start, module):
+    return await _instance(start, module.NerzoRebels).mint()
+
+
+@register_task("madness_swaps", module="src.model.swaps.madness.instance")
+async def _madness_swaps(start, module):
+    return await _instance(start, module.Madness).execute()
+
+
+@register_task("nerzo_monad", module="src.model.nfts.nerzo_monad")
+async def _nerzo_monad(start, module):
+    return await _instance(start, module.NerzoMonad).mint()
+
+
+@register_task("zkcodex", module="src.model.zkcodex.instance")
+async def _zkcodex(start, module):
+    return await _instance(start, module.ZkCodex).deploy()
+
+
+@register_task("nerzo_monadid", module="src.model.nfts.nerzo_monadid")
+async def _nerzo_monadid(start, module):
+    return await _instance(start, module.NerzoMonadId).mint()
+
+
+@register_task("superboard", module="src.model.others.superboard")
+async def _superboard(start, module):
+    superboard = module.Superboard(
+        start.session, start.account_index, start.config, start.private_key
+    )
+    return await superboard.quests()
+
+
+@register_task("kuru_swaps", module="src.model.kuru.instance")
+async def _kuru_swaps(start, module):
+    return await _instance(start, module.Kuru).execute()
@@ -1,10 +1,14 @@
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from eth_account import Account
 from typing import Dict, Optional, List, Tuple
 import random
 import asyncio
 from loguru import logger
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
 from src.model.testnet_bridge.constants import (
     TESTNET_BRIDGE_RPCS, 
     TESTNET_BRIDGE_ADDRESS, 
@@ -33,9 +37,7 @@ class TestnetBridge:
         # Initialize Web3 connections for each network
         self.web3_connections = {}
         for network, rpc in TESTNET_BRIDGE_RPCS.items():
-            self.web3_connections[network] = AsyncWeb3(
-                AsyncWeb3.AsyncHTTPProvider(rpc, request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False})
-            )
+            self.web3_connections[network] = get_web3(rpc, proxy)
             
         # Initialize contract objects for each network
         self.bridge_contracts = {}
@@ -150,22 +152,6 @@ class TestnetBridge:
             logger.error(f"[{self.account_index}] Error checking balances: {str(e)}")
             raise e
 
-    async def get_gas_params(self, web3: AsyncWeb3) -> Dict[str, int]:
-        """Get gas parameters for transaction."""
-        try:
-            latest_block = await web3.eth.get_block('latest')
-            base_fee = latest_block['baseFeePerGas']
-            max_priority_fee = await web3.eth.max_priority_fee
-            max_fee = int((base_fee + max_priority_fee) * 2)
-            
-            return {
-                "maxFeePerGas": max_fee,
-                "maxPriorityFeePerGas": max_priority_fee,
-            }
-        except Exception as e:
-            logger.error(f"[{self.account_index}] Failed to get gas parameters: {str(e)}")
-            raise e
-    
     async def estimate_bridge_fee(self, network: str, amount_in: int) -> int:
         """Estimate the bridge fee for a given amount."""
         try:
@@ -285,7 +271,7 @@ class TestnetBridge:
             sepolia_chain_id = 161  # LayerZero chain ID for Sepolia
             
             # Get nonce and gas parameters
-            nonce = await web3.eth.get_transaction_count(self.account.address)
+            nonce = await get_nonce(web3, self.account.address)
             
             if not self.config.TESTNET_BRIDGE.BRIDGE_ALL:
                 amount_out_min = await self.calculate_amount_out_min(network, amount_in)
@@ -303,7 +289,7 @@ class TestnetBridge:
                 # Estimate bridge fee based on the example
                 bridge_fee = await self.estimate_bridge_fee(network, amount_in)
                 # Build the transaction without gas limit first
-                gas_params = await self.get_gas_params(web3)
+                gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=2)
                 
 
                 built_transaction = await transaction.build_transaction({
@@ -345,7 +331,7 @@ class TestnetBridge:
 
                 logger.info(f"[{self.account_index}] Attempting to bridge full balance from {network}")
                 
-                gas_params = await self.get_gas_params(web3)
+                gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=2)
                 # Create a dummy transaction to estimate gas
                 dummy_amount = web3.to_wei(0.0001, "ether")  # Small amount for estimation
                 dummy_transaction = contract.functions.swapAndBridge(
@@ -400,7 +386,7 @@ class TestnetBridge:
                 )
                 
                 # Build the transaction without gas limit first
-                gas_params = await self.get_gas_params(web3)
+                gas_params = await get_gas_params(web3, strategy="percentile", fee_multiplier=2)
                 
                 built_transaction = await transaction.build_transaction({
                     "from": self.account.address,
@@ -443,7 +429,7 @@ class TestnetBridge:
             tx_hash = await web3.eth.send_raw_transaction(signed_tx.raw_transaction)
             
             logger.info(f"[{self.account_index}] Waiting for bridge transaction confirmation...")
-            receipt = await web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = await wait_for_receipt(web3, tx_hash)
             
             explorer_url = f"{TESTNET_BRIDGE_EXPLORERS[network]}{tx_hash.hex()}"
             
@@ -2,11 +2,16 @@ import asyncio
 import random
 from eth_account import Account
 from primp import AsyncClient
-from web3 import AsyncWeb3, Web3
+from web3 import Web3
 from web3.contract import Contract
 
 from src.utils.constants import EXPLORER_URL, RPC_URL
 from src.utils.config import Config
+from src.utils.web3_provider import get_web3
+from src.utils.gas import get_gas_price
+from src.utils.nonce import get_nonce
+from src.utils.receipts import wait_for_receipt
+from src.utils.retry import give_up
 from loguru import logger
 
 
@@ -26,12 +31,7 @@ class ZkCodex:
         self.session = session
 
         self.account: Account = Account.from_key(private_key=private_key)
-        self.web3 = AsyncWeb3(
-            AsyncWeb3.AsyncHTTPProvider(
-                RPC_URL,
-                request_kwargs={"proxy": (f"http://{proxy}"), "ssl": False},
-            )
-        )
+        self.web3 = get_web3(RPC_URL, proxy)
 
     async def get_nft_balance(self) -> int:
         """
@@ -66,11 +66,9 @@ class ZkCodex:
                     "to": None,  # Contract creation has no 'to' address
                     "value": value_in_wei,
                     "data": bytecode,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "nonce": await get_nonce(self.web3, self.account.address),
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "chainId": 10143,
                 }
 
@@ -99,7 +97,7 @@ class ZkCodex:
                 )
 
                 # Wait for confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     contract_address = receipt.contractAddress
@@ -114,6 +112,8 @@ class ZkCodex:
                     return False, None
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | ZkCodex.deploy_default_contract"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -149,11 +149,9 @@ class ZkCodex:
                     "to": None,  # Contract creation has no 'to' address
                     "value": value_in_wei,
                     "data": bytecode,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "nonce": await get_nonce(self.web3, self.account.address),
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "chainId": 10143,
                 }
 
@@ -182,7 +180,7 @@ class ZkCodex:
                 )
 
                 # Wait for confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     contract_address = receipt.contractAddress
@@ -197,6 +195,8 @@ class ZkCodex:
                     return False, None
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | ZkCodex.deploy_token"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
@@ -227,11 +227,9 @@ class ZkCodex:
                     "to": None,  # Contract creation has no 'to' address
                     "value": value_in_wei,
                     "data": bytecode,
-                    "nonce": await self.web3.eth.get_transaction_count(
-                        self.account.address
-                    ),
-                    "maxFeePerGas": await self.web3.eth.gas_price,
-                    "maxPriorityFeePerGas": await self.web3.eth.gas_price,
+                    "nonce": await get_nonce(self.web3, self.account.address),
+                    "maxFeePerGas": await get_gas_price(self.web3),
+                    "maxPriorityFeePerGas": await get_gas_price(self.web3),
                     "chainId": 10143,
                 }
 
@@ -260,7 +258,7 @@ class ZkCodex:
                 )
 
                 # Wait for confirmation
-                receipt = await self.web3.eth.wait_for_transaction_receipt(tx_hash)
+                receipt = await wait_for_receipt(self.web3, tx_hash)
 
                 if receipt["status"] == 1:
                     contract_address = receipt.contractAddress
@@ -275,6 +273,8 @@ class ZkCodex:
                     return False, None
 
             except Exception as e:
+                if give_up(e, f"[{self.account_index}] | ZkCodex.deploy_nft"):
+                    break
                 random_pause = random.randint(
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[0],
                     self.config.SETTINGS.RANDOM_PAUSE_BETWEEN_ACTIONS[1],
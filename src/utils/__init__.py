@@ -3,10 +3,22 @@ from .reader import read_abi, read_txt_file, check_proxy_format
 from .output import show_dev_info, show_logo, show_menu
 from .config import get_config
 from .constants import TOKENS, ERC20_ABI, RPC_URL, EXPLORER_URL
-from .statistics import print_wallets_stats
-from .config_ui import ConfigUI
 from .decorators import retry_async
 
+
+def __getattr__(name):
+    # pandas и customtkinter грузятся только когда реально нужны (статистика / редактор конфига)
+    if name == "print_wallets_stats":
+        from .statistics import print_wallets_stats
+
+        return print_wallets_stats
+    if name == "ConfigUI":
+        from .config_ui import ConfigUI
+
+        return ConfigUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "create_client",
     "create_twitter_client",
@@ -0,0 +1,219 @@
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set, Tuple, Union
+
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3 import AsyncWeb3, Web3
+
+from src.utils.multicall import TokenState, TokenStateReader
+from src.utils.nonce import NonceManager, get_nonce_manager
+
+TRANSFER_TOPIC = HexBytes(keccak(text="Transfer(address,address,uint256)"))
+APPROVAL_TOPIC = HexBytes(keccak(text="Approval(address,address,uint256)"))
+# Бесконечный approve не уменьшается при transferFrom
+MAX_UINT256 = 2**256 - 1
+
+
+@dataclass
+class ChainState:
+    """Known raw (wei) state of the account on one chain; None / missing key - unknown."""
+
+    native: Optional[int] = None
+    # token address -> balance
+    balances: Dict[str, int] = field(default_factory=dict)
+    # (token address, spender) -> allowance
+    allowances: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
+def _topic_address(topic) -> str:
+    return Web3.to_checksum_address(HexBytes(topic)[-20:])
+
+
+class AccountState:
+    """
+    What one account knows about itself during a run: the derived address,
+    its nonce manager, native and ERC20 balances and allowances per chain.
+
+    Reads are answered from memory; only unknown values go to the RPC, all
+    of them in one Multicall3 eth_call. Our own confirmed receipts keep the
+    state current: Transfer and Approval logs update ERC20 balances and
+    allowances, the native balance (gas, value) is read again on next use.
+    Funds that arrive from outside (faucets, bridges) are not seen, so the
+    native balance is also dropped before every task (see Start.execute_task).
+    """
+
+    def __init__(self, private_key: str):
+        self.account: LocalAccount = Account.from_key(private_key)
+        self.address: str = self.account.address
+        self._chains: Dict[str, ChainState] = {}
+        # Чеки, уже учтённые в состоянии
+        self._applied: Set[HexBytes] = set()
+        self.hits = 0
+        self.misses = 0
+
+    def chain(self, web3: AsyncWeb3) -> ChainState:
+        key = str(web3.provider.endpoint_uri)
+        state = self._chains.get(key)
+        if state is None:
+            state = ChainState()
+            self._chains[key] = state
+        return state
+
+    def nonce_manager(self, web3: AsyncWeb3) -> NonceManager:
+        """The nonce is kept by the shared NonceManager of (chain, address)."""
+        return get_nonce_manager(web3, self.address)
+
+    async def native_balance(self, web3: AsyncWeb3, fresh: bool = False) -> int:
+        state = self.chain(web3)
+        if fresh or state.native is None:
+            self.misses += 1
+            state.native = await web3.eth.get_balance(self.address)
+        else:
+            self.hits += 1
+        return state.native
+
+    async def read(
+        self,
+        web3: AsyncWeb3,
+        tokens: Dict[str, str],
+        spenders: Union[Iterable[str], str] = (),
+        fresh: bool = False,
+    ) -> TokenState:
+        """
+        Same as TokenStateReader.read_one for this account, from memory
+        when every requested value is known.
+
+        Args:
+            tokens: Token name -> ERC20 address
+            spenders: Spenders to read ERC20 allowances for
+            fresh: Read from the RPC even if known (a swap amount is computed from it)
+        """
+        if isinstance(spenders, str):
+            spenders = [spenders]
+        addresses = {name: Web3.to_checksum_address(address) for name, address in tokens.items()}
+        spenders = [Web3.to_checksum_address(spender) for spender in spenders]
+
+        state = self.chain(web3)
+        known = (
+            not fresh
+            and state.native is not None
+            and all(address in state.balances for address in addresses.values())
+            and all(
+                (address, spender) in state.allowances
+                for address in addresses.values()
+                for spender in spenders
+            )
+        )
+        if known:
+            self.hits += 1
+        else:
+            self.misses += 1
+            current = await TokenStateReader(web3).read_one(self.address, addresses, spenders)
+            state.native = current.native
+            for name, address in addresses.items():
+                state.balances[address] = current.balances[name]
+                for spender in spenders:
+                    state.allowances[(address, spender)] = current.allowances[(name, spender)]
+
+        return TokenState(
+            self.address,
+            state.native,
+            {name: state.balances[address] for name, address in addresses.items()},
+            {
+                (name, spender): state.allowances[(address, spender)]
+                for name, address in addresses.items()
+                for spender in spenders
+            },
+        )
+
+    def apply_receipt(self, web3: AsyncWeb3, receipt) -> None:
+        """Account for a confirmed receipt of our own transaction (once per tx hash)."""
+        tx_hash = HexBytes(receipt["transactionHash"])
+        if tx_hash in self._applied or str(receipt.get("from", "")).lower() != self.address.lower():
+            return
+        self._applied.add(tx_hash)
+
+        state = self.chain(web3)
+        state.native = None
+        for log in receipt.get("logs") or []:
+            topics = log["topics"]
+            # У ERC721 Transfer 4 топика (tokenId индексирован) - это не баланс токена
+            if len(topics) != 3 or HexBytes(topics[0]) not in (TRANSFER_TOPIC, APPROVAL_TOPIC):
+                continue
+            token = Web3.to_checksum_address(log["address"])
+            first, second = _topic_address(topics[1]), _topic_address(topics[2])
+            amount = int.from_bytes(HexBytes(log["data"])[:32], "big")
+
+            if HexBytes(topics[0]) == APPROVAL_TOPIC:
+                if first == self.address:
+                    state.allowances[(token, second)] = amount
+                continue
+
+            if first == self.address:
+                if token in state.balances:
+                    state.balances[token] -= amount
+                # transferFrom уменьшил allowance спендера, а Approval эмитят не все токены
+                for key in [k for k, v in state.allowances.items() if k[0] == token and v != MAX_UINT256]:
+                    del state.allowances[key]
+            if second == self.address and token in state.balances:
+                state.balances[token] += amount
+
+    def invalidate_native(self) -> None:
+        for state in self._chains.values():
+            state.native = None
+
+    def invalidate(self) -> None:
+        self._chains.clear()
+
+
+_state: ContextVar[Optional[AccountState]] = ContextVar("account_state", default=None)
+
+
+def start_account_state(private_key: str) -> AccountState:
+    """Create the state of the account of the current task (once per account flow)."""
+    state = AccountState(private_key)
+    _state.set(state)
+    return state
+
+
+def get_account_state(address: Optional[str] = None) -> Optional[AccountState]:
+    """State of the current account; None outside an account flow or for another address."""
+    state = _state.get()
+    if state is None or (address is not None and address.lower() != state.address.lower()):
+        return None
+    return state
+
+
+def apply_receipt(web3: AsyncWeb3, receipt) -> None:
+    state = _state.get()
+    if state is not None:
+        state.apply_receipt(web3, receipt)
+
+
+async def get_native_balance(web3: AsyncWeb3, owner: str, fresh: bool = False) -> int:
+    """eth_getBalance through the account's state when `owner` is the current account."""
+    state = get_account_state(owner)
+    if state is None:
+        return await web3.eth.get_balance(owner)
+    return await state.native_balance(web3, fresh)
+
+
+async def read_token_state(
+    web3: AsyncWeb3,
+    owner: str,
+    tokens: Dict[str, str],
+    spenders: Union[Iterable[str], str] = (),
+    fresh: bool = False,
+) -> TokenState:
+    """
+    TokenStateReader.read_one through the account's state when `owner` is
+    the current account. Balances a swap amount is computed from are read
+    with fresh=True: tokens that arrive from outside are not in the state.
+    """
+    state = get_account_state(owner)
+    if state is None:
+        return await TokenStateReader(web3).read_one(owner, tokens, spenders)
+    return await state.read(web3, tokens, spenders, fresh)
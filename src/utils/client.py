@@ -1,8 +1,10 @@
 import primp
 
+from src.utils.rate_limit import RateLimitedClient
+
 
 async def create_client(proxy: str) -> primp.AsyncClient:
-    session = primp.AsyncClient(impersonate="chrome_131", verify=False)
+    session = RateLimitedClient(impersonate="chrome_131", verify=False)
 
     if proxy:
         session.proxy = proxy
@@ -33,7 +35,7 @@ import secrets
 
 
 async def create_twitter_client(proxy: str, auth_token: str) -> primp.AsyncClient:
-    session = primp.AsyncClient(impersonate="chrome_131")
+    session = RateLimitedClient(impersonate="chrome_131")
 
     if proxy:
         session.proxies.update(
@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import List, Optional, Tuple
+
+from loguru import logger
+
+from src.utils.config import AdaptiveThreadsConfig
+from src.utils.scheduler import WorkerPool
+
+# Во сколько раз режем конкурентность при 429/таймаутах/скачке задержки
+DECREASE_FACTOR = 0.7
+# На сколько слотов поднимаем за интервал, пока метрики в норме
+INCREASE_STEP = 1
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller of WorkerPool slots driven by RPC metrics.
+
+    Every INTERVAL seconds it reads p95 latency and error rate of all RPC
+    attempts of the window. While both are under target the limit grows by
+    INCREASE_STEP; any rate limit / timeout answer, an error rate over target
+    or p95 over target cuts it by DECREASE_FACTOR. The limit stays within
+    [MIN_THREADS, MAX_THREADS] and its history is kept for the final report.
+    """
+
+    def __init__(self, pool: WorkerPool, config: AdaptiveThreadsConfig):
+        self.pool = pool
+        self.config = config
+        self.history: List[Tuple[float, int]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._started = time.monotonic()
+
+    def next_limit(self, limit: int, metrics: dict) -> int:
+        if not metrics["requests"]:
+            # Нет запросов - нет сигнала, лимит не трогаем
+            return limit
+
+        overloaded = (
+            metrics["overloads"] > 0
+            or metrics["error_rate"] > self.config.TARGET_ERROR_RATE
+            or metrics["p95"] > self.config.TARGET_P95_LATENCY
+        )
+        if overloaded:
+            limit = int(limit * DECREASE_FACTOR)
+        else:
+            limit += INCREASE_STEP
+        return max(self.config.MIN_THREADS, min(self.config.MAX_THREADS, limit))
+
+    async def _run(self) -> None:
+        from src.utils.rpc_router import rpc_metrics
+
+        rpc_metrics.snapshot()
+        while True:
+            await asyncio.sleep(self.config.INTERVAL)
+            metrics = rpc_metrics.snapshot()
+            limit = self.next_limit(self.pool.workers, metrics)
+            if limit != self.pool.workers:
+                logger.info(
+                    f"Concurrency {self.pool.workers} -> {limit} "
+                    f"(p95 {metrics['p95']:.2f}s, errors {metrics['error_rate']:.1%}, "
+                    f"429/timeouts {metrics['overloads']}, active {self.pool.active})"
+                )
+                self.pool.set_limit(limit)
+                self.history.append((time.monotonic() - self._started, limit))
+
+    def start(self) -> None:
+        self.history.append((0.0, self.pool.workers))
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def report(self) -> str:
+        """Chosen concurrency over time, e.g. "0s:10 -> 30s:11 -> 40s:7"."""
+        return " -> ".join(f"{int(at)}s:{limit}" for at, limit in self.history)
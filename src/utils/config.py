@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Tuple, Optional, Dict
+from typing import List, Tuple, Optional, Dict, Union
 import yaml
 from pathlib import Path
 import asyncio
@@ -19,6 +19,11 @@ class SettingsConfig:
     RANDOM_INITIALIZATION_PAUSE: Tuple[int, int]
     TELEGRAM_USERS_IDS: List[int]
     TELEGRAM_BOT_TOKEN: str
+    USE_UVLOOP: bool = False
+    LOOP_LAG_THRESHOLD: float = 0.1
+    RETRY_BUDGET: int = 20
+    PREFLIGHT: bool = True
+    RECEIPT_CONFIRMATIONS: int = 1
 
 @dataclass
 class FaucetConfig:
@@ -230,7 +235,34 @@ class ZkcodexConfig:
 @dataclass
 class KuruConfig:
     SWAP_ALL_TO_MONAD: bool
-    
+
+
+@dataclass
+class RpcConfig:
+    ENDPOINTS: Dict[str, List[str]] = field(default_factory=dict)
+    HEDGE_READS: bool = True
+    # method -> seconds or "block"
+    CACHE_TTL: Dict[str, Union[float, str]] = field(default_factory=dict)
+
+
+@dataclass
+class AdaptiveThreadsConfig:
+    ENABLED: bool = False
+    MIN_THREADS: int = 1
+    MAX_THREADS: int = 50
+    TARGET_P95_LATENCY: float = 1.0
+    TARGET_ERROR_RATE: float = 0.05
+    INTERVAL: float = 10.0
+
+
+@dataclass
+class StuckTxConfig:
+    ENABLED: bool = True
+    BLOCKS: int = 5
+    FEE_BUMP: float = 0.125
+    MAX_FEE_GWEI: float = 200.0
+
+
 @dataclass
 class Config:
     SETTINGS: SettingsConfig
@@ -260,6 +292,11 @@ class Config:
     MADNESS: MadnessConfig
     ZKCODEX: ZkcodexConfig
     KURU: KuruConfig
+    RPC: RpcConfig = field(default_factory=RpcConfig)
+    ADAPTIVE_THREADS: AdaptiveThreadsConfig = field(default_factory=AdaptiveThreadsConfig)
+    STUCK_TX: StuckTxConfig = field(default_factory=StuckTxConfig)
+    # host pattern -> [requests per second, burst]
+    RATE_LIMITS: Dict[str, List[float]] = field(default_factory=dict)
     WALLETS: WalletsConfig = field(default_factory=WalletsConfig)
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
 
@@ -302,6 +339,11 @@ class Config:
             print(f"Error: {error_msg}")
             raise ImportError(error_msg) from e
 
+        # Опечатка в названии задачи должна падать сразу, а не молча пропускаться
+        from src.model.tasks import validate_tasks
+
+        validate_tasks(tasks_list)
+
         return cls(
             SETTINGS=SettingsConfig(
                 THREADS=data["SETTINGS"]["THREADS"],
@@ -324,6 +366,11 @@ class Config:
                 BROWSER_PAUSE_MULTIPLIER=data["SETTINGS"]["BROWSER_PAUSE_MULTIPLIER"],
                 TELEGRAM_USERS_IDS=data["SETTINGS"]["TELEGRAM_USERS_IDS"],
                 TELEGRAM_BOT_TOKEN=data["SETTINGS"]["TELEGRAM_BOT_TOKEN"],
+                USE_UVLOOP=data["SETTINGS"].get("USE_UVLOOP", False),
+                LOOP_LAG_THRESHOLD=data["SETTINGS"].get("LOOP_LAG_THRESHOLD", 0.1),
+                RETRY_BUDGET=data["SETTINGS"].get("RETRY_BUDGET", 20),
+                PREFLIGHT=data["SETTINGS"].get("PREFLIGHT", True),
+                RECEIPT_CONFIRMATIONS=data["SETTINGS"].get("RECEIPT_CONFIRMATIONS", 1),
             ),
             EXCHANGES=ExchangesConfig(
                 name=data["EXCHANGES"]["name"],
@@ -499,7 +546,15 @@ class Config:
             ),
             KURU=KuruConfig(
                 SWAP_ALL_TO_MONAD=data["KURU"]["SWAP_ALL_TO_MONAD"],
-            )
+            ),
+            RPC=RpcConfig(
+                ENDPOINTS=data.get("RPC", {}).get("ENDPOINTS", {}),
+                HEDGE_READS=data.get("RPC", {}).get("HEDGE_READS", True),
+                CACHE_TTL=data.get("RPC", {}).get("CACHE_TTL") or {},
+            ),
+            RATE_LIMITS=data.get("RATE_LIMITS") or {},
+            ADAPTIVE_THREADS=AdaptiveThreadsConfig(**(data.get("ADAPTIVE_THREADS") or {})),
+            STUCK_TX=StuckTxConfig(**(data.get("STUCK_TX") or {})),
 
         )
 # Singleton pattern
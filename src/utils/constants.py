@@ -1,6 +1,8 @@
 EXPLORER_URL = "https://testnet.monadexplorer.com/tx/0x"
 RPC_URL = "https://testnet-rpc.monad.xyz"
 ETH_RPC_URL = "https://eth1.lava.build"
+# Multicall3, один адрес во всех сетях; для локальной сети передайте свой в TokenStateReader
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
 TOKENS = {
     "native": "native",  # MON
@@ -1,8 +1,6 @@
 from functools import wraps
-import asyncio
 from typing import TypeVar, Callable, Any, Optional
-from loguru import logger
-from src.utils.config import get_config
+from src.utils.retry import UNKNOWN, RetryPolicy, retry
 
 T = TypeVar("T")
 
@@ -28,34 +26,20 @@ def retry_async(
     default_value: Any = None,
 ):
     """
-    Async retry decorator with exponential backoff.
-    If attempts is not provided, uses SETTINGS.ATTEMPTS from config.
+    Async retry decorator on top of src.utils.retry.retry: the error class
+    decides whether to retry (reverts and insufficient funds fail at once).
+    If attempts is not provided, uses SETTINGS.ATTEMPTS from config;
+    delay/backoff are used for errors that are not classified.
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            # Get attempts from config if not provided
-            retry_attempts = attempts if attempts is not None else get_config().SETTINGS.ATTEMPTS
-            current_delay = delay
-
-            for attempt in range(retry_attempts):
-                try:
-                    return await func(*args, **kwargs)
-                except Exception as e:
-                    if attempt < retry_attempts - 1:  # Don't sleep on the last attempt
-                        logger.warning(
-                            f"Attempt {attempt + 1}/{retry_attempts} failed for {func.__name__}: {str(e)}. "
-                            f"Retrying in {current_delay:.1f} seconds..."
-                        )
-                        await asyncio.sleep(current_delay)
-                        current_delay *= backoff
-                    else:
-                        logger.error(
-                            f"All {retry_attempts} attempts failed for {func.__name__}: {str(e)}"
-                        )
-                        raise e  # Re-raise the last exception
-
-            return default_value
+            return await retry(
+                lambda: func(*args, **kwargs),
+                name=func.__name__,
+                attempts=attempts,
+                policies={UNKNOWN: RetryPolicy(attempts=attempts, delay=delay, backoff=backoff)},
+            )
 
         return wrapper
 
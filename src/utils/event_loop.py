@@ -0,0 +1,76 @@
+import asyncio
+import sys
+import time
+from typing import Optional
+
+from loguru import logger
+
+# Как часто монитор просыпается (секунды)
+LAG_CHECK_INTERVAL = 0.5
+
+
+def install_uvloop() -> bool:
+    """Use uvloop for the next event loops. No-op on Windows or without uvloop."""
+    if sys.platform == "win32":
+        logger.warning("uvloop is not available on Windows, using the default event loop")
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        logger.warning("uvloop is not installed (pip install uvloop), using the default event loop")
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+    return True
+
+
+class LoopLagMonitor:
+    """
+    Measures how late the event loop wakes up a sleeping task. A lag over
+    `threshold` means some callback blocked the loop (signing, ABI encoding,
+    heavy logging) and every account's I/O waited for it.
+    """
+
+    def __init__(self, threshold: float = 0.1, interval: float = LAG_CHECK_INTERVAL):
+        self.threshold = threshold
+        self.interval = interval
+        self.max_lag = 0.0
+        self.lag_events = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - started - self.interval
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.threshold:
+                self.lag_events += 1
+                logger.warning(f"Event loop lag {lag * 1000:.0f} ms: something is blocking the loop")
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        if self.lag_events:
+            logger.info(
+                f"Event loop lag over {self.threshold * 1000:.0f} ms happened {self.lag_events} times, "
+                f"max {self.max_lag * 1000:.0f} ms"
+            )
+
+
+def start_lag_monitor(threshold: float) -> Optional[LoopLagMonitor]:
+    """Start a LoopLagMonitor on the running loop, None if threshold is 0 (off)."""
+    if threshold <= 0:
+        return None
+    monitor = LoopLagMonitor(threshold)
+    monitor.start()
+    return monitor
@@ -0,0 +1,228 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from web3 import AsyncWeb3
+
+# Размер скользящего окна eth_feeHistory (в блоках) для стратегии percentile
+FEE_HISTORY_WINDOW = 20
+# Перцентили reward, которые запрашиваем у ноды одним вызовом
+REWARD_PERCENTILES = (10, 25, 50, 75, 90, 99)
+
+
+def percentile(values: List[int], q: float) -> float:
+    """Linear-interpolated percentile, same as numpy.percentile default."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+class FeeHistoryWindow:
+    """
+    Rolling in-memory eth_feeHistory window for one chain.
+
+    The first update pulls FEE_HISTORY_WINDOW blocks; later updates only ask
+    for the blocks produced since the previous one.
+    """
+
+    def __init__(self, size: int = FEE_HISTORY_WINDOW):
+        self.size = size
+        # (block number, baseFeePerGas, rewards by REWARD_PERCENTILES)
+        self.blocks: deque = deque(maxlen=size)
+        self.newest_block: Optional[int] = None
+        self.next_base_fee: Optional[int] = None
+
+    async def update(self, web3: AsyncWeb3) -> None:
+        latest = await web3.eth.block_number
+        if self.newest_block is not None and latest <= self.newest_block:
+            return
+
+        if self.newest_block is None:
+            count = self.size
+        else:
+            count = min(self.size, latest - self.newest_block)
+
+        history = await web3.eth.fee_history(count, latest, list(REWARD_PERCENTILES))
+        oldest = history["oldestBlock"]
+        rewards = history.get("reward") or []
+        for i, base_fee in enumerate(history["baseFeePerGas"][:-1]):
+            block_rewards = rewards[i] if i < len(rewards) else []
+            self.blocks.append((oldest + i, base_fee, tuple(block_rewards)))
+
+        self.next_base_fee = history["baseFeePerGas"][-1]
+        self.newest_block = latest
+
+    def estimate(self, q: float) -> Tuple[int, int]:
+        """Return (base fee, priority fee) at percentile q over the window."""
+        if not self.blocks:
+            raise Exception("Fee history window is empty")
+
+        base_fee = max(self.next_base_fee, int(percentile([b[1] for b in self.blocks], q)))
+
+        # Берём колонку ближайшего запрошенного перцентиля
+        column = min(range(len(REWARD_PERCENTILES)), key=lambda i: abs(REWARD_PERCENTILES[i] - q))
+        tips = [b[2][column] for b in self.blocks if len(b[2]) > column]
+        tip = int(percentile(tips, q)) if tips else 0
+        return base_fee, tip
+
+
+class GasOracle:
+    """
+    Block-scoped cache of fee data for one chain.
+
+    Every value (latest block, priority fee, gas price, fee history) is fetched
+    at most once per block: it is kept together with the block number it was
+    read at and refreshed when eth_blockNumber (cached chain-wide by RpcCache)
+    reports a newer block. Callers that arrive while a refresh is running
+    await the same request instead of starting another one.
+    """
+
+    def __init__(self, chain: str):
+        self.chain = chain
+        # key -> (value, номер блока, на котором прочитано)
+        self._values: Dict[Any, tuple] = {}
+        self._inflight: Dict[Any, asyncio.Future] = {}
+        self.fee_window = FeeHistoryWindow()
+
+    async def _get(self, web3: AsyncWeb3, key: Any, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        block_number = await web3.eth.block_number
+        cached = self._values.get(key)
+        if cached is not None and cached[1] >= block_number:
+            return cached[0]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await fetch()
+            self._values[key] = (value, block_number)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Ожидающих может не быть, гасим "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def latest_block(self, web3: AsyncWeb3):
+        return await self._get(web3, "block", lambda: web3.eth.get_block("latest"))
+
+    async def max_priority_fee(self, web3: AsyncWeb3) -> int:
+        return await self._get(web3, "max_priority_fee", lambda: web3.eth.max_priority_fee)
+
+    async def gas_price(self, web3: AsyncWeb3) -> int:
+        return await self._get(web3, "gas_price", lambda: web3.eth.gas_price)
+
+    async def fee_history(self, web3: AsyncWeb3) -> FeeHistoryWindow:
+        async def fetch():
+            await self.fee_window.update(web3)
+            return self.fee_window
+
+        return await self._get(web3, "fee_history", fetch)
+
+    async def get_params(self, web3: AsyncWeb3, strategy: str = "eip1559", **kwargs) -> Dict[str, int]:
+        if strategy not in GAS_STRATEGIES:
+            raise ValueError(f"Unknown gas strategy: {strategy}")
+        return await GAS_STRATEGIES[strategy](self, web3, **kwargs)
+
+
+GasStrategy = Callable[..., Awaitable[Dict[str, int]]]
+GAS_STRATEGIES: Dict[str, GasStrategy] = {}
+
+
+def gas_strategy(name: str):
+    """Register a gas strategy: async fn(oracle, web3, **kwargs) -> tx fee fields."""
+
+    def decorator(func: GasStrategy) -> GasStrategy:
+        GAS_STRATEGIES[name] = func
+        return func
+
+    return decorator
+
+
+@gas_strategy("eip1559")
+async def base_plus_tip(
+    oracle: GasOracle,
+    web3: AsyncWeb3,
+    fee_multiplier: float = 1.0,
+    tip_multiplier: float = 1.0,
+    **_,
+) -> Dict[str, int]:
+    """maxFeePerGas = (baseFee + tip) * fee_multiplier"""
+    block, tip = await asyncio.gather(
+        oracle.latest_block(web3), oracle.max_priority_fee(web3)
+    )
+    tip = int(tip * tip_multiplier)
+    return {
+        "maxFeePerGas": int((block["baseFeePerGas"] + tip) * fee_multiplier),
+        "maxPriorityFeePerGas": tip,
+    }
+
+
+@gas_strategy("percentile")
+async def reward_percentile(
+    oracle: GasOracle,
+    web3: AsyncWeb3,
+    q: float = 90,
+    fee_multiplier: float = 1.0,
+    tip_multiplier: float = 1.0,
+    **_,
+) -> Dict[str, int]:
+    """Base fee and tip at percentile q of the rolling eth_feeHistory window."""
+    window = await oracle.fee_history(web3)
+    base_fee, tip = window.estimate(q)
+    tip = int(tip * tip_multiplier)
+    return {
+        "maxFeePerGas": int((base_fee + tip) * fee_multiplier),
+        "maxPriorityFeePerGas": tip,
+    }
+
+
+@gas_strategy("legacy")
+async def legacy_gas_price(
+    oracle: GasOracle, web3: AsyncWeb3, fee_multiplier: float = 1.0, **_
+) -> Dict[str, int]:
+    return {"gasPrice": int(await oracle.gas_price(web3) * fee_multiplier)}
+
+
+_oracles: Dict[str, GasOracle] = {}
+
+
+def get_gas_oracle(web3: AsyncWeb3) -> GasOracle:
+    """One oracle per chain (RPC endpoint), shared by all accounts and proxies."""
+    chain = str(web3.provider.endpoint_uri)
+    oracle = _oracles.get(chain)
+    if oracle is None:
+        oracle = GasOracle(chain)
+        _oracles[chain] = oracle
+    return oracle
+
+
+async def get_gas_params(web3: AsyncWeb3, strategy: str = "eip1559", **kwargs) -> Dict[str, int]:
+    """
+    Get cached fee fields for a transaction.
+
+    Args:
+        web3: AsyncWeb3 of the chain
+        strategy: "eip1559" (base + tip), "percentile" or "legacy" (gasPrice)
+        **kwargs: fee_multiplier, tip_multiplier, q (percentile for "percentile")
+
+    Returns:
+        Dict: fields ready to be merged into the transaction
+    """
+    return await get_gas_oracle(web3).get_params(web3, strategy, **kwargs)
+
+
+async def get_gas_price(web3: AsyncWeb3) -> int:
+    """Cached eth_gasPrice, refreshed once per block."""
+    return await get_gas_oracle(web3).gas_price(web3)
@@ -0,0 +1,199 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+JOURNAL_PATH = "data/runs.db"
+
+# Статусы задачи в журнале
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# (position, task, task_type, status)
+PlannedTask = Tuple[int, str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    tasks TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    run_id TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    task TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    tx_hashes TEXT NOT NULL DEFAULT '[]',
+    started_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (run_id, account_index, position)
+);
+"""
+
+@dataclass
+class TaskOutcome:
+    ok: bool = True
+
+
+# (account_index, position) задачи, которая сейчас выполняется в этом контексте
+_current_task: ContextVar[Optional[Tuple[int, int]]] = ContextVar("journal_task", default=None)
+
+
+class RunJournal:
+    """
+    SQLite journal of one run: the task plan of every account and the
+    status, tx hashes and timestamps of every planned task. Every change is
+    committed immediately, so after a crash `--resume <run_id>` can continue
+    with the stored plans and skip what is already done.
+    """
+
+    def __init__(self, run_id: str, path: str = JOURNAL_PATH):
+        self.run_id = run_id
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(_SCHEMA)
+
+    @classmethod
+    def create(cls, tasks: list, path: str = JOURNAL_PATH) -> "RunJournal":
+        # Узлы очереди на одной машине стартуют в одну секунду: pid и счётчик делают run_id уникальным
+        base = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+        journal = cls(base, path)
+        for attempt in range(100):
+            journal.run_id = base if attempt == 0 else f"{base}-{attempt}"
+            try:
+                with journal.db:
+                    journal.db.execute(
+                        "INSERT INTO runs (run_id, started_at, tasks) VALUES (?, ?, ?)",
+                        (journal.run_id, time.time(), json.dumps(tasks)),
+                    )
+                return journal
+            except sqlite3.IntegrityError:
+                continue
+        journal.db.close()
+        raise ValueError(f"Could not pick a free run id for {base} in {path}")
+
+    @classmethod
+    def open(cls, run_id: str, path: str = JOURNAL_PATH) -> "RunJournal":
+        journal = cls(run_id, path)
+        row = journal.db.execute("SELECT 1 FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        if row is None:
+            journal.db.close()
+            raise ValueError(f"Run {run_id} not found in {path}")
+        return journal
+
+    def get_plan(self, account_index: int) -> Optional[List[PlannedTask]]:
+        rows = self.db.execute(
+            "SELECT position, task, task_type, status FROM tasks "
+            "WHERE run_id = ? AND account_index = ? ORDER BY position",
+            (self.run_id, account_index),
+        ).fetchall()
+        return [tuple(row) for row in rows] or None
+
+    def save_plan(self, account_index: int, planned_tasks: List[Tuple[int, str, str]]) -> None:
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO tasks (run_id, account_index, position, task, task_type, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (self.run_id, account_index, position, task, task_type, PENDING)
+                    for position, task, task_type in planned_tasks
+                ],
+            )
+
+    def finished_accounts(self) -> set:
+        """Accounts that have a plan and every task of it done."""
+        rows = self.db.execute(
+            "SELECT account_index FROM tasks WHERE run_id = ? "
+            "GROUP BY account_index HAVING SUM(status != ?) = 0",
+            (self.run_id, DONE),
+        ).fetchall()
+        return {row[0] for row in rows}
+
+    def account_results(self, account_index: int) -> List[dict]:
+        """Tasks of the account with their status and tx hashes."""
+        rows = self.db.execute(
+            "SELECT task, status, tx_hashes FROM tasks "
+            "WHERE run_id = ? AND account_index = ? ORDER BY position",
+            (self.run_id, account_index),
+        ).fetchall()
+        return [
+            {"task": task, "status": status, "tx_hashes": json.loads(tx_hashes)}
+            for task, status, tx_hashes in rows
+        ]
+
+    def _set_status(self, account_index: int, position: int, status: str, column: str) -> None:
+        with self.db:
+            self.db.execute(
+                f"UPDATE tasks SET status = ?, {column} = ? "
+                "WHERE run_id = ? AND account_index = ? AND position = ?",
+                (status, time.time(), self.run_id, account_index, position),
+            )
+
+    @contextmanager
+    def task(self, account_index: int, position: int) -> Iterator[TaskOutcome]:
+        """
+        Mark the task running, then done; failed if the block raises or sets
+        `outcome.ok = False` (modules catch their errors and return False).
+        """
+        self._set_status(account_index, position, RUNNING, "started_at")
+        token = _current_task.set((account_index, position))
+        outcome = TaskOutcome()
+        try:
+            yield outcome
+        except BaseException:
+            self._set_status(account_index, position, FAILED, "finished_at")
+            raise
+        else:
+            self._set_status(account_index, position, DONE if outcome.ok else FAILED, "finished_at")
+        finally:
+            _current_task.reset(token)
+
+    def add_tx_hash(self, tx_hash: str) -> None:
+        current = _current_task.get()
+        if current is None:
+            return
+        account_index, position = current
+        with self.db:
+            row = self.db.execute(
+                "SELECT tx_hashes FROM tasks WHERE run_id = ? AND account_index = ? AND position = ?",
+                (self.run_id, account_index, position),
+            ).fetchone()
+            if row is None:
+                return
+            hashes = json.loads(row[0]) + [tx_hash]
+            self.db.execute(
+                "UPDATE tasks SET tx_hashes = ? WHERE run_id = ? AND account_index = ? AND position = ?",
+                (json.dumps(hashes), self.run_id, account_index, position),
+            )
+
+    def close(self) -> None:
+        self.db.close()
+
+
+_journal: Optional[RunJournal] = None
+
+
+def start_journal(tasks: list, resume: Optional[str] = None) -> RunJournal:
+    """Create a new run journal, or open run `resume` to continue it."""
+    global _journal
+    _journal = RunJournal.open(resume) if resume else RunJournal.create(tasks)
+    logger.info(f"Run journal: {_journal.run_id} ({_journal.path})")
+    return _journal
+
+
+def get_journal() -> Optional[RunJournal]:
+    """Journal of the current run, None when journaling is not started."""
+    return _journal
+
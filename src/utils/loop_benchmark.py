@@ -0,0 +1,95 @@
+"""
+Default asyncio loop vs uvloop on a mocked account flow.
+
+Every mocked account makes RPC-like round trips to an in-memory JSON-RPC
+server (real sockets, no network), signs a transaction and sleeps between
+steps, so the loop does the same kind of work as a real run.
+
+    python -m src.utils.loop_benchmark
+    python -m src.utils.loop_benchmark --accounts 500 --calls 20 --runs 3
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from eth_account import Account
+
+TX = {
+    "to": "0x" + "11" * 20,
+    "value": 1,
+    "gas": 21000,
+    "maxFeePerGas": 2 * 10**9,
+    "maxPriorityFeePerGas": 10**9,
+    "nonce": 0,
+    "chainId": 10143,
+}
+
+
+async def _handle_rpc(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    while line := await reader.readline():
+        request = json.loads(line)
+        response = {"jsonrpc": "2.0", "id": request["id"], "result": hex(request["id"])}
+        writer.write(json.dumps(response).encode() + b"\n")
+        await writer.drain()
+    writer.close()
+
+
+async def _mock_account(port: int, calls: int, sign_every: int, account) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    for i in range(calls):
+        request = {"jsonrpc": "2.0", "id": i, "method": "eth_call", "params": [{"data": "0x" + "00" * 68}, "latest"]}
+        writer.write(json.dumps(request).encode() + b"\n")
+        await writer.drain()
+        json.loads(await reader.readline())
+        if sign_every and i % sign_every == sign_every - 1:
+            # каждый N-й вызов - "отправка транзакции"
+            account.sign_transaction({**TX, "nonce": i})
+        await asyncio.sleep(0)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _mocked_run(accounts: int, calls: int, sign_every: int) -> float:
+    server = await asyncio.start_server(_handle_rpc, "127.0.0.1", 0, backlog=accounts)
+    port = server.sockets[0].getsockname()[1]
+    account = Account.create()
+    started = time.perf_counter()
+    async with server:
+        await asyncio.gather(*(_mock_account(port, calls, sign_every, account) for _ in range(accounts)))
+    return time.perf_counter() - started
+
+
+def bench(policy: asyncio.AbstractEventLoopPolicy, accounts: int, calls: int, sign_every: int, runs: int) -> float:
+    asyncio.set_event_loop_policy(policy)
+    try:
+        return statistics.median(asyncio.run(_mocked_run(accounts, calls, sign_every)) for _ in range(runs))
+    finally:
+        asyncio.set_event_loop_policy(None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare asyncio and uvloop on a mocked account flow")
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=20, help="RPC round trips per account")
+    parser.add_argument("--sign-every", type=int, default=5, help="sign a tx every N calls, 0 - never")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    total_calls = args.accounts * args.calls
+    default = bench(asyncio.DefaultEventLoopPolicy(), args.accounts, args.calls, args.sign_every, args.runs)
+    print(f"asyncio: {default:.3f}s ({total_calls / default:,.0f} calls/s)")
+
+    try:
+        import uvloop
+    except ImportError:
+        print("uvloop is not installed, nothing to compare")
+        return
+
+    fast = bench(uvloop.EventLoopPolicy(), args.accounts, args.calls, args.sign_every, args.runs)
+    print(f"uvloop:  {fast:.3f}s ({total_calls / fast:,.0f} calls/s), x{default / fast:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple, Union
+
+from eth_abi import decode, encode
+from eth_utils import function_signature_to_4byte_selector
+from loguru import logger
+from web3 import AsyncWeb3, Web3
+
+from src.utils.constants import MULTICALL3_ADDRESS
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]",
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"},
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]",
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function",
+    },
+]
+
+BALANCE_OF = function_signature_to_4byte_selector("balanceOf(address)")
+ALLOWANCE = function_signature_to_4byte_selector("allowance(address,address)")
+GET_ETH_BALANCE = function_signature_to_4byte_selector("getEthBalance(address)")
+# Максимум подзапросов в одном eth_call, остальное уходит отдельными eth_call
+MAX_CALLS_PER_MULTICALL = 300
+
+
+@dataclass
+class TokenState:
+    """Raw (wei) balances of one address."""
+
+    address: str
+    native: int = 0
+    balances: Dict[str, int] = field(default_factory=dict)
+    # (token name, spender) -> allowance
+    allowances: Dict[Tuple[str, str], int] = field(default_factory=dict)
+
+
+class TokenStateReader:
+    """
+    Reads native balance, ERC20 balances and allowances through Multicall3.
+
+    The whole state of one or many addresses is fetched in a single eth_call
+    (chunked by MAX_CALLS_PER_MULTICALL). A failing sub-call, e.g. a token
+    that is not deployed, reads as 0 instead of failing the whole request.
+    """
+
+    def __init__(self, web3: AsyncWeb3, multicall_address: str = MULTICALL3_ADDRESS):
+        self.web3 = web3
+        self.multicall_address = Web3.to_checksum_address(multicall_address)
+        self.contract = web3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+
+    async def read(
+        self,
+        owners: Iterable[str],
+        tokens: Dict[str, str],
+        spenders: Iterable[str] = (),
+    ) -> Dict[str, TokenState]:
+        """
+        Args:
+            owners: Addresses to read
+            tokens: Token name -> ERC20 address (native token is always read)
+            spenders: Spenders to read ERC20 allowances for
+
+        Returns:
+            Dict: checksum owner address -> TokenState
+        """
+        owners = [Web3.to_checksum_address(owner) for owner in owners]
+        tokens = {name: Web3.to_checksum_address(address) for name, address in tokens.items()}
+        spenders = [Web3.to_checksum_address(spender) for spender in spenders]
+
+        calls: List[tuple] = []
+        slots: List[tuple] = []
+        for owner in owners:
+            calls.append((self.multicall_address, True, GET_ETH_BALANCE + encode(["address"], [owner])))
+            slots.append((owner, "native", None))
+
+            for name, token in tokens.items():
+                calls.append((token, True, BALANCE_OF + encode(["address"], [owner])))
+                slots.append((owner, "balance", name))
+
+                for spender in spenders:
+                    calls.append(
+                        (token, True, ALLOWANCE + encode(["address", "address"], [owner, spender]))
+                    )
+                    slots.append((owner, "allowance", (name, spender)))
+
+        chunks = [
+            calls[i : i + MAX_CALLS_PER_MULTICALL]
+            for i in range(0, len(calls), MAX_CALLS_PER_MULTICALL)
+        ]
+        results = [
+            result
+            for chunk in await asyncio.gather(
+                *(self.contract.functions.aggregate3(chunk).call() for chunk in chunks)
+            )
+            for result in chunk
+        ]
+
+        states = {owner: TokenState(owner) for owner in owners}
+        for (owner, kind, key), (success, data) in zip(slots, results):
+            if success and len(data) >= 32:
+                value = decode(["uint256"], data[:32])[0]
+            else:
+                logger.debug(f"Multicall {kind} {key} for {owner} failed")
+                value = 0
+
+            state = states[owner]
+            if kind == "native":
+                state.native = value
+            elif kind == "balance":
+                state.balances[key] = value
+            else:
+                state.allowances[key] = value
+        return states
+
+    async def read_one(
+        self,
+        owner: str,
+        tokens: Dict[str, str],
+        spenders: Union[Iterable[str], str] = (),
+    ) -> TokenState:
+        if isinstance(spenders, str):
+            spenders = [spenders]
+        states = await self.read([owner], tokens, spenders)
+        return states[Web3.to_checksum_address(owner)]
+
+
+async def get_token_amounts(
+    web3: AsyncWeb3, owner: str, tokens: Dict[str, dict]
+) -> Dict[str, float]:
+    """
+    Human-readable balances of tokens described as
+    {"address": ..., "decimals": ..., "native": bool} in one round trip.
+    Swap amounts are computed from them, so they are always read from the
+    RPC; the AccountState of the owner is refreshed on the way.
+    """
+    from src.utils.account_state import read_token_state
+
+    erc20 = {
+        name: token["address"] for name, token in tokens.items() if not token.get("native")
+    }
+    state = await read_token_state(web3, owner, erc20, fresh=True)
+
+    amounts = {}
+    for name, token in tokens.items():
+        if token.get("native"):
+            amounts[name] = float(Web3.from_wei(state.native, "ether"))
+        else:
+            amounts[name] = state.balances[name] / 10 ** token["decimals"]
+    return amounts
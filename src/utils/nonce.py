@@ -0,0 +1,159 @@
+import asyncio
+from typing import Any, Dict, Optional, Tuple
+
+import rlp
+from eth_account import Account
+from eth_account._utils.legacy_transactions import Transaction
+from eth_account.typed_transactions import TypedTransaction
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+from web3.middleware import Web3Middleware
+
+# Ошибки ноды, после которых локальный nonce точно разошёлся с сетью
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "invalid nonce",
+    "replacement transaction underpriced",
+    "already known",
+)
+
+
+def is_nonce_error(error: Any) -> bool:
+    message = str(error).lower()
+    return any(pattern in message for pattern in NONCE_ERRORS)
+
+
+class NonceManager:
+    """
+    Local nonce allocator for one address on one chain.
+
+    The pending nonce is fetched once; after that nonces are handed out
+    locally and advanced when NonceSyncMiddleware sees the raw transaction
+    accepted by the node. Any failed send drops the local state so the next
+    allocation re-reads the pending nonce from the chain.
+
+    A task holds at most one unsent nonce: if it allocates again (e.g. retry
+    after a failed estimate_gas) it gets the same nonce back instead of
+    leaving a gap. Use reserve() to pipeline several transactions.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._next: Optional[int] = None
+        # nonce -> task, которая его взяла, но ещё не отправила транзакцию
+        self._leases: Dict[int, asyncio.Task] = {}
+        self._lock = asyncio.Lock()
+
+    async def _sync(self, web3: AsyncWeb3) -> None:
+        self._next = await web3.eth.get_transaction_count(self.address, "pending")
+        self._leases.clear()
+
+    def _reusable_lease(self) -> Optional[int]:
+        current = asyncio.current_task()
+        for nonce in sorted(self._leases):
+            task = self._leases[nonce]
+            if task is current or task.done():
+                self._leases[nonce] = current
+                return nonce
+        return None
+
+    async def allocate(self, web3: AsyncWeb3) -> int:
+        async with self._lock:
+            if self._next is None:
+                await self._sync(web3)
+
+            nonce = self._reusable_lease()
+            if nonce is None:
+                nonce = self._next
+                self._next += 1
+                self._leases[nonce] = asyncio.current_task()
+            return nonce
+
+    async def reserve(self, web3: AsyncWeb3, count: int) -> range:
+        """Reserve `count` consecutive nonces owned by the caller."""
+        async with self._lock:
+            if self._next is None:
+                await self._sync(web3)
+
+            start = self._next
+            self._next += count
+            return range(start, start + count)
+
+    def mark_sent(self, nonce: int) -> None:
+        self._leases.pop(nonce, None)
+        if self._next is not None and nonce >= self._next:
+            self._next = nonce + 1
+
+    def resync(self) -> None:
+        self._next = None
+        self._leases.clear()
+
+    def on_send_error(self, error: Any) -> None:
+        if is_nonce_error(error):
+            logger.warning(f"{self.address[:8]}... | Nonce out of sync ({error}), resyncing")
+        self.resync()
+
+
+_managers: Dict[Tuple[str, str], NonceManager] = {}
+
+
+def get_nonce_manager(web3: AsyncWeb3, address: str) -> NonceManager:
+    """One manager per (chain, address), shared by all proxies of the account."""
+    key = (str(web3.provider.endpoint_uri), address.lower())
+    manager = _managers.get(key)
+    if manager is None:
+        manager = NonceManager(address)
+        _managers[key] = manager
+    return manager
+
+
+async def get_nonce(web3: AsyncWeb3, address: str) -> int:
+    """Next nonce for the address without an RPC call per transaction."""
+    return await get_nonce_manager(web3, address).allocate(web3)
+
+
+async def reserve_nonces(web3: AsyncWeb3, address: str, count: int) -> range:
+    """Reserve a range of nonces for pipelined sends."""
+    return await get_nonce_manager(web3, address).reserve(web3, count)
+
+
+def decode_raw_transaction(raw_transaction: Any) -> Tuple[str, int]:
+    """Return (sender, nonce) of a signed raw transaction."""
+    raw = HexBytes(raw_transaction)
+    if raw[0] <= 0x7F:
+        nonce = TypedTransaction.from_bytes(raw).as_dict()["nonce"]
+    else:
+        nonce = rlp.decode(raw, Transaction).nonce
+    return Account.recover_transaction(raw), nonce
+
+
+class NonceSyncMiddleware(Web3Middleware):
+    """Keeps NonceManager in sync with eth_sendRawTransaction results."""
+
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method, params):
+            if method != "eth_sendRawTransaction":
+                return await make_request(method, params)
+
+            try:
+                sender, nonce = decode_raw_transaction(params[0])
+            except Exception:
+                return await make_request(method, params)
+
+            manager = get_nonce_manager(self._w3, sender)
+            try:
+                response = await make_request(method, params)
+            except Exception as e:
+                manager.on_send_error(e)
+                raise
+
+            error = response.get("error")
+            if error:
+                manager.on_send_error(error.get("message", error) if isinstance(error, dict) else error)
+            else:
+                manager.mark_sent(nonce)
+            return response
+
+        return middleware
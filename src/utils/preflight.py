@@ -0,0 +1,79 @@
+from typing import Any, Dict, Optional, Tuple
+
+from eth_abi import abi as eth_abi
+from eth_utils import function_abi_to_4byte_selector, get_abi_input_types
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+
+from src.utils.retry import REVERT, TransactionReverted, classify_error
+
+# Поля, которые нужны eth_call; nonce и цены газа не передаём
+_CALL_FIELDS = ("from", "to", "value", "data", "gas")
+
+# (account, contract, selector) -> (calldata, value, reason) последнего revert за запуск
+_known_reverts: Dict[Tuple[str, str, str], Tuple[str, int, str]] = {}
+
+
+class PreflightReverted(TransactionReverted):
+    """eth_call of the transaction at the pending block reverted, nothing was sent."""
+
+
+def _key(tx: Dict[str, Any]) -> Tuple[str, str, str]:
+    return (tx["from"], tx.get("to") or "", HexBytes(tx.get("data") or b"")[:4].to_0x_hex())
+
+
+def _payload(tx: Dict[str, Any]) -> Tuple[str, int]:
+    return HexBytes(tx.get("data") or b"").to_0x_hex(), tx.get("value", 0)
+
+
+def decode_revert(error: Exception, abi: Optional[list] = None) -> str:
+    """
+    Readable revert reason. web3 decodes Error(string) and Panic itself;
+    custom errors come as raw data and are decoded with the error entries
+    of `abi`.
+    """
+    data = getattr(error, "data", None)
+    if abi and isinstance(data, str) and data.startswith("0x") and len(data) >= 10:
+        selector = HexBytes(data[:10])
+        for item in abi:
+            if item.get("type") != "error" or function_abi_to_4byte_selector(item) != selector:
+                continue
+            try:
+                values = eth_abi.decode(get_abi_input_types(item), HexBytes(data)[4:])
+            except Exception:
+                break
+            return f"{item['name']}({', '.join(str(value) for value in values)})"
+    # ContractLogicError хранит текст в message, str() отдаёт кортеж (message, data)
+    return getattr(error, "message", None) or str(error)
+
+
+def check_known_revert(tx: Dict[str, Any]) -> None:
+    """Raise PreflightReverted if this exact call already reverted during the run."""
+    known = _known_reverts.get(_key(tx))
+    if known is not None and known[:2] == _payload(tx):
+        raise PreflightReverted(f"preflight: {known[2]} (known revert, not sent)")
+
+
+async def preflight(web3: AsyncWeb3, tx: Dict[str, Any], abi: Optional[list] = None) -> None:
+    """
+    eth_call the exact transaction at the pending block and raise
+    PreflightReverted if it would revert. The revert is remembered per
+    (account, contract, selector) for the run; the same call with the same
+    calldata and value fails right away, without asking the node again.
+    """
+    check_known_revert(tx)
+    key = _key(tx)
+
+    call = {field: tx[field] for field in _CALL_FIELDS if field in tx}
+    try:
+        await web3.eth.call(call, "pending")
+    except Exception as e:
+        # Сетевые ошибки и нехватка средств - не revert, их разбирает retry()
+        if classify_error(e) != REVERT:
+            raise
+        reason = decode_revert(e, abi)
+        _known_reverts[key] = (*_payload(tx), reason)
+        raise PreflightReverted(f"preflight: {reason}") from e
+
+    # Состояние изменилось (баланс пополнен и т.п.) - старый revert больше не актуален
+    _known_reverts.pop(key, None)
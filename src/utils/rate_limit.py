@@ -0,0 +1,89 @@
+import asyncio
+import time
+from fnmatch import fnmatch
+from typing import Dict, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import primp
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` requests per second on average, up to `burst` at once.
+    Waiters are served in FIFO order.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, cost: float = 1.0) -> None:
+        cost = min(cost, self.burst)
+        async with self._lock:
+            self._refill()
+            if self.tokens < cost:
+                await asyncio.sleep((cost - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= cost
+
+
+_buckets: Dict[str, Optional[TokenBucket]] = {}
+_limits: Optional[Dict[str, Tuple[float, float]]] = None
+
+
+def _load_limits() -> Dict[str, Tuple[float, float]]:
+    global _limits
+    if _limits is None:
+        from src.utils.config import get_config
+
+        _limits = {
+            pattern.lower(): (float(limit[0]), float(limit[1]))
+            for pattern, limit in get_config().RATE_LIMITS.items()
+        }
+    return _limits
+
+
+def set_rate_limits(limits: Dict[str, Sequence[float]]) -> None:
+    """Override RATE_LIMITS from config.yaml: {host pattern: [requests/sec, burst]}."""
+    global _limits
+    _limits = {pattern.lower(): (float(rate), float(burst)) for pattern, (rate, burst) in limits.items()}
+    _buckets.clear()
+
+
+def get_rate_limiter(url: str) -> Optional[TokenBucket]:
+    """Bucket of the url's host, None if no RATE_LIMITS pattern matches it."""
+    host = (urlsplit(str(url)).hostname or "").lower()
+    if host in _buckets:
+        return _buckets[host]
+
+    bucket = None
+    for pattern, (rate, burst) in _load_limits().items():
+        if fnmatch(host, pattern):
+            bucket = TokenBucket(rate, burst)
+            break
+    _buckets[host] = bucket
+    return bucket
+
+
+async def rate_limit(url: str, cost: float = 1.0) -> None:
+    """Wait for a token of the url's host. Hosts without a limit pass at once."""
+    bucket = get_rate_limiter(url)
+    if bucket is not None:
+        await bucket.acquire(cost)
+
+
+class RateLimitedClient(primp.AsyncClient):
+    """primp.AsyncClient that takes a token from the host's bucket before every request."""
+
+    # get/post/... в primp вызывают request, поэтому переопределяем только его
+    async def request(self, method, url, *args, **kwargs):
+        await rate_limit(url)
+        return await super().request(method, url, *args, **kwargs)
@@ -0,0 +1,231 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+from hexbytes import HexBytes
+from loguru import logger
+from web3 import AsyncWeb3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+
+from src.utils.account_state import apply_receipt
+
+# Как часто спрашиваем номер блока (секунды)
+POLL_INTERVAL = 0.5
+# Таймаут ожидания по умолчанию, как у web3.wait_for_transaction_receipt
+DEFAULT_TIMEOUT = 120
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    deadline: float
+    confirmations: int
+    # web3 (прокси) того, кто ждёт - запасной путь для опроса
+    web3: AsyncWeb3
+
+
+class ReceiptWatcher:
+    """
+    Resolves transaction receipts for one chain.
+
+    Callers register a tx hash and await a future. The watcher checks the
+    block number every POLL_INTERVAL and, once per new block, asks for every
+    pending receipt in a single JSON-RPC batch. Receipts are re-read every
+    block until they are `confirmations` blocks deep (default
+    SETTINGS.RECEIPT_CONFIRMATIONS), so a reorg that drops the transaction
+    simply puts it back to pending.
+
+    Receipts are asked by hash, not with eth_getBlockReceipts: a batch of
+    the few pending hashes is one request per block as well, while block
+    receipts carry every transaction of the block and would have to be
+    read for each block passed between two polls.
+
+    Polling goes through the web3 (proxy) of one of the waiters; when it
+    fails, the web3 instances of the other waiters are tried in turn, so a
+    dead or banned proxy of one account does not time out everyone.
+    """
+
+    def __init__(self, chain: str):
+        self.chain = chain
+        self._waiters: Dict[HexBytes, List[_Waiter]] = {}
+        # Хэши, которые ещё ни разу не проверяли
+        self._unchecked: Set[HexBytes] = set()
+        self._last_block: Optional[int] = None
+        self._web3: Optional[AsyncWeb3] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def watch(
+        self,
+        web3: AsyncWeb3,
+        tx_hash,
+        timeout: float = DEFAULT_TIMEOUT,
+        confirmations: Optional[int] = None,
+    ) -> asyncio.Future:
+        if confirmations is None:
+            confirmations = default_confirmations()
+        loop = asyncio.get_running_loop()
+        key = HexBytes(tx_hash)
+        future = loop.create_future()
+
+        if self._web3 is None:
+            self._web3 = web3
+        self._waiters.setdefault(key, []).append(
+            _Waiter(future, loop.time() + timeout, confirmations, web3)
+        )
+        self._unchecked.add(key)
+
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return future
+
+    @property
+    def last_block(self) -> Optional[int]:
+        """Newest block seen by the watcher; fresh while something is watched."""
+        return self._last_block
+
+    async def _run(self) -> None:
+        while self._waiters:
+            try:
+                await self._poll()
+            except Exception as e:
+                logger.warning(f"Receipt watcher {self.chain}: {e}")
+
+            self._expire()
+            if self._waiters:
+                await asyncio.sleep(POLL_INTERVAL)
+
+    def _candidates(self) -> List[AsyncWeb3]:
+        """Last web3 that worked first, then the web3 of every other waiter."""
+        candidates = [self._web3] if self._web3 is not None else []
+        for waiters in self._waiters.values():
+            for waiter in waiters:
+                if all(waiter.web3 is not web3 for web3 in candidates):
+                    candidates.append(waiter.web3)
+        return candidates
+
+    async def _poll(self) -> None:
+        error: Optional[Exception] = None
+        for web3 in self._candidates():
+            try:
+                await self._poll_with(web3)
+            except Exception as e:
+                error = e
+                logger.debug(f"Receipt watcher {self.chain}: poll failed ({e}), trying another proxy")
+                continue
+            self._web3 = web3
+            return
+        if error is not None:
+            raise error
+
+    async def _poll_with(self, web3: AsyncWeb3) -> None:
+        latest = await web3.eth.block_number
+        if self._last_block is None or latest > self._last_block:
+            hashes = list(self._waiters)
+        elif self._unchecked:
+            hashes = [h for h in self._waiters if h in self._unchecked]
+        else:
+            return
+
+        receipts = await self._fetch_receipts(web3, hashes)
+        self._last_block = latest
+        self._unchecked.difference_update(hashes)
+
+        for tx_hash, receipt in zip(hashes, receipts):
+            if receipt is None:
+                continue
+            depth = latest - receipt["blockNumber"] + 1
+            self._resolve(tx_hash, lambda w: depth >= w.confirmations, result=receipt)
+
+    async def _fetch_receipts(
+        self, web3: AsyncWeb3, hashes: List[HexBytes]
+    ) -> List[Optional[AttributeDict]]:
+        requests = [("eth_getTransactionReceipt", [h.to_0x_hex()]) for h in hashes]
+        try:
+            responses = await web3.provider.make_batch_request(requests)
+        except NotImplementedError:
+            responses = await asyncio.gather(
+                *(web3.provider.make_request(m, p) for m, p in requests)
+            )
+
+        if not isinstance(responses, list):
+            raise Exception(f"batch request failed: {responses.get('error', responses)}")
+
+        receipts = []
+        for response in responses:
+            raw = response.get("result")
+            receipts.append(AttributeDict.recursive(receipt_formatter(raw)) if raw else None)
+        return receipts
+
+    def _resolve(self, tx_hash: HexBytes, ready, result=None, error=None) -> None:
+        pending = []
+        for waiter in self._waiters.get(tx_hash, []):
+            if waiter.future.done():
+                continue
+            if not ready(waiter):
+                pending.append(waiter)
+            elif error is not None:
+                waiter.future.set_exception(error)
+            else:
+                waiter.future.set_result(result)
+
+        if pending:
+            self._waiters[tx_hash] = pending
+        else:
+            self._waiters.pop(tx_hash, None)
+            self._unchecked.discard(tx_hash)
+
+    def _expire(self) -> None:
+        now = asyncio.get_running_loop().time()
+        for tx_hash in list(self._waiters):
+            self._resolve(
+                tx_hash,
+                lambda w: w.deadline <= now,
+                error=TimeExhausted(
+                    f"Transaction {tx_hash.to_0x_hex()} is not in the chain after timeout"
+                ),
+            )
+
+
+_watchers: Dict[str, ReceiptWatcher] = {}
+
+
+def default_confirmations() -> int:
+    from src.utils.config import get_config
+
+    return max(1, get_config().SETTINGS.RECEIPT_CONFIRMATIONS)
+
+
+def get_receipt_watcher(web3: AsyncWeb3) -> ReceiptWatcher:
+    """One watcher per chain (RPC endpoint), shared by all accounts and proxies."""
+    chain = str(web3.provider.endpoint_uri)
+    watcher = _watchers.get(chain)
+    if watcher is None:
+        watcher = ReceiptWatcher(chain)
+        _watchers[chain] = watcher
+    return watcher
+
+
+async def wait_for_receipt(
+    web3: AsyncWeb3,
+    tx_hash,
+    timeout: float = DEFAULT_TIMEOUT,
+    confirmations: Optional[int] = None,
+) -> AttributeDict:
+    """
+    Wait for a transaction receipt through the shared per-chain watcher.
+
+    Args:
+        web3: AsyncWeb3 of the chain the transaction was sent to
+        tx_hash: Transaction hash
+        timeout: Seconds before TimeExhausted is raised
+        confirmations: How many blocks deep the receipt must be (default SETTINGS.RECEIPT_CONFIRMATIONS)
+
+    Returns:
+        AttributeDict: receipt, same as web3.eth.wait_for_transaction_receipt
+    """
+    receipt = await get_receipt_watcher(web3).watch(web3, tx_hash, timeout, confirmations)
+    # Балансы и allowance аккаунта обновляются по логам его же транзакций
+    apply_receipt(web3, receipt)
+    return receipt
@@ -0,0 +1,271 @@
+import asyncio
+import random
+import sys
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Optional, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# Классы ошибок
+TRANSIENT = "transient"
+RATE_LIMIT = "rate_limit"
+NONCE = "nonce"
+UNDERPRICED = "underpriced"
+REVERT = "revert"
+INSUFFICIENT_FUNDS = "insufficient_funds"
+UNKNOWN = "unknown"
+
+# Порядок важен: "replacement transaction underpriced" - это nonce, а не цена газа
+_ERROR_PATTERNS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (INSUFFICIENT_FUNDS, ("insufficient funds", "insufficient balance", "exceeds balance")),
+    (NONCE, ("nonce too low", "nonce too high", "invalid nonce", "replacement transaction", "already known")),
+    (UNDERPRICED, ("underpriced", "fee too low", "less than block base fee", "fee cap less than")),
+    (RATE_LIMIT, ("429", "rate limit", "too many requests")),
+    (REVERT, ("execution reverted", "reverted", "status 0", "out of gas")),
+    (
+        TRANSIENT,
+        ("timeout", "timed out", "connection", "502", "503", "504", "temporarily", "reset by peer", "eof"),
+    ),
+)
+
+# Ошибки web3, которые означают revert контракта при eth_call/eth_estimateGas
+_REVERT_ERROR_TYPES = ("ContractLogicError", "ContractCustomError", "ContractPanicError")
+
+
+class TransactionReverted(Exception):
+    """Transaction was mined with status 0."""
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How to retry one class of errors. attempts=None and delay=None mean
+    SETTINGS.ATTEMPTS and a random SETTINGS.PAUSE_BETWEEN_ATTEMPTS pause.
+    """
+
+    attempts: Optional[int] = None
+    delay: Optional[float] = None
+    backoff: float = 2.0
+    max_delay: float = 60.0
+    # Доля случайного разброса паузы, чтобы аккаунты не ретраили синхронно
+    jitter: float = 0.5
+
+    def pause(self, retry: int, settings) -> float:
+        if self.delay is None:
+            return random.randint(*settings.PAUSE_BETWEEN_ATTEMPTS)
+        pause = min(self.max_delay, self.delay * self.backoff**retry)
+        return pause * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    # Сеть моргнула - повторяем почти сразу
+    TRANSIENT: RetryPolicy(attempts=5, delay=1.0, max_delay=15.0),
+    RATE_LIMIT: RetryPolicy(attempts=5, delay=5.0),
+    # NonceManager уже сбросил nonce после ошибки отправки, следующая сборка возьмёт pending
+    NONCE: RetryPolicy(attempts=3, delay=0.5, backoff=1.0),
+    # TxBuilder берёт свежие цены газа при каждой сборке
+    UNDERPRICED: RetryPolicy(attempts=3, delay=2.0),
+    # Повтор даст тот же результат
+    REVERT: RetryPolicy(attempts=1),
+    INSUFFICIENT_FUNDS: RetryPolicy(attempts=1),
+    UNKNOWN: RetryPolicy(),
+}
+
+
+def classify_error(error: BaseException) -> str:
+    """Map an exception to one of the error classes of RETRY_POLICIES."""
+    if isinstance(error, TransactionReverted):
+        return REVERT
+    if any(cls.__name__ in _REVERT_ERROR_TYPES for cls in type(error).__mro__):
+        return REVERT
+    if isinstance(error, asyncio.TimeoutError):
+        return TRANSIENT
+
+    rpc_router = sys.modules.get("src.utils.rpc_router")
+    if rpc_router is not None and isinstance(error, rpc_router.EndpointUnavailable):
+        return RATE_LIMIT
+    status = getattr(error, "status", None)
+    if status == 429:
+        return RATE_LIMIT
+    if isinstance(status, int) and status >= 500:
+        return TRANSIENT
+
+    message = str(error).lower()
+    for error_class, patterns in _ERROR_PATTERNS:
+        if any(pattern in message for pattern in patterns):
+            return error_class
+    if isinstance(error, (ConnectionError, OSError)):
+        return TRANSIENT
+    return UNKNOWN
+
+
+def is_fatal(error_class: Optional[str]) -> bool:
+    """Errors that no retry can fix."""
+    return error_class is not None and RETRY_POLICIES[error_class].attempts == 1
+
+
+class RetryBudget:
+    """
+    Retries one account may spend at all levels together (account flow,
+    task modules, single calls). Also remembers the class of the last error,
+    so an outer level does not retry a flow that failed on a revert.
+    """
+
+    def __init__(self, retries: int):
+        self.retries = retries
+        self.spent = 0
+        # Сколько секунд аккаунт проспал в паузах между повторами
+        self.waited = 0.0
+        self.last_error: Optional[str] = None
+        # Транзакции, отправленные внутри retry(): "<имя retry>|<intent>" -> [Submission]
+        self.submissions: Dict[str, list] = {}
+
+    def take(self) -> bool:
+        if self.spent >= self.retries:
+            return False
+        self.spent += 1
+        return True
+
+
+_budget: ContextVar[Optional[RetryBudget]] = ContextVar("retry_budget", default=None)
+# Имя самого внутреннего retry(), в котором сейчас выполняется код
+_scope: ContextVar[Optional[str]] = ContextVar("retry_scope", default=None)
+
+
+def start_retry_budget(retries: int) -> RetryBudget:
+    """Give the current task (one account) its own retry budget."""
+    budget = RetryBudget(retries)
+    _budget.set(budget)
+    return budget
+
+
+def intent_submissions(intent: str) -> Optional[list]:
+    """
+    Transactions already sent for `intent` by earlier attempts of the
+    current retry() (kept until the intent is mined or that retry() returns
+    or raises). None outside retry() or without an account budget.
+    """
+    budget, scope = _budget.get(), _scope.get()
+    if budget is None or scope is None:
+        return None
+    return budget.submissions.setdefault(f"{scope}|{intent}", [])
+
+
+def forget_intent(intent: str) -> None:
+    """The intent is done: a later submit with the same intent is a new action."""
+    budget, scope = _budget.get(), _scope.get()
+    if budget is not None and scope is not None:
+        budget.submissions.pop(f"{scope}|{intent}", None)
+
+
+def note_error(error: BaseException) -> str:
+    """Classify an error caught outside retry() and remember it for the outer levels."""
+    error_class = classify_error(error)
+    budget = _budget.get()
+    if budget is not None:
+        # Обёртка вида Exception("swap failed") не должна затирать настоящую причину
+        if error_class == UNKNOWN and budget.last_error is not None:
+            return budget.last_error
+        budget.last_error = error_class
+    return error_class
+
+
+def give_up(error: BaseException, name: str) -> bool:
+    """
+    For module loops `for retry in range(SETTINGS.ATTEMPTS)` that do not go
+    through retry(): classify the error and tell whether to stop - reverts
+    and insufficient funds are not retried, and every other retry is taken
+    from the account's RetryBudget like in retry().
+    """
+    error_class = note_error(error)
+    if is_fatal(error_class):
+        logger.error(f"{name} failed ({error_class}: {error}), not retrying")
+        return True
+    budget = _budget.get()
+    if budget is not None and not budget.take():
+        logger.error(f"{name} failed ({error_class}: {error}), retry budget of the account is spent")
+        return True
+    return False
+
+
+async def retry(
+    func: Callable[..., Awaitable[T]],
+    *args,
+    name: Optional[str] = None,
+    attempts: Optional[int] = None,
+    failed: Optional[Callable[[T], bool]] = None,
+    policies: Optional[Dict[str, RetryPolicy]] = None,
+    **kwargs,
+) -> T:
+    """
+    Call `func(*args, **kwargs)` and retry it according to the policy of
+    the error class: backoff with jitter for network errors and rate limits,
+    a quick retry after nonce / fee errors, no retry at all for reverts and
+    insufficient funds. `attempts` caps the policy's attempts; `failed(result)`
+    makes a returned value count as a failure (e.g. False from a module);
+    `policies` overrides RETRY_POLICIES for this call.
+
+    The last exception is re-raised; for result failures the last result is
+    returned. Every retry is taken from the account's RetryBudget.
+    """
+    from src.utils.config import get_config
+
+    settings = get_config().SETTINGS
+    name = name or getattr(func, "__qualname__", repr(func))
+    budget = _budget.get()
+    retries: Dict[str, int] = {}
+    scope_token = _scope.set(name)
+    try:
+        while True:
+            error: Optional[BaseException] = None
+            if budget is not None:
+                budget.last_error = None
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                error_class = note_error(e)
+            else:
+                if failed is None or not failed(result):
+                    return result
+                # Модуль вернул неудачу; причина - последняя ошибка, записанная внутри
+                error_class = budget.last_error if budget and budget.last_error else UNKNOWN
+
+            policy = (policies or {}).get(error_class) or RETRY_POLICIES[error_class]
+            limit = policy.attempts or settings.ATTEMPTS
+            if attempts is not None:
+                limit = min(limit, attempts)
+            retry_number = retries.get(error_class, 0)
+            reason = f"{error_class}: {error}" if error is not None else error_class
+
+            if retry_number + 1 >= limit:
+                if is_fatal(error_class):
+                    logger.error(f"{name} failed ({reason}), not retrying")
+                else:
+                    logger.error(f"{name} failed after {retry_number + 1} attempts ({reason})")
+            elif budget is not None and not budget.take():
+                logger.error(f"{name} failed ({reason}), retry budget of the account is spent")
+            else:
+                retries[error_class] = retry_number + 1
+                pause = policy.pause(retry_number, settings)
+                if budget is not None:
+                    budget.waited += pause
+                logger.warning(
+                    f"{name} failed ({reason}), retry {retry_number + 1}/{limit - 1} in {pause:.1f}s"
+                )
+                await asyncio.sleep(pause)
+                continue
+
+            if error is not None:
+                raise error
+            return result
+    finally:
+        _scope.reset(scope_token)
+        if budget is not None:
+            # Действие завершилось (успехом или нет) - следующее с тем же именем шлёт транзакции заново
+            prefix = f"{name}|"
+            for key in [key for key in budget.submissions if key.startswith(prefix)]:
+                del budget.submissions[key]
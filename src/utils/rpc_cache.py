@@ -0,0 +1,134 @@
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Union
+
+# "block" в CACHE_TTL: ответ живёт до следующего блока, но не дольше этого
+BLOCK_SCOPE_MAX_TTL = 2.0
+# TTL по умолчанию, перекрывается секцией RPC.CACHE_TTL в config.yaml
+DEFAULT_CACHE_TTL: Dict[str, Union[float, str]] = {
+    "eth_chainId": 3600,
+    "net_version": 3600,
+    "eth_gasPrice": "block",
+    "eth_maxPriorityFeePerGas": "block",
+    "eth_blockNumber": 0.5,
+}
+# Теги блока, ответы на которые меняются каждый блок
+MOVING_BLOCK_TAGS = ("latest", "pending", "safe", "finalized")
+
+_Key = Tuple[str, str]
+
+
+def _request_key(method: str, params: Any) -> _Key:
+    return method, json.dumps(params, sort_keys=True, default=repr)
+
+
+def _is_block_scoped(method: str, params: Any) -> bool:
+    """getBlockByNumber("latest") lives for one block."""
+    return method == "eth_getBlockByNumber" and bool(params) and params[0] in MOVING_BLOCK_TAGS
+
+
+class RpcCache:
+    """
+    Single-flight and short-lived cache for read requests of one chain.
+
+    Identical reads (same method and params) that are already in flight are
+    not sent again: every caller awaits the same request. Successful answers
+    of methods listed in the TTL table are kept for that many seconds, or
+    until the next block for "block" scoped entries; everything else, e.g.
+    account specific eth_call, is only coalesced and never cached. Error
+    answers are never cached. A new block is noticed from eth_blockNumber
+    answers passing through the cache.
+    """
+
+    def __init__(self, chain: str, ttl: Optional[Dict[str, Union[float, str]]] = None):
+        self.chain = chain
+        self.ttl = {**DEFAULT_CACHE_TTL, **(ttl or {})}
+        self._in_flight: Dict[_Key, asyncio.Task] = {}
+        # key -> (expires_at, block, response)
+        self._cached: Dict[_Key, Tuple[float, Optional[int], Any]] = {}
+        self._block: Optional[int] = None
+        self.hits = 0
+        self.coalesced = 0
+
+    def _lookup(self, key: _Key) -> Optional[Any]:
+        entry = self._cached.get(key)
+        if entry is None:
+            return None
+        expires_at, block, response = entry
+        if time.monotonic() >= expires_at or (block is not None and block != self._block):
+            del self._cached[key]
+            return None
+        return response
+
+    def _store(self, method: str, params: Any, key: _Key, response: Any) -> None:
+        if not isinstance(response, dict) or "error" in response:
+            return
+
+        if method == "eth_blockNumber":
+            try:
+                block = int(response["result"], 16)
+            except (KeyError, TypeError, ValueError):
+                block = None
+            if block is not None and (self._block is None or block > self._block):
+                self._block = block
+
+        ttl = self.ttl.get(method)
+        if ttl is None and _is_block_scoped(method, params):
+            ttl = "block"
+        if ttl is None:
+            return
+
+        if ttl == "block":
+            self._cached[key] = (time.monotonic() + BLOCK_SCOPE_MAX_TTL, self._block, response)
+        elif float(ttl) > 0:
+            self._cached[key] = (time.monotonic() + float(ttl), None, response)
+
+    async def fetch(
+        self, method: str, params: Any, request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Args:
+            method: RPC method
+            params: RPC params, already formatted by web3
+            request: Coroutine function that actually sends the request
+
+        Returns:
+            RPC response, shared by every caller of the same request
+        """
+        key = _request_key(method, params)
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(request())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._finish(method, params, key, t))
+        else:
+            self.coalesced += 1
+
+        # shield: отмена одного из ожидающих не отменяет запрос для остальных
+        return await asyncio.shield(task)
+
+    def _finish(self, method: str, params: Any, key: _Key, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._store(method, params, key, task.result())
+
+
+_caches: Dict[str, RpcCache] = {}
+
+
+def get_rpc_cache(chain: str, ttl: Optional[Dict[str, Union[float, str]]] = None) -> RpcCache:
+    """One cache per chain (RPC endpoint), shared by all accounts and proxies."""
+    cache = _caches.get(chain)
+    if cache is None:
+        cache = RpcCache(chain, ttl)
+        _caches[chain] = cache
+    return cache
@@ -0,0 +1,223 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from src.utils.gas import percentile
+
+# Вес нового замера в EWMA задержки
+EWMA_ALPHA = 0.2
+# Сколько последних задержек храним для p95
+LATENCY_SAMPLES = 50
+# На сколько секунд убираем эндпоинт из ротации после 429/5xx/таймаута
+COOLDOWN = 10.0
+# Хедж не раньше, чем через столько секунд
+MIN_HEDGE_DELAY = 0.2
+# Задержка, с которой стартует эндпоинт без замеров
+INITIAL_LATENCY = 0.3
+
+# Ответы ноды, которые значат "эндпоинт перегружен", а не ошибку запроса
+OVERLOAD_ERRORS = ("rate limit", "too many requests", "429", "capacity", "timeout")
+
+
+class EndpointUnavailable(Exception):
+    """The endpoint answered with a rate limit or overload error."""
+
+
+class Endpoint:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency = INITIAL_LATENCY
+        self.error_rate = 0.0
+        self.samples: deque = deque(maxlen=LATENCY_SAMPLES)
+        self.cooldown_until = 0.0
+        self.in_flight = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def score(self) -> float:
+        # Меньше - лучше: задержка, штраф за ошибки и за текущую нагрузку
+        return self.latency * (1 + 5 * self.error_rate) * (1 + 0.1 * self.in_flight)
+
+    def p95(self) -> float:
+        if len(self.samples) < 5:
+            return max(MIN_HEDGE_DELAY, self.latency * 2)
+        return max(MIN_HEDGE_DELAY, percentile(list(self.samples), 95))
+
+    def record_success(self, latency: float) -> None:
+        self.latency = (1 - EWMA_ALPHA) * self.latency + EWMA_ALPHA * latency
+        self.error_rate *= 1 - EWMA_ALPHA
+        self.samples.append(latency)
+
+    def record_failure(self) -> None:
+        self.error_rate = (1 - EWMA_ALPHA) * self.error_rate + EWMA_ALPHA
+        self.cooldown_until = time.monotonic() + COOLDOWN
+
+
+class RpcMetrics:
+    """
+    Process-wide counters of RPC attempts since the last snapshot, used by
+    the adaptive concurrency controller.
+    """
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.overloads = 0
+
+    def record(self, latency: Optional[float] = None, error: bool = False, overload: bool = False) -> None:
+        if latency is not None:
+            self.latencies.append(latency)
+        self.errors += error or overload
+        self.overloads += overload
+
+    def snapshot(self) -> Dict[str, float]:
+        """p95 latency, error rate and overload count, then start a new window."""
+        requests = len(self.latencies) + self.errors
+        snapshot = {
+            "requests": requests,
+            "p95": percentile(self.latencies, 95) if self.latencies else 0.0,
+            "error_rate": self.errors / requests if requests else 0.0,
+            "overloads": self.overloads,
+        }
+        self.latencies, self.errors, self.overloads = [], 0, 0
+        return snapshot
+
+
+rpc_metrics = RpcMetrics()
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """429/5xx answers and timeouts: the endpoint is saturated, not the request wrong."""
+    if isinstance(error, (EndpointUnavailable, asyncio.TimeoutError)):
+        return True
+    status = getattr(error, "status", None)
+    return status == 429 or (isinstance(status, int) and status >= 500)
+
+
+def is_overload_response(response) -> bool:
+    if not isinstance(response, dict) or not response.get("error"):
+        return False
+    return any(pattern in str(response["error"]).lower() for pattern in OVERLOAD_ERRORS)
+
+
+class RpcRouter:
+    """
+    Routes RPC calls of one chain between several endpoints.
+
+    Every call goes to the endpoint with the best score (EWMA latency
+    weighted by error rate). Transport errors and rate limit answers put the
+    endpoint on cooldown and idempotent calls fail over to the next one.
+    Idempotent reads can be hedged: if the first endpoint has not answered
+    within its p95 latency, the same request is sent to the second best and
+    the first answer wins. Writes go to exactly one endpoint.
+    """
+
+    def __init__(self, urls: Sequence[str]):
+        self.endpoints = [Endpoint(url) for url in urls]
+
+    def ranked(self, exclude: Sequence[Endpoint] = ()) -> List[Endpoint]:
+        candidates = [e for e in self.endpoints if e not in exclude]
+        available = [e for e in candidates if e.available]
+        # Если все на cooldown - пробуем всё равно, лучше чем упасть
+        return sorted(available or candidates, key=lambda e: e.score)
+
+    async def _attempt(self, endpoint: Endpoint, send: Callable[[str], Awaitable]):
+        started = time.monotonic()
+        endpoint.in_flight += 1
+        try:
+            response = await send(endpoint.url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            endpoint.record_failure()
+            rpc_metrics.record(error=True, overload=is_overload_error(e))
+            raise
+        finally:
+            endpoint.in_flight -= 1
+
+        if is_overload_response(response):
+            endpoint.record_failure()
+            rpc_metrics.record(overload=True)
+            raise EndpointUnavailable(f"{endpoint.url}: {response['error']}")
+        latency = time.monotonic() - started
+        endpoint.record_success(latency)
+        rpc_metrics.record(latency)
+        return response
+
+    async def _hedged(self, first: Endpoint, second: Endpoint, send, tried: List[Endpoint]):
+        primary = asyncio.ensure_future(self._attempt(first, send))
+        done, _ = await asyncio.wait({primary}, timeout=first.p95())
+        if done:
+            # Быстрая ошибка первого: второй не вызывался, call() переключится на него
+            return primary.result()
+
+        tried.append(second)
+        backup = asyncio.ensure_future(self._attempt(second, send))
+        pending = {primary, backup}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def call(
+        self, send: Callable[[str], Awaitable], idempotent: bool = True, hedge: bool = True
+    ):
+        """
+        Args:
+            send: coroutine function that performs the request against a URL
+            idempotent: False for writes - no hedging and no failover
+            hedge: False to never send an idempotent call to a second endpoint
+
+        Returns:
+            Response of the first endpoint that answered successfully
+        """
+        tried: List[Endpoint] = []
+        last_error: Optional[BaseException] = None
+
+        while True:
+            ranked = self.ranked(exclude=tried)
+            if not ranked:
+                raise last_error
+
+            first = ranked[0]
+            if not idempotent:
+                return await self._attempt(first, send)
+
+            tried.append(first)
+            try:
+                if hedge and len(ranked) > 1:
+                    return await self._hedged(first, ranked[1], send, tried)
+                return await self._attempt(first, send)
+            except Exception as e:
+                last_error = e
+                logger.debug(f"RPC {first.url} failed: {e}, trying next endpoint")
+
+
+_routers: Dict[Tuple[str, ...], RpcRouter] = {}
+
+
+def get_router(urls: Sequence[str]) -> RpcRouter:
+    """
+    One router per chain (its set of endpoints, in any order), shared by all
+    proxies so scores are global. Hedging is chosen per call, not here.
+    """
+    key = tuple(sorted(set(urls)))
+    router = _routers.get(key)
+    if router is None:
+        router = RpcRouter(key)
+        _routers[key] = router
+    return router
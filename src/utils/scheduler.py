@@ -0,0 +1,181 @@
+import asyncio
+import heapq
+import itertools
+from collections import deque
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Deque, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
+
+# Во сколько раз спящих аккаунтов может быть больше, чем активных слотов
+MAX_PARKED_FACTOR = 10
+
+_current_pool: ContextVar[Optional["WorkerPool"]] = ContextVar("current_pool", default=None)
+
+
+class WorkerPool:
+    """
+    Runs jobs with at most `workers` of them talking to the network at once.
+
+    Jobs are pulled lazily from an iterator only when a slot is free. A job
+    that calls `pause()` gives its slot back and is parked on a timer heap;
+    when the timer fires it queues for a slot again ahead of new jobs. So
+    `workers` counts active jobs only, while the total number of live jobs
+    (active + parked) is bounded by workers * MAX_PARKED_FACTOR.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_parked_factor: int = MAX_PARKED_FACTOR,
+        max_workers: Optional[int] = None,
+    ):
+        self.workers = max(1, workers)
+        # max_workers - верхняя граница для set_limit (адаптивный режим)
+        self.max_alive = max(self.workers, max_workers or 0) * max(1, max_parked_factor)
+        self.started = 0
+        self.finished = 0
+
+        self._active = 0
+        # Проснувшиеся аккаунты получают слот раньше новых
+        self._woken_waiters: Deque[asyncio.Future] = deque()
+        self._new_waiters: Deque[asyncio.Future] = deque()
+        self._timers: List[Tuple[float, int, asyncio.Future]] = []
+        self._timer_handle: Optional[asyncio.TimerHandle] = None
+        self._seq = itertools.count()
+        self._alive: Set[asyncio.Task] = set()
+        self._alive_changed: Optional[asyncio.Event] = None
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def parked(self) -> int:
+        return len(self._timers)
+
+    async def _acquire(self, woken: bool = False) -> None:
+        if self._active < self.workers and not self._woken_waiters and not self._new_waiters:
+            self._active += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._woken_waiters if woken else self._new_waiters
+        waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Слот уже отдали нам - возвращаем его
+                self._release()
+            else:
+                waiters.remove(future)
+            raise
+
+    def _release(self) -> None:
+        self._active -= 1
+        self._wake()
+
+    def _wake(self) -> None:
+        for waiters in (self._woken_waiters, self._new_waiters):
+            while waiters and self._active < self.workers:
+                future = waiters.popleft()
+                if not future.done():
+                    future.set_result(None)
+                    self._active += 1
+
+    def set_limit(self, workers: int) -> None:
+        """
+        Change the number of slots on the fly. When lowered, running jobs
+        keep their slots until they pause or finish.
+        """
+        self.workers = max(1, workers)
+        self._wake()
+
+    def _schedule_timer(self) -> None:
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+        if self._timers:
+            loop = asyncio.get_running_loop()
+            self._timer_handle = loop.call_at(self._timers[0][0], self._fire_timers)
+
+    def _fire_timers(self) -> None:
+        self._timer_handle = None
+        now = asyncio.get_running_loop().time()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, future = heapq.heappop(self._timers)
+            if not future.done():
+                future.set_result(None)
+        self._schedule_timer()
+
+    async def pause(self, seconds: float) -> None:
+        """Sleep without holding a slot, then wait for a slot with priority."""
+        if seconds <= 0:
+            return
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        wake_at = loop.time() + seconds
+        heapq.heappush(self._timers, (wake_at, next(self._seq), future))
+        if self._timers[0][2] is future:
+            self._schedule_timer()
+
+        self._release()
+        try:
+            await future
+        finally:
+            if not future.done():
+                future.cancel()
+            await self._acquire(woken=True)
+
+    async def _run_job(self, job: T, handler: Callable[[T], Awaitable]) -> None:
+        _current_pool.set(self)
+        self.started += 1
+        try:
+            await handler(job)
+        except Exception as e:
+            logger.error(f"Worker job failed: {e}")
+        finally:
+            self.finished += 1
+            self._release()
+
+    def _on_job_done(self, task: asyncio.Task) -> None:
+        self._alive.discard(task)
+        self._alive_changed.set()
+
+    async def run(self, jobs: Iterable[T], handler: Callable[[T], Awaitable]) -> None:
+        """
+        Args:
+            jobs: Iterable of job arguments, consumed lazily
+            handler: Coroutine function called for every job
+        """
+        loop = asyncio.get_running_loop()
+        self._alive_changed = asyncio.Event()
+
+        for job in jobs:
+            while len(self._alive) >= self.max_alive:
+                self._alive_changed.clear()
+                await self._alive_changed.wait()
+
+            await self._acquire()
+            task = loop.create_task(self._run_job(job, handler))
+            self._alive.add(task)
+            task.add_done_callback(self._on_job_done)
+
+        while self._alive:
+            await asyncio.gather(*self._alive)
+
+
+async def pause(seconds: float) -> None:
+    """
+    Sleep inside a WorkerPool job without occupying a concurrency slot.
+    Outside of a pool it is a plain asyncio.sleep.
+    """
+    pool = _current_pool.get()
+    if pool is None:
+        await asyncio.sleep(seconds)
+    else:
+        await pool.pause(seconds)
@@ -0,0 +1,86 @@
+import asyncio
+import multiprocessing
+import queue
+from dataclasses import asdict
+from typing import Callable, List, Optional, Sequence
+
+from loguru import logger
+
+from src.utils.config import Config, WalletInfo
+from src.utils.logs import ProgressTracker
+
+# Как часто координатор проверяет, живы ли процессы (секунды)
+POLL_INTERVAL = 1.0
+
+
+def split_shards(items: Sequence, shards: int) -> List[list]:
+    """Round-robin split, so shuffled accounts stay evenly mixed between shards."""
+    shards = max(1, min(shards, len(items)))
+    return [list(items[i::shards]) for i in range(shards)]
+
+
+class ShardProgress:
+    """
+    Progress tracker of a shard process: forwards increments to the
+    coordinator, which owns the real ProgressTracker.
+    """
+
+    def __init__(self, events: multiprocessing.Queue):
+        self.events = events
+
+    async def increment(self, amount: int = 1, message: Optional[str] = None):
+        self.events.put(("progress", amount))
+
+
+def report_wallets(events: multiprocessing.Queue, config: Config) -> None:
+    """Send WalletStats results of a shard to the coordinator."""
+    events.put(("wallets", [asdict(wallet) for wallet in config.WALLETS.wallets]))
+
+
+async def run_sharded(
+    target: Callable,
+    shards: List[list],
+    progress_tracker: ProgressTracker,
+    config: Config,
+    *args,
+) -> None:
+    """
+    Run target(shard_id, accounts, events, *args) in one process per shard
+    and aggregate their progress and wallet stats into this process.
+
+    target must be a picklable module-level function; it gets a queue to
+    put ("progress", n), ("wallets", [...]) and finally ("done", shard_id).
+    """
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    processes = [
+        context.Process(target=target, args=(shard_id, accounts, events, *args), daemon=True)
+        for shard_id, accounts in enumerate(shards)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} worker processes: {[len(s) for s in shards]} accounts")
+
+    loop = asyncio.get_running_loop()
+    running = set(range(len(processes)))
+    while running:
+        try:
+            event, payload = await loop.run_in_executor(None, events.get, True, POLL_INTERVAL)
+        except queue.Empty:
+            for shard_id in list(running):
+                if not processes[shard_id].is_alive():
+                    logger.error(
+                        f"Worker process {shard_id} exited with code {processes[shard_id].exitcode}"
+                    )
+                    running.discard(shard_id)
+            continue
+
+        if event == "progress":
+            await progress_tracker.increment(payload)
+        elif event == "wallets":
+            config.WALLETS.wallets.extend(WalletInfo(**wallet) for wallet in payload)
+        elif event == "done":
+            running.discard(payload)
+
+    for process in processes:
+        process.join(timeout=10)
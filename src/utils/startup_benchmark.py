@@ -0,0 +1,106 @@
+"""
+Startup import benchmark.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters,
+parses the import tree and prints the most expensive modules. Exits with
+code 1 when the median total import time is over the budget.
+
+    python -m src.utils.startup_benchmark
+    python -m src.utils.startup_benchmark --budget 0.8 --runs 5 --top 30
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Бюджет на импорт process.py (секунды), до печати меню
+STARTUP_BUDGET = 1.0
+DEFAULT_RUNS = 5
+
+
+@dataclass
+class ImportEntry:
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def parse_importtime(output: str) -> List[ImportEntry]:
+    """Parse stderr of `python -X importtime`, in the order modules finished importing."""
+    entries = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        stripped = name.lstrip()
+        entries.append(
+            ImportEntry(
+                name=stripped.strip(),
+                # importtime сдвигает вложенные импорты на 2 пробела
+                depth=(len(name) - len(stripped) - 1) // 2,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return entries
+
+
+def measure(module: str, python: str = sys.executable) -> List[ImportEntry]:
+    result = subprocess.run(
+        [python, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def run_benchmark(module: str, runs: int) -> Dict[str, dict]:
+    """Median self / cumulative time (seconds) and depth of every module over `runs` runs."""
+    samples: Dict[str, dict] = {}
+    for _ in range(runs):
+        for entry in measure(module):
+            sample = samples.setdefault(
+                entry.name, {"depth": entry.depth, "self": [], "cumulative": []}
+            )
+            sample["self"].append(entry.self_us / 1e6)
+            sample["cumulative"].append(entry.cumulative_us / 1e6)
+
+    return {
+        name: {
+            "depth": sample["depth"],
+            "self": statistics.median(sample["self"]),
+            "cumulative": statistics.median(sample["cumulative"]),
+        }
+        for name, sample in samples.items()
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure import cost of the bot startup")
+    parser.add_argument("--module", default="process", help="module to import (default: process)")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET, help="seconds")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=20, help="how many modules to show")
+    args = parser.parse_args()
+
+    results = run_benchmark(args.module, args.runs)
+    # Итог - сумма модулей верхнего уровня, т.е. всё, что импортировал сам модуль
+    total = sum(r["cumulative"] for r in results.values() if r["depth"] == 0)
+
+    print(f"{'cumulative':>11} {'self':>9}  module")
+    ranked = sorted(results.items(), key=lambda item: item[1]["cumulative"], reverse=True)
+    for name, r in ranked[: args.top]:
+        print(f"{r['cumulative']:>10.3f}s {r['self']:>8.3f}s  {'  ' * r['depth']}{name}")
+
+    status = "OK" if total <= args.budget else "OVER BUDGET"
+    print(f"\nimport {args.module}: {total:.3f}s (median of {args.runs}), budget {args.budget:.3f}s - {status}")
+    return 0 if total <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,6 @@
 from tabulate import tabulate
 from typing import List, Optional
 from loguru import logger
-import pandas as pd
 from datetime import datetime
 import os
 
@@ -16,6 +15,9 @@ def print_wallets_stats(config: Config, excel_path: str = "data/progress.xlsx"):
         config: Конфигурация с данными кошельков
         excel_path: Путь для сохранения Excel файла (по умолчанию "data/progress.xlsx")
     """
+    # pandas грузится ~0.5с, поэтому только здесь, в конце прогона
+    import pandas as pd
+
     try:
         # Сортируем кошельки по индексу
         sorted_wallets = sorted(config.WALLETS.wallets, key=lambda x: x.account_index)
@@ -0,0 +1,381 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Union
+
+from eth_account.signers.local import LocalAccount
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+
+from loguru import logger
+
+from src.utils.account_state import apply_receipt
+from src.utils.gas import get_gas_params
+from src.utils.nonce import get_nonce, get_nonce_manager
+from src.utils.preflight import check_known_revert, preflight
+from src.utils.receipts import DEFAULT_TIMEOUT, POLL_INTERVAL, get_receipt_watcher
+from src.utils.retry import forget_intent, intent_submissions
+
+# Запас к eth_estimateGas по умолчанию
+GAS_BUFFER = 1.2
+
+# Нода не примет замену, если цена газа выросла меньше чем на 10%
+MIN_FEE_BUMP = 1.1
+FEE_FIELDS = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+
+_chain_ids: Dict[str, int] = {}
+
+
+@dataclass
+class Submission:
+    """A signed transaction recorded before it was sent."""
+
+    tx_hash: HexBytes
+    nonce: int
+    tx: Dict[str, Any]
+    sent_at: float
+
+
+async def get_chain_id(web3: AsyncWeb3) -> int:
+    """eth_chainId, asked once per chain (RPC endpoint) per run."""
+    chain = str(web3.provider.endpoint_uri)
+    chain_id = _chain_ids.get(chain)
+    if chain_id is None:
+        chain_id = await web3.eth.chain_id
+        _chain_ids[chain] = chain_id
+    return chain_id
+
+
+class TxBuilder:
+    """
+    Builds a fully populated transaction in one pass.
+
+    Unlike ContractFunction.build_transaction it never asks the node for
+    fields on its own: chain id is cached per chain, nonce comes from the
+    NonceManager, fees from the shared GasOracle and gas from a single
+    eth_estimateGas multiplied by gas_buffer. Explicitly passed fields win.
+
+    With SETTINGS.PREFLIGHT (or preflight=True) the transaction is also
+    eth_call'ed at the pending block, next to the estimate; a revert is
+    decoded with `abi` (or the ABI of the contract function) and raised as
+    PreflightReverted before a nonce is taken.
+    """
+
+    def __init__(
+        self,
+        web3: AsyncWeb3,
+        account: LocalAccount,
+        gas_strategy: str = "eip1559",
+        gas_buffer: float = GAS_BUFFER,
+        abi: Optional[list] = None,
+        preflight: Optional[bool] = None,
+        **gas_kwargs,
+    ):
+        self.web3 = web3
+        self.account = account
+        self.gas_strategy = gas_strategy
+        self.gas_buffer = gas_buffer
+        self.abi = abi
+        self.preflight = preflight
+        self.gas_kwargs = gas_kwargs
+
+    async def build(
+        self,
+        call=None,
+        *,
+        to: Optional[str] = None,
+        data: Union[bytes, str] = b"",
+        value: int = 0,
+        **overrides: Any,
+    ) -> Dict[str, Any]:
+        """
+        Args:
+            call: Contract function with arguments bound, e.g. contract.functions.approve(a, b)
+            to: Recipient, when raw calldata is sent instead of a contract function
+            data: Raw calldata
+            value: Native value in wei
+            **overrides: Any transaction field (gas, nonce, gasPrice, ...) to use as is
+
+        Returns:
+            Dict: transaction ready for account.sign_transaction
+        """
+        abi = self.abi
+        if call is not None:
+            to = call.address
+            data = call._encode_transaction_data()
+            abi = call.contract_abi
+
+        tx: Dict[str, Any] = {
+            "from": self.account.address,
+            "to": AsyncWeb3.to_checksum_address(to) if to else None,
+            "value": value,
+            "data": HexBytes(data).to_0x_hex(),
+        }
+        if tx["to"] is None:
+            del tx["to"]
+
+        call_tx = {**tx, **overrides}
+        simulate = self._simulate(call_tx)
+        if simulate:
+            # Уже известный revert - без единого запроса к ноде
+            check_known_revert(call_tx)
+
+        fee_fields = ("gasPrice", "maxFeePerGas", "maxPriorityFeePerGas")
+        results = await asyncio.gather(
+            self._preflight(call_tx, abi, simulate),
+            self._field(overrides, "chainId", get_chain_id(self.web3)),
+            self._fees(overrides, fee_fields),
+            self._field(overrides, "gas", self._estimate(call_tx)),
+            return_exceptions=True,
+        )
+        # Причина из preflight первой: она расшифрована по ABI модуля
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        _, chain_id, fees, gas = results
+        # nonce последним: если estimate упал, номер не занимаем
+        nonce = await self._field(
+            overrides, "nonce", get_nonce(self.web3, self.account.address)
+        )
+
+        tx.update(fees)
+        tx.update(overrides)
+        tx.update(chainId=chain_id, gas=gas, nonce=nonce)
+        return tx
+
+    async def _field(self, overrides: Dict[str, Any], name: str, fetch) -> Any:
+        if name in overrides:
+            fetch.close()
+            return overrides[name]
+        return await fetch
+
+    async def _fees(self, overrides: Dict[str, Any], fee_fields) -> Dict[str, int]:
+        if any(field in overrides for field in fee_fields):
+            return {}
+        return await get_gas_params(self.web3, self.gas_strategy, **self.gas_kwargs)
+
+    def _simulate(self, tx: Dict[str, Any]) -> bool:
+        if "nonce" in tx:
+            # Замена отправленной транзакции: pending-блок уже содержит её саму
+            return False
+        if self.preflight is not None:
+            return self.preflight
+        from src.utils.config import get_config
+
+        return get_config().SETTINGS.PREFLIGHT
+
+    async def _preflight(self, tx: Dict[str, Any], abi: Optional[list], simulate: bool) -> None:
+        if simulate:
+            await preflight(self.web3, tx, abi)
+
+    async def _estimate(self, tx: Dict[str, Any]) -> int:
+        return int(await self.web3.eth.estimate_gas(tx) * self.gas_buffer)
+
+    async def sign(self, call=None, **kwargs) -> HexBytes:
+        """Build and sign; returns raw bytes for eth_sendRawTransaction."""
+        tx = await self.build(call, **kwargs)
+        return HexBytes(self.account.sign_transaction(tx).raw_transaction)
+
+    async def send(self, call=None, **kwargs) -> HexBytes:
+        """Build, sign and send; returns the tx hash."""
+        raw_transaction = await self.sign(call, **kwargs)
+        return await self.web3.eth.send_raw_transaction(raw_transaction)
+
+    async def submit(
+        self,
+        call=None,
+        *,
+        intent: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        **kwargs,
+    ):
+        """
+        Send a transaction and wait for its receipt; with `intent`, at most
+        once per logical action.
+
+        Inside retry() every signed transaction of an `intent` (a name of one
+        action, e.g. "swap 2", stable across attempts even if the calldata
+        changes) is recorded before it is sent. When a later attempt submits
+        the same intent, the earlier transactions are checked first: a mined
+        one is returned instead of sending again, a pending or dropped one is
+        replaced with the same nonce and bumped fees, and only a nonce taken
+        by something else leads to a new send. The records are dropped once
+        the intent is mined and when the retry() returns or gives up, so a
+        later identical submit is always sent. Without `intent` nothing is
+        recorded.
+
+        While waiting, a transaction that is not in a block after
+        STUCK_TX.BLOCKS blocks is replaced the same way (see _wait_or_bump).
+
+        Returns:
+            AttributeDict: receipt of whichever transaction of the intent was mined
+        """
+        previous = intent_submissions(intent) if intent else None
+        if previous:
+            receipt = await self._find_receipt(previous)
+            if receipt is not None:
+                logger.info(
+                    f"{self.account.address[:8]}... | Transaction {receipt['transactionHash'].to_0x_hex()} "
+                    f"of an earlier attempt is mined, not sending again"
+                )
+                forget_intent(intent)
+                apply_receipt(self.web3, receipt)
+                return receipt
+            replacement = await self._replacement_fields(previous[-1])
+            if replacement:
+                kwargs.update(replacement)
+
+        tx = await self.build(call, **kwargs)
+        tx_hash = await self._sign_and_send(tx, previous)
+        receipt = await self._wait_or_bump(tx, tx_hash, previous, timeout)
+        if intent:
+            forget_intent(intent)
+        apply_receipt(self.web3, receipt)
+        return receipt
+
+    async def _sign_and_send(self, tx: Dict[str, Any], submissions: Optional[list]) -> HexBytes:
+        signed = self.account.sign_transaction(tx)
+        if submissions is not None:
+            submissions.append(Submission(HexBytes(signed.hash), tx["nonce"], tx, time.time()))
+        return await self.web3.eth.send_raw_transaction(signed.raw_transaction)
+
+    async def _wait_or_bump(
+        self,
+        tx: Dict[str, Any],
+        tx_hash: HexBytes,
+        submissions: Optional[list],
+        timeout: float,
+    ):
+        """
+        Wait for the receipt of `tx` or any of its replacements. Every
+        STUCK_TX.BLOCKS blocks without one, the transaction is signed again
+        with the same nonce and fees raised by STUCK_TX.FEE_BUMP, up to
+        STUCK_TX.MAX_FEE_GWEI. Only one of them can be mined.
+        """
+        from src.utils.config import get_config
+
+        settings = get_config().STUCK_TX
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        watcher = get_receipt_watcher(self.web3)
+        waiting = {watcher.watch(self.web3, tx_hash, timeout): tx_hash}
+        sent_block = await self.web3.eth.block_number
+        can_bump = settings.ENABLED and settings.BLOCKS > 0
+
+        try:
+            while True:
+                done, _ = await asyncio.wait(
+                    waiting, timeout=POLL_INTERVAL, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+                if done:
+                    # Все ждут до одного дедлайна: таймаут одной - таймаут всех
+                    raise next(iter(done)).exception()
+
+                block = watcher.last_block
+                if not can_bump or block is None or block - sent_block < settings.BLOCKS:
+                    continue
+                sent_block = block
+
+                replacement = await self._bumped(tx, settings)
+                if replacement is None:
+                    can_bump = False
+                    logger.warning(
+                        f"{self.account.address[:8]}... | Transaction {tx_hash.to_0x_hex()} (nonce {tx['nonce']}) "
+                        f"is stuck at the fee cap of {settings.MAX_FEE_GWEI} gwei, waiting for it"
+                    )
+                    continue
+
+                bumped_tx = {**tx, **replacement}
+                try:
+                    bumped_hash = await self._sign_and_send(bumped_tx, submissions)
+                except Exception as e:
+                    # nonce too low - одна из отправленных уже в блоке, её receipt сейчас придёт
+                    logger.warning(
+                        f"{self.account.address[:8]}... | Replacement of {tx_hash.to_0x_hex()} not accepted: {e}"
+                    )
+                    continue
+
+                logger.warning(
+                    f"{self.account.address[:8]}... | Transaction {tx_hash.to_0x_hex()} (nonce {tx['nonce']}) "
+                    f"is not in a block after {settings.BLOCKS} blocks, replaced by {bumped_hash.to_0x_hex()} "
+                    f"with fees +{settings.FEE_BUMP:.1%}"
+                )
+                tx, tx_hash = bumped_tx, bumped_hash
+                waiting[watcher.watch(self.web3, tx_hash, deadline - loop.time())] = tx_hash
+        finally:
+            # Отменённые ожидания watcher выбросит при следующем опросе
+            for future in waiting:
+                future.cancel()
+
+    async def _find_receipt(self, submissions: List[Submission]):
+        receipts = await asyncio.gather(
+            *(self._receipt_or_none(s.tx_hash) for s in submissions)
+        )
+        mined = [r for r in receipts if r is not None]
+        # Успешная транзакция важнее упавшей с другим nonce
+        return next((r for r in mined if r["status"] == 1), mined[0] if mined else None)
+
+    async def _receipt_or_none(self, tx_hash: HexBytes):
+        try:
+            return await self.web3.eth.get_transaction_receipt(tx_hash)
+        except Exception:
+            # TransactionNotFound - ещё не в блоке
+            return None
+
+    async def _replacement_fields(self, last: Submission) -> Dict[str, Any]:
+        """
+        Fields for the next send of an intent whose transactions are not mined:
+        same nonce and bumped fees while the nonce is free, nothing (fresh
+        nonce) once it is used by another transaction.
+        """
+        mined_nonce = await self.web3.eth.get_transaction_count(self.account.address, "latest")
+        if mined_nonce > last.nonce:
+            logger.warning(
+                f"{self.account.address[:8]}... | Nonce {last.nonce} was used by another transaction, "
+                f"sending again with a new nonce"
+            )
+            return {}
+
+        # Транзакция висит в мемпуле или выпала из него - заменяем её тем же nonce
+        from src.utils.config import get_config
+
+        get_nonce_manager(self.web3, self.account.address).resync()
+        bumped = await self._bumped(last.tx, get_config().STUCK_TX)
+        if bumped is None:
+            # Выше потолка не поднимаем: шлём с теми же ценами, нода примет, если старая выпала
+            bumped = {field: last.tx[field] for field in FEE_FIELDS if field in last.tx}
+        logger.warning(
+            f"{self.account.address[:8]}... | Transaction {last.tx_hash.to_0x_hex()} (nonce {last.nonce}) "
+            f"is not mined, replacing it with bumped fees"
+        )
+        return {"nonce": last.nonce, **bumped}
+
+    async def _bumped(self, tx: Dict[str, Any], settings) -> Optional[Dict[str, int]]:
+        """
+        Fees of `tx` raised by settings.FEE_BUMP (or to the market price if
+        that is higher) and capped at settings.MAX_FEE_GWEI. None when the cap
+        leaves no room for the +10% the node requires from a replacement.
+        """
+        fees = await get_gas_params(self.web3, self.gas_strategy, **self.gas_kwargs)
+        step = max(1 + settings.FEE_BUMP, MIN_FEE_BUMP)
+        bumped = {
+            field: max(int(tx[field] * step) + 1, fees.get(field, 0))
+            for field in FEE_FIELDS
+            if field in tx
+        }
+
+        cap = AsyncWeb3.to_wei(settings.MAX_FEE_GWEI, "gwei") if settings.MAX_FEE_GWEI else None
+        for field in ("gasPrice", "maxFeePerGas"):
+            if field in bumped and cap is not None:
+                bumped[field] = min(bumped[field], cap)
+        if "maxFeePerGas" in bumped:
+            if cap is None:
+                bumped["maxFeePerGas"] = max(bumped["maxFeePerGas"], bumped["maxPriorityFeePerGas"])
+            bumped["maxPriorityFeePerGas"] = min(bumped["maxPriorityFeePerGas"], bumped["maxFeePerGas"])
+
+        if any(bumped[field] < tx[field] * MIN_FEE_BUMP for field in bumped):
+            return None
+        return bumped
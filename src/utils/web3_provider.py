@@ -0,0 +1,343 @@
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from eth_typing import URI
+from loguru import logger
+from web3 import AsyncHTTPProvider, AsyncWeb3
+from web3._utils.batching import sort_batch_response_by_response_ids
+from web3._utils.http_session_manager import HTTPSessionManager
+from web3.middleware import Web3Middleware
+
+from src.utils.config import get_config
+from src.utils.constants import RPC_URL
+from src.utils.journal import get_journal
+from src.utils.nonce import NonceSyncMiddleware
+from src.utils.rate_limit import rate_limit
+from src.utils.rpc_cache import RpcCache, get_rpc_cache
+from src.utils.rpc_router import RpcRouter, get_router
+
+# Максимум одновременных соединений на одну пару (rpc, proxy)
+POOL_SIZE = 10
+# Сколько секунд держим idle-соединение открытым
+KEEPALIVE_TIMEOUT = 60
+# Таймаут одного RPC запроса
+REQUEST_TIMEOUT = 30
+# Сколько ждём соседние запросы чтения перед отправкой batch (секунды)
+BATCH_WINDOW = 0.002
+MAX_BATCH_SIZE = 50
+# Запросы чтения, которые склеиваются в JSON-RPC batch автоматически
+BATCHABLE_METHODS = frozenset(
+    {
+        "eth_blockNumber",
+        "eth_call",
+        "eth_chainId",
+        "eth_getBalance",
+        "eth_getBlockByHash",
+        "eth_getBlockByNumber",
+        "eth_getCode",
+        "eth_getTransactionCount",
+        "eth_getTransactionReceipt",
+    }
+)
+
+# Запросы, которые нельзя повторять на другом RPC или дублировать хеджем
+WRITE_METHODS = frozenset({"eth_sendRawTransaction", "eth_sendTransaction"})
+
+# Внутри `async with batch():` в batch уходят все запросы, кроме отправки транзакций
+_explicit_batch: ContextVar[bool] = ContextVar("explicit_batch", default=False)
+
+
+class PooledSessionManager(HTTPSessionManager):
+    """
+    Session manager that keeps one long-lived keep-alive aiohttp session.
+    web3 by default creates sessions with force_close=True, so every RPC
+    call pays for a fresh TCP/TLS handshake.
+    """
+
+    def __init__(self, pool_size: int = POOL_SIZE, keepalive_timeout: int = KEEPALIVE_TIMEOUT):
+        super().__init__(cache_size=1, session_pool_max_workers=1)
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[ClientSession] = None
+
+    def _session_is_usable(self) -> bool:
+        if self._session is None or self._session.closed:
+            return False
+        return self._session._loop is asyncio.get_running_loop()
+
+    async def async_cache_and_return_session(
+        self,
+        endpoint_uri: URI,
+        session: Optional[ClientSession] = None,
+        request_timeout: Optional[ClientTimeout] = None,
+    ) -> ClientSession:
+        if session is not None:
+            self._session = session
+        elif not self._session_is_usable():
+            self._session = ClientSession(
+                raise_for_status=True,
+                connector=TCPConnector(
+                    limit=self.pool_size,
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                    ssl=False,
+                ),
+            )
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+class RequestBatcher:
+    """
+    Collects requests of one provider and sends them as one JSON-RPC batch.
+
+    Requests are flushed BATCH_WINDOW after the first one is queued, or as
+    soon as MAX_BATCH_SIZE is reached. Inside `batch()` the flush happens on
+    the next event loop iteration, so everything gathered there goes out in
+    a single HTTP request regardless of size.
+    """
+
+    def __init__(self, provider: "PooledHTTPProvider"):
+        self.provider = provider
+        self._queue: List[Tuple[str, Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.Handle] = None
+        self._sending: Set[asyncio.Task] = set()
+
+    async def submit(self, method: str, params: Any) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((method, params, future))
+
+        if _explicit_batch.get():
+            self._schedule(loop.call_soon(self._flush))
+        elif len(self._queue) >= MAX_BATCH_SIZE:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(BATCH_WINDOW, self._flush)
+
+        return await future
+
+    def _schedule(self, handle: asyncio.Handle) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = handle
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        items, self._queue = self._queue, []
+        if items:
+            task = asyncio.get_running_loop().create_task(self._send(items))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, items: List[Tuple[str, Any, asyncio.Future]]) -> None:
+        try:
+            if len(items) == 1:
+                method, params, _ = items[0]
+                responses = [await self.provider.make_single_request(method, params)]
+            else:
+                responses = await self.provider.make_batch_request(
+                    [(method, params) for method, params, _ in items]
+                )
+                if not isinstance(responses, list) or len(responses) != len(items):
+                    # Нода не приняла batch целиком, шлём запросы по одному
+                    responses = await asyncio.gather(
+                        *(self.provider.make_single_request(m, p) for m, p, _ in items),
+                        return_exceptions=True,
+                    )
+        except Exception as e:
+            responses = [e] * len(items)
+
+        for (_, _, future), response in zip(items, responses):
+            if future.done():
+                continue
+            if isinstance(response, BaseException):
+                future.set_exception(response)
+            else:
+                future.set_result(response)
+
+
+class PooledHTTPProvider(AsyncHTTPProvider):
+    """
+    Keep-alive HTTP provider that batches reads and routes every request
+    through the RpcRouter of its chain. Identical reads are coalesced by the
+    chain's RpcCache. endpoint_uri stays the chain's default url, so per-chain
+    caches keyed by it are not affected by routing.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        proxy: Optional[str] = None,
+        router: Optional[RpcRouter] = None,
+        cache: Optional[RpcCache] = None,
+        hedge: bool = True,
+        **kwargs,
+    ):
+        request_kwargs = {
+            "ssl": False,
+            "timeout": ClientTimeout(total=REQUEST_TIMEOUT),
+        }
+        if proxy:
+            request_kwargs["proxy"] = f"http://{proxy}"
+
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs, **kwargs)
+        self.proxy = proxy
+        self.router = router or get_router([endpoint_uri])
+        self.hedge = hedge
+        self.cache = cache or get_rpc_cache(endpoint_uri)
+        self._request_session_manager = PooledSessionManager()
+        self._batcher = RequestBatcher(self)
+
+    async def make_request(self, method, params):
+        if method in WRITE_METHODS:
+            return await self.make_single_request(method, params)
+        return await self.cache.fetch(method, params, lambda: self._dispatch(method, params))
+
+    async def _dispatch(self, method, params):
+        if method in BATCHABLE_METHODS or (
+            _explicit_batch.get() and method not in WRITE_METHODS
+        ):
+            return await self._batcher.submit(method, params)
+        return await self.make_single_request(method, params)
+
+    async def _post(self, url: str, request_data: bytes):
+        # Один HTTP запрос = один токен, batch тоже
+        await rate_limit(url)
+        raw_response = await self._request_session_manager.async_make_post_request(
+            url, request_data, **self.get_request_kwargs()
+        )
+        return self.decode_rpc_response(raw_response)
+
+    async def make_single_request(self, method, params):
+        request_data = self.encode_rpc_request(method, params)
+        return await self.router.call(
+            lambda url: self._post(url, request_data),
+            idempotent=method not in WRITE_METHODS,
+            hedge=self.hedge,
+        )
+
+    async def make_batch_request(self, batch_requests):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        response = await self.router.call(
+            lambda url: self._post(url, request_data),
+            idempotent=not any(method in WRITE_METHODS for method, _ in batch_requests),
+            hedge=self.hedge,
+        )
+        if not isinstance(response, list):
+            # RPC errors return only one response with the error object
+            return response
+        return sort_batch_response_by_response_ids(response)
+
+    async def disconnect(self) -> None:
+        await self._request_session_manager.close()
+
+
+def resolve_endpoints(rpc_url: str) -> List[str]:
+    """All configured urls of the chain rpc_url belongs to."""
+    for urls in get_config().RPC.ENDPOINTS.values():
+        if rpc_url in urls:
+            return list(urls)
+    return [rpc_url]
+
+
+class JournalMiddleware(Web3Middleware):
+    """Stores hashes of sent transactions on the task that is running."""
+
+    async def async_wrap_make_request(self, make_request):
+        async def middleware(method, params):
+            response = await make_request(method, params)
+            journal = get_journal()
+            if (
+                method == "eth_sendRawTransaction"
+                and journal is not None
+                and isinstance(response, dict)
+                and response.get("result")
+            ):
+                try:
+                    journal.add_tx_hash(response["result"])
+                except Exception as e:
+                    logger.warning(f"Failed to journal tx {response['result']}: {e}")
+            return response
+
+        return middleware
+
+
+class Web3Registry:
+    """Hands out one shared AsyncWeb3 per (rpc_url, proxy) pair."""
+
+    def __init__(self):
+        self._instances: Dict[Tuple[str, Optional[str]], AsyncWeb3] = {}
+
+    def get(self, rpc_url: str = RPC_URL, proxy: Optional[str] = None) -> AsyncWeb3:
+        key = (rpc_url, proxy or None)
+        web3 = self._instances.get(key)
+        if web3 is None:
+            rpc = get_config().RPC
+            router = get_router(resolve_endpoints(rpc_url))
+            cache = get_rpc_cache(rpc_url, rpc.CACHE_TTL)
+            web3 = AsyncWeb3(PooledHTTPProvider(rpc_url, proxy, router, cache, rpc.HEDGE_READS))
+            web3.middleware_onion.add(NonceSyncMiddleware, "nonce_sync")
+            web3.middleware_onion.add(JournalMiddleware, "journal")
+            self._instances[key] = web3
+        return web3
+
+    async def close(self):
+        for web3 in self._instances.values():
+            try:
+                await web3.provider.disconnect()
+            except Exception as e:
+                logger.warning(f"Failed to close RPC session {web3.provider.endpoint_uri}: {e}")
+        self._instances.clear()
+
+
+_registry = Web3Registry()
+
+
+def get_web3(rpc_url: str = RPC_URL, proxy: Optional[str] = None) -> AsyncWeb3:
+    """
+    Get shared connection-pooled AsyncWeb3 instance.
+
+    Args:
+        rpc_url: RPC endpoint
+        proxy: Proxy in user:pass@ip:port format (optional)
+
+    Returns:
+        AsyncWeb3: instance shared by every caller with the same rpc_url and proxy
+    """
+    return _registry.get(rpc_url, proxy)
+
+
+@asynccontextmanager
+async def batch():
+    """
+    Send every RPC request issued inside the block (including tasks started
+    there, e.g. by asyncio.gather) as one JSON-RPC batch per provider.
+
+    Example:
+        async with batch():
+            balance, nonce = await asyncio.gather(
+                web3.eth.get_balance(address),
+                web3.eth.get_transaction_count(address),
+            )
+    """
+    token = _explicit_batch.set(True)
+    try:
+        yield
+    finally:
+        _explicit_batch.reset(token)
+
+
+async def close_web3_providers():
+    """Close all pooled RPC sessions. Call once at the end of the run."""
+    await _registry.close()
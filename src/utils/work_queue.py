@@ -0,0 +1,250 @@
+"""
+Shared work queue of accounts for running one farm on several machines.
+
+Every node points --queue at the same SQLite file on a shared volume. Nodes
+claim small batches of accounts under a lease, renew the leases with
+heartbeats while they work and write the result of every account back.
+A lease that is not renewed (node crashed, lost the volume) expires and the
+accounts go to whichever node claims next.
+
+    python -m src.utils.work_queue data/queue.db            # status of the queue
+    python -m src.utils.work_queue data/queue.db --name farm
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional
+
+from loguru import logger
+
+DEFAULT_QUEUE_NAME = "farm"
+# Сколько аккаунтов узел забирает за раз
+CLAIM_BATCH_SIZE = 5
+# Сколько секунд аренда живёт без heartbeat
+LEASE_SECONDS = 300
+
+# Статусы аккаунта в очереди
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_items (
+    queue TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    node_id TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (queue, account_index)
+);
+CREATE INDEX IF NOT EXISTS queue_items_claim ON queue_items (queue, status, lease_until);
+CREATE TABLE IF NOT EXISTS queue_nodes (
+    queue TEXT NOT NULL,
+    node_id TEXT NOT NULL,
+    heartbeat REAL NOT NULL,
+    PRIMARY KEY (queue, node_id)
+);
+"""
+
+
+def default_node_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    Accounts of one farm (`name`) in a SQLite file shared by all nodes.
+
+    Claims run in BEGIN IMMEDIATE transactions, so two nodes never lease the
+    same account. Rollback journal instead of WAL: WAL needs shared memory
+    and does not work when the file sits on a network volume.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        name: str = DEFAULT_QUEUE_NAME,
+        node_id: Optional[str] = None,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = 3,
+    ):
+        self.path = path
+        self.name = name
+        self.node_id = node_id or default_node_id()
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=DELETE")
+        self.db.executescript(_SCHEMA)
+        self._heartbeat_task: Optional[asyncio.Task] = None
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # BEGIN IMMEDIATE берёт блокировку на запись сразу, до SELECT
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def seed(self, account_indexes: Iterable[int]) -> int:
+        """Add accounts that are not in the queue yet; any node may seed. Returns how many were added."""
+        now = time.time()
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany(
+                "INSERT OR IGNORE INTO queue_items (queue, account_index, status, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                [(self.name, index, PENDING, now) for index in account_indexes],
+            )
+            added = db.total_changes - before
+        return added
+
+    def claim(self, limit: int = CLAIM_BATCH_SIZE) -> List[int]:
+        """Lease up to `limit` pending accounts or accounts whose lease expired."""
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT account_index, status, node_id FROM queue_items WHERE queue = ? AND "
+                "(status = ? OR (status = ? AND lease_until < ?)) "
+                "ORDER BY status = ? DESC, account_index LIMIT ?",
+                (self.name, PENDING, LEASED, now, PENDING, limit),
+            ).fetchall()
+            for account_index, status, previous_node in rows:
+                if status == LEASED and previous_node != self.node_id:
+                    logger.warning(
+                        f"[{account_index}] Lease of node {previous_node} expired, taking the account over"
+                    )
+            db.executemany(
+                "UPDATE queue_items SET status = ?, node_id = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE queue = ? AND account_index = ?",
+                [
+                    (LEASED, self.node_id, now + self.lease_seconds, now, self.name, row[0])
+                    for row in rows
+                ],
+            )
+        return [row[0] for row in rows]
+
+    def heartbeat(self) -> int:
+        """Extend leases of this node's accounts. Returns how many are still held."""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE queue_items SET lease_until = ?, updated_at = ? "
+                "WHERE queue = ? AND node_id = ? AND status = ?",
+                (now + self.lease_seconds, now, self.name, self.node_id, LEASED),
+            )
+            db.execute(
+                "INSERT OR REPLACE INTO queue_nodes (queue, node_id, heartbeat) VALUES (?, ?, ?)",
+                (self.name, self.node_id, now),
+            )
+        return cursor.rowcount
+
+    def complete(self, account_index: int, success: bool, result: Optional[dict] = None) -> bool:
+        """
+        Store the account's result. A failed account goes back to pending
+        until it used max_attempts leases. Returns False if the lease was
+        lost to another node meanwhile.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT attempts FROM queue_items "
+                "WHERE queue = ? AND account_index = ? AND node_id = ? AND status = ?",
+                (self.name, account_index, self.node_id, LEASED),
+            ).fetchone()
+            if row is not None:
+                if success:
+                    status = DONE
+                else:
+                    status = FAILED if row[0] >= self.max_attempts else PENDING
+                db.execute(
+                    "UPDATE queue_items SET status = ?, lease_until = NULL, result = ?, updated_at = ? "
+                    "WHERE queue = ? AND account_index = ?",
+                    (
+                        status,
+                        json.dumps(result) if result is not None else None,
+                        now,
+                        self.name,
+                        account_index,
+                    ),
+                )
+
+        if row is None:
+            logger.warning(f"[{account_index}] Lease was lost to another node, result not saved")
+            return False
+        return True
+
+    def counts(self) -> dict:
+        rows = self.db.execute(
+            "SELECT status, COUNT(*) FROM queue_items WHERE queue = ? GROUP BY status", (self.name,)
+        ).fetchall()
+        return {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+    def next_expiry(self) -> Optional[float]:
+        """Seconds until the first lease of another node expires, None if nothing is leased."""
+        row = self.db.execute(
+            "SELECT MIN(lease_until) FROM queue_items WHERE queue = ? AND status = ?",
+            (self.name, LEASED),
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            try:
+                self.heartbeat()
+            except sqlite3.Error as e:
+                logger.warning(f"Queue heartbeat failed: {e}")
+            await asyncio.sleep(self.lease_seconds / 3)
+
+    def start_heartbeat(self) -> None:
+        self._heartbeat_task = asyncio.get_running_loop().create_task(self._heartbeat_loop())
+
+    async def stop_heartbeat(self) -> None:
+        if self._heartbeat_task is None:
+            return
+        self._heartbeat_task.cancel()
+        try:
+            await self._heartbeat_task
+        except asyncio.CancelledError:
+            pass
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Show the state of a shared account queue")
+    parser.add_argument("path")
+    parser.add_argument("--name", default=DEFAULT_QUEUE_NAME)
+    args = parser.parse_args()
+
+    queue = WorkQueue(args.path, args.name, node_id="status")
+    print(" | ".join(f"{status}: {count}" for status, count in queue.counts().items()))
+    now = time.time()
+    for node_id, heartbeat in queue.db.execute(
+        "SELECT node_id, heartbeat FROM queue_nodes WHERE queue = ? ORDER BY heartbeat DESC", (args.name,)
+    ):
+        held = queue.db.execute(
+            "SELECT COUNT(*) FROM queue_items WHERE queue = ? AND node_id = ? AND status = ?",
+            (args.name, node_id, LEASED),
+        ).fetchone()[0]
+        print(f"{node_id}: heartbeat {now - heartbeat:.0f}s ago, {held} accounts leased")
+    queue.close()
+
+
+if __name__ == "__main__":
+    main()